@@ -1,6 +1,7 @@
 import streamlit as st
 import os
-from osint import domain_analyzer, email_analyzer, username_analyzer, report_generator
+import time
+from osint import jobs, report_generator
 from dotenv import load_dotenv, find_dotenv
 
 # Cargar las variables de entorno desde el archivo .env
@@ -27,6 +28,13 @@ st.markdown(
     """,
     unsafe_allow_html=True,
 )
+TIPOS_ANALISIS = {"Dominio": "domain", "Email": "email", "Usuario": "username"}
+MOSTRAR_RESULTADOS = {
+    "domain": report_generator.show_results_domain,
+    "email": report_generator.show_results_email,
+    "username": report_generator.show_results_username,
+}
+
 tab1, tab2, tab3 = st.tabs(["Análisis OSINT", "Editar .env", "Reportes generados"])
 
 with tab1:
@@ -47,47 +55,70 @@ with tab1:
         analizar = st.button(
             "🔍 Buscar", use_container_width=True, key="btn_buscar_tab1"
         )
+        # Los análisis se ejecutan en los workers (python main.py worker); aquí
+        # solo se encolan y se consulta su estado, así sobreviven a recargas
+        with st.expander("Trabajos recientes"):
+            for job in jobs.list_jobs(limit=10):
+                etiqueta = f"{job['status']} · {job['type']} {job['target']}"
+                if st.button(etiqueta, key=f"job_{job['id']}"):
+                    st.session_state["job_id"] = job["id"]
+                    st.query_params["job"] = job["id"]
     with col2:
         st.markdown("### Resultado del análisis")
-        if "result" not in st.session_state:
-            st.session_state["result"] = None
         if analizar and input_value:
-            with st.spinner("Analizando, por favor espera..."):
-                try:
-                    if option == "Dominio":
-                        result = domain_analyzer.analyze(input_value)
-                    elif option == "Email":
-                        result = email_analyzer.analyze(input_value)
-                    elif option == "Usuario":
-                        result = username_analyzer.analyze(input_value)
-                    st.session_state["result"] = result
-                    st.success("¡Análisis completado!")
-                except Exception as e:
-                    st.session_state["result"] = None
-                    st.error(f"Error durante el análisis: {e}")
-        if st.session_state["result"]:
-            # Mostrar el resultado de forma bonita
-            if option == "Dominio":
-                report_generator.show_results_domain(
-                    st.session_state["result"], input_value
-                )
-            elif option == "Email":
-                report_generator.show_results_email(
-                    st.session_state["result"], input_value
-                )
-            elif option == "Usuario":
-                report_generator.show_results_username(
-                    st.session_state["result"], input_value
+            try:
+                st.session_state["job_id"] = jobs.submit(
+                    TIPOS_ANALISIS[option], input_value
                 )
-            else:
-                if isinstance(st.session_state["result"], dict):
-                    for k, v in st.session_state["result"].items():
-                        st.metric(label=k, value=str(v))
-                else:
-                    st.write(st.session_state["result"])
+                st.query_params["job"] = st.session_state["job_id"]
+            except Exception as e:
+                st.error(f"Error al encolar el análisis: {e}")
         elif analizar and not input_value:
             st.warning("Por favor, introduce un valor para analizar.")
 
+        sondear = False
+        job_id = st.session_state.get("job_id") or st.query_params.get("job")
+        job = jobs.get(job_id) if job_id else None
+        if job:
+            st.caption(f"Trabajo {job['id']} · {job['type']} {job['target']}")
+            if job["status"] in jobs.ACTIVE:
+                if not jobs.active_workers():
+                    st.warning(
+                        "No hay workers activos: ejecuta `python main.py worker` "
+                        "para procesar la cola."
+                    )
+                st.info(
+                    f"Estado: {job['status']} · "
+                    f"{len(job['sources'])} fuentes terminadas"
+                )
+                for source, meta in job["sources"].items():
+                    st.write(f"• {source}: {meta['status']} ({meta['duration']}s)")
+                sondear = True
+            elif job["status"] == jobs.DONE:
+                st.success("¡Análisis completado!")
+                # El PDF se genera una sola vez por trabajo; las recargas
+                # reutilizan la ruta guardada en la sesión
+                informes = st.session_state.setdefault("informes", {})
+                if job["id"] not in informes:
+                    MOSTRAR_RESULTADOS[job["type"]](
+                        job["results"], job["target"], render_pdf=False
+                    )
+                    informes[job["id"]] = report_generator.render_report(
+                        job["type"], job["target"], job["results"]
+                    )
+                pdf_path = informes[job["id"]]
+                if pdf_path and os.path.exists(pdf_path):
+                    with open(pdf_path, "rb") as f:
+                        st.download_button(
+                            label=f"Descargar {os.path.basename(pdf_path)}",
+                            data=f.read(),
+                            file_name=os.path.basename(pdf_path),
+                            mime="application/pdf",
+                            key=f"job_dl_{job['id']}",
+                        )
+            else:
+                st.error(f"Error durante el análisis: {job['error'] or job['status']}")
+
 with tab2:
     st.markdown("## Editor de archivo .env 📝")
     env_path = os.path.join(os.getcwd(), ".env")
@@ -155,3 +186,9 @@ st.markdown(
 """,
     unsafe_allow_html=True,
 )
+
+# Mientras el trabajo siga activo, se vuelve a ejecutar el script para
+# refrescar su estado (al final, para que se dibujen todas las pestañas)
+if sondear:
+    time.sleep(2)
+    st.rerun()
@@ -0,0 +1,146 @@
+"""
+Recorded responses for the benchmark suite.
+
+The files in benchmarks/fixtures/ are real-shaped responses from each source
+(HIBP, BreachDirectory, crt.sh, Wayback, VirusTotal, Shodan, Hunter, IntelX)
+and canned outputs of the CLI tools (Sherlock, Maigret, theHarvester).
+build() scales them to the benchmark sizes by cloning their entries.
+"""
+
+import copy
+import json
+import os
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Número de entradas por lista en cada tamaño de benchmark
+SIZES = {"small": 10, "large": 1000, "huge": 10000}
+
+DOMAIN = "example.com"
+EMAIL = "user@example.com"
+USERNAME = "johndoe"
+
+
+def load(name):
+    """
+    Loads a recorded fixture: parsed JSON for .json files, text otherwise.
+    """
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+        if name.endswith(".json"):
+            return json.load(f)
+        return f.read()
+
+
+def _clone(template, count, mutate):
+    items = []
+    for i in range(count):
+        item = copy.deepcopy(template)
+        mutate(item, i)
+        items.append(item)
+    return items
+
+
+def build(size):
+    """
+    Returns every payload used by the replay layer, scaled to the given size.
+    """
+    n = SIZES[size]
+
+    def breach(item, i):
+        item["Name"] = item["Title"] = f"Breach{i}"
+        item["Domain"] = f"breach{i}.com"
+
+    hibp = _clone(load("hibp_breachedaccount.json")[0], n, breach)
+
+    breachdirectory = load("breachdirectory.json")
+    leak = breachdirectory["result"][0]
+    breachdirectory["result"] = _clone(
+        leak, n, lambda item, i: item.update(sources=[f"Collection{i}"])
+    )
+    breachdirectory["found"] = n
+
+    crt_templates = load("crtsh.json")
+    crtsh = _clone(
+        crt_templates[0],
+        n,
+        lambda item, i: item.update(
+            id=item["id"] + i,
+            common_name=f"host{i}.{DOMAIN}",
+            name_value=f"host{i}.{DOMAIN}\n*.{DOMAIN}",
+        ),
+    )
+
+    cdx = load("wayback_cdx.json")
+    header, row = cdx[0], cdx[1]
+    wayback = [header] + [
+        row[:1] + [f"{1998 + i % 27}0101{i % 240000:06d}"] + row[2:] for i in range(n)
+    ]
+
+    virustotal = load("virustotal_domain.json")
+    engine = next(
+        iter(virustotal["data"]["attributes"]["last_analysis_results"].values())
+    )
+    virustotal["data"]["attributes"]["last_analysis_results"] = {
+        f"Engine{i}": dict(engine, engine_name=f"Engine{i}") for i in range(min(n, 100))
+    }
+
+    shodan_host = load("shodan_host.json")
+    service = shodan_host["data"][0]
+    shodan_host["data"] = _clone(
+        service, min(n, 1000), lambda item, i: item.update(port=1 + i)
+    )
+    shodan_host["ports"] = [item["port"] for item in shodan_host["data"]]
+
+    hunter = load("hunter_domain_search.json")
+    hunter["emails"] = _clone(
+        hunter["emails"][0],
+        n,
+        lambda item, i: item.update(value=f"person{i}@{DOMAIN}"),
+    )
+
+    theharvester = load("theharvester.json")
+    theharvester["emails"] = [f"contact{i}@{DOMAIN}" for i in range(n)]
+    theharvester["hosts"] = [
+        f"h{i}.{DOMAIN}:10.0.{i // 256 % 256}.{i % 256}" for i in range(n)
+    ]
+    theharvester["subdomains"] = [f"h{i}.{DOMAIN}" for i in range(n)]
+    theharvester["ips"] = [f"10.0.{i // 256 % 256}.{i % 256}" for i in range(n)]
+
+    intelx = load("intelx_search.json")
+    intelx["records"] = _clone(
+        intelx["records"][0],
+        n,
+        lambda item, i: item.update(systemid=f"{i:08d}-3c2b-4c53-9c8b-1e2f3a4b5c6d"),
+    )
+
+    sherlock_lines = load("sherlock.txt").splitlines()
+    maigret_lines = load("maigret.txt").splitlines()
+
+    return {
+        "whois": load("whois.json"),
+        "dns": load("dns.json"),
+        "sublist3r": [f"sub{i}.{DOMAIN}" for i in range(n)],
+        "crtsh": crtsh,
+        "hunter": hunter,
+        "theharvester": theharvester,
+        "wayback": wayback,
+        "shodan_dns_resolve": load("shodan_dns_resolve.json"),
+        "shodan_host": shodan_host,
+        "virustotal": virustotal,
+        "hibp": hibp,
+        "breachdirectory": breachdirectory,
+        "intelx_search": intelx,
+        "intelx_preview": load("intelx_preview.txt"),
+        "sherlock": "\n".join(
+            sherlock_lines[:2]
+            + [f"[+] Site{i}: https://site{i}.com/{USERNAME}" for i in range(n)]
+            + sherlock_lines[-2:]
+        )
+        + "\n",
+        "maigret": "\n".join(
+            maigret_lines[:1]
+            + [f"[+] Site{i}: https://site{i}.com/{USERNAME}" for i in range(n)]
+            + maigret_lines[-1:]
+        )
+        + "\n",
+    }
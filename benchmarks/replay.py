@@ -0,0 +1,283 @@
+"""
+Offline replay of every external source used by the analyzers.
+
+HTTP collectors are served from the recorded payloads through an
+httpx.MockTransport plugged into osint.http_client (Holehe's site checks get
+the same transport and a 404 for every site); library clients (WHOIS,
+DNS, Sublist3r, Hunter) are replaced by fakes and the CLI
+tools by small scripts that print the canned outputs.
+"""
+
+import asyncio
+import json
+import os
+import stat
+import sys
+import types
+
+import dns.resolver
+import httpx
+
+from benchmarks import recorded
+from osint import cache, clients, config, dns_engine, http_client, rate_limit
+
+API_KEYS = [
+    "HIBP_API_KEY",
+    "BREACHDIRECTORY_API_KEY",
+    "INTELX_KEY",
+    "SHODAN_API_KEY",
+    "VT_API_KEY",
+    "HUNTER_API_KEY",
+]
+
+TOOL_SCRIPT = """#!{python}
+import sys
+print(open({path!r}, encoding="utf-8").read(), end="")
+"""
+
+THEHARVESTER_SCRIPT = """#!{python}
+import shutil, sys
+args = sys.argv[1:]
+shutil.copyfile({path!r}, args[args.index("-f") + 1])
+"""
+
+
+def _synthetic_ip(name):
+    h = hash(name)
+    return f"10.{h >> 16 & 255}.{h >> 8 & 255}.{h & 255}"
+
+
+def _streamed(text):
+    # Cuerpo sin leer, como el de la red, para los colectores que lo procesan
+    # por trozos (y para que cuenten los bytes recibidos)
+    return httpx.Response(200, stream=httpx.ByteStream(text.encode("utf-8")))
+
+
+class Replay:
+    """
+    Installs the offline fakes for one benchmark size.
+    latency adds an artificial delay (seconds) to every replayed HTTP request.
+    """
+
+    def __init__(self, payloads, workdir, latency=0.0):
+        self.payloads = payloads
+        self.workdir = workdir
+        self.latency = latency
+        self.requests = 0
+        self._searches = {}
+        self._saved = {}
+
+    # ---------- HTTP ----------
+    async def handle(self, request):
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        host = request.url.host
+        path = request.url.path
+        p = self.payloads
+        if host == "haveibeenpwned.com":
+            return httpx.Response(200, json=p["hibp"])
+        if host == "breachdirectory.p.rapidapi.com":
+            return httpx.Response(200, json=p["breachdirectory"])
+        if host.endswith("intelx.io"):
+            return self._intelx(request)
+        if host == "crt.sh":
+            return _streamed(json.dumps(p["crtsh"]))
+        if host == "api.shodan.io" and path.startswith("/shodan/host/"):
+            ip = path.rsplit("/", 1)[-1]
+            return httpx.Response(200, json=dict(p["shodan_host"], ip_str=ip))
+        if host == "api.shodan.io" and path == "/dns/resolve":
+            names = request.url.params.get("hostnames", "").split(",")
+            recorded_ips = p["shodan_dns_resolve"]
+            return httpx.Response(
+                200,
+                json={n: recorded_ips.get(n) or _synthetic_ip(n) for n in names if n},
+            )
+        if host == "www.virustotal.com":
+            return httpx.Response(200, json=p["virustotal"])
+        if host == "web.archive.org":
+            return self._cdx(request.url.params)
+        return httpx.Response(404, text=f"No fixture for {host}{path}")
+
+    def _intelx(self, request):
+        """
+        Serves the IntelX search flow: start a search, read its records page
+        by page (status 0 while more remain, 1 when finished), previews.
+        """
+        path = request.url.path
+        params = request.url.params
+        if path == "/intelligent/search":
+            search_id = f"search-{len(self._searches)}"
+            self._searches[search_id] = 0
+            return httpx.Response(200, json={"id": search_id, "status": 0})
+        if path == "/intelligent/search/result":
+            records = self.payloads["intelx_search"]["records"]
+            start = self._searches.get(params.get("id"), len(records))
+            end = start + int(params.get("limit") or 100)
+            self._searches[params.get("id")] = end
+            status = 0 if end < len(records) else 1
+            return httpx.Response(
+                200, json={"records": records[start:end], "status": status}
+            )
+        if path == "/intelligent/search/terminate":
+            return httpx.Response(200)
+        if path == "/file/preview":
+            return httpx.Response(200, text=self.payloads["intelx_preview"])
+        return httpx.Response(404, text=f"No fixture for {path}")
+
+    def _cdx(self, params):
+        """
+        Serves one page of the recorded CDX index in text format, honouring
+        fl, limit and resumeKey like the real endpoint (no collapse/from/to).
+        """
+        header, rows = self.payloads["wayback"][0], self.payloads["wayback"][1:]
+        fields = params.get("fl", "").split(",") if params.get("fl") else header
+        start = int(params.get("resumeKey") or 0)
+        limit = int(params.get("limit") or len(rows))
+        page = rows[start : start + limit]
+        lines = [" ".join(row[header.index(f)] for f in fields) for row in page]
+        if params.get("showResumeKey") and start + limit < len(rows):
+            lines += ["", str(start + limit)]
+        return _streamed("\n".join(lines) + "\n")
+
+    # ---------- DNS ----------
+    async def resolve(self, name, record_type):
+        """
+        Answers the recorded records for the domain; every other name gets a
+        synthetic A record derived from its hash.
+        """
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if name == recorded.DOMAIN:
+            records = self.payloads["dns"].get(record_type)
+        elif record_type == "A":
+            records = [_synthetic_ip(name)]
+        else:
+            records = None
+        if not records:
+            raise dns.resolver.NoAnswer()
+        return list(records)
+
+    # ---------- Library clients ----------
+    def _fake_modules(self):
+        p = self.payloads
+
+        payloads = self
+
+        class FakePyHunter:
+            def __init__(self, api_key):
+                self.api_key = api_key
+
+            def domain_search(self, domain, limit=10):
+                payloads.requests += 1
+                return json.loads(json.dumps(p["hunter"]))
+
+        return {
+            "whois": types.SimpleNamespace(whois=lambda domain: dict(p["whois"])),
+            "sublist3r": types.SimpleNamespace(
+                main=lambda domain, *args, **kwargs: list(p["sublist3r"])
+            ),
+        }, {"hunter": FakePyHunter}
+
+    # ---------- CLI tools ----------
+    def _write_tools(self):
+        data_dir = os.path.join(self.workdir, "data")
+        bin_dir = os.path.join(self.workdir, "bin")
+        pkg_dir = os.path.join(self.workdir, "py", "sherlock_project")
+        for directory in (data_dir, bin_dir, pkg_dir):
+            os.makedirs(directory, exist_ok=True)
+
+        def data(name, content):
+            path = os.path.join(data_dir, name)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(content)
+            return path
+
+        def tool(name, template, path):
+            script = os.path.join(bin_dir, name)
+            with open(script, "w", encoding="utf-8") as f:
+                f.write(template.format(python=sys.executable, path=path))
+            os.chmod(script, os.stat(script).st_mode | stat.S_IEXEC)
+            return script
+
+        p = self.payloads
+        tool("maigret", TOOL_SCRIPT, data("maigret.txt", p["maigret"]))
+        tool(
+            "theHarvester",
+            THEHARVESTER_SCRIPT,
+            data("theharvester.json", json.dumps(p["theharvester"])),
+        )
+        with open(os.path.join(pkg_dir, "__init__.py"), "w") as f:
+            f.write("")
+        with open(os.path.join(pkg_dir, "__main__.py"), "w") as f:
+            f.write(
+                TOOL_SCRIPT.format(
+                    python=sys.executable, path=data("sherlock.txt", p["sherlock"])
+                )
+            )
+        return bin_dir, os.path.dirname(pkg_dir)
+
+    # ---------- Install / restore ----------
+    def install(self):
+        """
+        Replaces every external dependency with its offline fake.
+        """
+        saved = self._saved
+        saved["cwd"] = os.getcwd()
+        saved["environ"] = dict(os.environ)
+        saved["modules"] = {
+            name: sys.modules.get(name) for name in ("whois", "sublist3r")
+        }
+        saved["dns"] = dns_engine._resolve
+
+        bin_dir, py_dir = self._write_tools()
+        os.environ["PATH"] = bin_dir + os.pathsep + os.environ.get("PATH", "")
+        os.environ["PYTHONPATH"] = (
+            py_dir + os.pathsep + os.environ.get("PYTHONPATH", "")
+        )
+        for key in API_KEYS:
+            os.environ[key] = "benchmark"
+        # Sin límites de peticiones ni caché: se mide el código, no la cuota
+        for provider in config.DEFAULT_RATE_LIMITS:
+            os.environ[f"INFOHUNTER_RATE_{provider.upper()}"] = "off"
+        rate_limit.reset()
+        cache.configure(enabled=False)
+        os.chdir(self.workdir)
+
+        # Los colectores importan estas librerías al usarlas: basta con
+        # sustituirlas en sys.modules
+        modules, factories = self._fake_modules()
+        sys.modules.update(modules)
+        for name, factory in factories.items():
+            clients.register(name, factory)
+        dns_engine._resolve = self.resolve
+        dns_engine.clear_negative_cache()
+        http_client.set_transport(httpx.MockTransport(self.handle))
+
+    def uninstall(self):
+        """
+        Restores the real clients, environment and working directory.
+        """
+        saved = self._saved
+        http_client.set_transport(None)
+        for name, module in saved["modules"].items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+        clients.reset()
+        dns_engine._resolve = saved["dns"]
+        dns_engine.clear_negative_cache()
+        cache.configure(enabled=True)
+        os.chdir(saved["cwd"])
+        os.environ.clear()
+        os.environ.update(saved["environ"])
+        rate_limit.reset()
+
+    def __enter__(self):
+        self.install()
+        return self
+
+    def __exit__(self, *exc):
+        self.uninstall()
@@ -0,0 +1,232 @@
+"""
+InfoHunter benchmark harness.
+
+Measures per-collector latency, end-to-end analyze() time and PDF render time
+against recorded fixtures (no network, no API quota) and writes a JSON report
+that can be compared across versions:
+
+    python -m benchmarks.run --sizes small,large --output bench.json
+    python -m benchmarks.run --compare old.json new.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks import recorded
+from benchmarks.replay import Replay
+from osint import domain_analyzer, email_analyzer, report_generator, username_analyzer
+
+DOMAIN = recorded.DOMAIN
+EMAIL = recorded.EMAIL
+USERNAME = recorded.USERNAME
+HOSTNAMES = []
+
+COLLECTORS = {
+    "whois": lambda: domain_analyzer.get_whois(DOMAIN),
+    "dns": lambda: domain_analyzer.get_dns(DOMAIN),
+    "hosts": lambda: domain_analyzer.resolve_subdomains(DOMAIN, HOSTNAMES),
+    "sublist3r": lambda: domain_analyzer.get_subdomains_sublist3r(DOMAIN),
+    "crtsh": lambda: domain_analyzer.get_crtsh_subdomains(DOMAIN),
+    "hunter": lambda: domain_analyzer.hunter_domain_search(DOMAIN),
+    "theharvester": lambda: domain_analyzer.theharvester_search(DOMAIN),
+    "wayback": lambda: domain_analyzer.get_wayback_snapshots(DOMAIN),
+    "shodan": lambda: domain_analyzer.shodan_scan(DOMAIN, HOSTNAMES),
+    "virustotal": lambda: domain_analyzer.vt_domain_report(DOMAIN),
+    "hibp": lambda: email_analyzer.analyze_hibp(EMAIL),
+    "breachdirectory": lambda: email_analyzer.analyze_breachdirectory(EMAIL),
+    "holehe": lambda: email_analyzer.analyze_holehe(EMAIL),
+    "intelx": lambda: email_analyzer.analyze_intelx(EMAIL),
+    "sherlock": lambda: username_analyzer.analyze_with_sherlock(USERNAME),
+    "maigret": lambda: username_analyzer.analyze_with_maigret(USERNAME),
+}
+
+ANALYSES = {
+    "domain": (domain_analyzer.analyze, DOMAIN),
+    "email": (email_analyzer.analyze, EMAIL),
+    "username": (username_analyzer.analyze, USERNAME),
+}
+
+
+def measure(func, repeat):
+    """
+    Calls func repeat times and returns timing statistics in seconds.
+    The last result is returned too, so it can feed the next stage.
+    """
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        # Los colectores imprimen progreso; no interesa en el benchmark
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = func()
+        timings.append(time.perf_counter() - start)
+    stats = {
+        "runs": repeat,
+        "min": round(min(timings), 6),
+        "median": round(statistics.median(timings), 6),
+        "mean": round(statistics.mean(timings), 6),
+        "max": round(max(timings), 6),
+    }
+    if isinstance(result, dict) and "error" in result:
+        stats["error"] = str(result["error"])
+    return stats, result
+
+
+def run_size(size, repeat, latency):
+    """
+    Runs every benchmark for one fixture size and returns its results.
+    """
+    payloads = recorded.build(size)
+    HOSTNAMES[:] = payloads["sublist3r"]
+    report = {"collectors": {}, "analyze": {}, "render": {}}
+    with tempfile.TemporaryDirectory(prefix="infohunter-bench-") as workdir:
+        with Replay(payloads, workdir, latency=latency) as replay:
+            for name, func in COLLECTORS.items():
+                report["collectors"][name], _ = measure(func, repeat)
+                print(
+                    f"  {size:<6} collector {name:<16} {report['collectors'][name]['median']:.4f}s"
+                )
+
+            results = {}
+            for kind, (analyze, target) in ANALYSES.items():
+                report["analyze"][kind], results[kind] = measure(
+                    lambda: analyze(target), repeat
+                )
+                print(
+                    f"  {size:<6} analyze   {kind:<16} {report['analyze'][kind]['median']:.4f}s"
+                )
+
+            output_dir = os.path.join(workdir, "reports")
+            for kind, (_, target) in ANALYSES.items():
+                report["render"][kind], _ = measure(
+                    lambda: report_generator.render_report(
+                        kind, target, results[kind], output_dir=output_dir
+                    ),
+                    repeat,
+                )
+                print(
+                    f"  {size:<6} render    {kind:<16} {report['render'][kind]['median']:.4f}s"
+                )
+            report["http_requests"] = replay.requests
+    return report
+
+
+def _git_version():
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            capture_output=True,
+            text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except OSError:
+        return None
+
+
+def run(sizes, repeat, latency):
+    """
+    Runs the benchmark for every requested size and returns the full report.
+    """
+    report = {
+        "version": _git_version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "repeat": repeat,
+        "latency": latency,
+        "sizes": {},
+    }
+    for size in sizes:
+        print(f"[BENCH] Size '{size}' ({recorded.SIZES[size]} entries per list)")
+        report["sizes"][size] = run_size(size, repeat, latency)
+    return report
+
+
+def compare(old_path, new_path, threshold):
+    """
+    Prints the median of every metric in two reports and flags regressions
+    slower than threshold (e.g. 0.1 = 10%). Returns the number of regressions.
+    """
+    with open(old_path, encoding="utf-8") as f:
+        old = json.load(f)
+    with open(new_path, encoding="utf-8") as f:
+        new = json.load(f)
+    print(f"old: {old.get('version')}  new: {new.get('version')}")
+    regressions = 0
+    for size, groups in new["sizes"].items():
+        for group, metrics in groups.items():
+            if not isinstance(metrics, dict):
+                continue
+            for name, stats in metrics.items():
+                before = old["sizes"].get(size, {}).get(group, {}).get(name)
+                if not before:
+                    print(
+                        f"{size:<6} {group:<10} {name:<16} {'new':>10} {stats['median']:>10.4f}"
+                    )
+                    continue
+                ratio = stats["median"] / before["median"] if before["median"] else 1.0
+                flag = ""
+                if ratio > 1 + threshold:
+                    flag = "  REGRESSION"
+                    regressions += 1
+                print(
+                    f"{size:<6} {group:<10} {name:<16} {before['median']:>10.4f} "
+                    f"{stats['median']:>10.4f} {ratio:>6.2f}x{flag}"
+                )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="InfoHunter benchmark suite")
+    parser.add_argument(
+        "--sizes",
+        default="small,large,huge",
+        help=f"Comma-separated fixture sizes ({', '.join(recorded.SIZES)})",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement")
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="Artificial delay in seconds added to every replayed HTTP request",
+    )
+    parser.add_argument("--output", default="bench.json", help="JSON report path")
+    parser.add_argument(
+        "--compare",
+        nargs=2,
+        metavar=("OLD", "NEW"),
+        help="Compare two JSON reports instead of running the benchmark",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Relative slowdown reported as a regression by --compare",
+    )
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        return 1 if compare(*args.compare, args.threshold) else 0
+
+    sizes = [s.strip() for s in args.sizes.split(",") if s.strip()]
+    unknown = [s for s in sizes if s not in recorded.SIZES]
+    if unknown:
+        parser.error(f"Unknown sizes: {', '.join(unknown)}")
+    report = run(sizes, max(1, args.repeat), args.latency)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"[BENCH] Report written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
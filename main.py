@@ -1,8 +1,12 @@
 import argparse
+import contextlib
+import csv
+import ipaddress
+import json
 from dotenv import load_dotenv
 import os
 import sys
-from osint import username_analyzer, email_analyzer, domain_analyzer, report_generator
+from osint import batch, cache, history, instrumentation, output, report_generator
 
 BANNER = r"""
 
@@ -36,32 +40,412 @@ def validate_env_vars(required_vars):
         raise EnvironmentError(f"Missing environment variables: {', '.join(missing)}")
 
 
+# Tipo de análisis -> (informe, variables de entorno obligatorias).
+# El analizador se importa solo al usarlo (batch.get_analyzer).
+ANALYSES = {
+    "username": (report_generator.show_results_username, []),
+    "email": (
+        report_generator.show_results_email,
+        ["HIBP_API_KEY", "BREACHDIRECTORY_API_KEY", "INTELX_KEY"],
+    ),
+    "domain": (
+        report_generator.show_results_domain,
+        ["SHODAN_API_KEY", "VT_API_KEY", "HUNTER_API_KEY"],
+    ),
+}
+
+
+def export_metrics(args, kind, target, results):
+    """
+    Writes the analysis' per-source metrics to --metrics and/or --otel.
+    """
+    meta = results.get("_meta") if isinstance(results, dict) else None
+    if not meta:
+        return
+    if args.metrics:
+        instrumentation.write_prometheus(args.metrics, [(kind, target, meta)])
+    if args.otel:
+        instrumentation.export_otel(kind, target, meta)
+
+
+def since_last(args, kind, target, analyzer, show_results):
+    """
+    Runs the analysis, compares it with the previous run of the target and
+    emits only what changed (to the console, or as JSON with --format).
+    """
+    with (
+        contextlib.redirect_stdout(sys.stderr)
+        if args.format
+        else (contextlib.nullcontext())
+    ):
+        results = analyzer(target)
+        report = history.since_last(kind, target, results)
+        export_metrics(args, kind, target, results)
+        if args.pdf:
+            show_results(results, target, render_pdf=True)
+    if not args.format:
+        history.print_changes(report)
+        return
+    stream = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        stream.write(json.dumps(report, default=str) + "\n")
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+
+
 def analyze_by_params(args):
     if args.username:
-        results = username_analyzer.analyze(args.username)
-        report_generator.show_results_username(results, args.username)
+        kind, target = "username", args.username
     elif args.email:
-        validate_env_vars(["HIBP_API_KEY", "BREACHDIRECTORY_API_KEY", "INTELX_KEY"])
-        results = email_analyzer.analyze(args.email)
-        report_generator.show_results_email(results, args.email)
+        kind, target = "email", args.email
     elif args.domain:
-        validate_env_vars(["SHODAN_API_KEY", "VT_API_KEY", "HUNTER_API_KEY"])
-        results = domain_analyzer.analyze(args.domain)
-        report_generator.show_results_domain(results, args.domain)
+        kind, target = "domain", args.domain
     else:
         print("❌ No valid parameter provided. Use -h for help.")
+        return
+    show_results, required_vars = ANALYSES[kind]
+    validate_env_vars(required_vars)
+    analyzer = batch.get_analyzer(kind)
+    # El PDF está desactivado por defecto en los modos para máquinas
+    render_pdf = args.pdf if args.pdf is not None else not args.format
+
+    if args.since_last:
+        since_last(args, kind, target, analyzer, show_results)
+        return
+
+    if not args.format:
+        results = analyzer(target)
+        export_metrics(args, kind, target, results)
+        show_results(results, target, render_pdf=render_pdf)
+        return
+
+    stream = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    writer = output.ResultWriter(args.format, stream)
+    try:
+        # Los mensajes de progreso van a stderr para no mezclarse con los datos
+        with contextlib.redirect_stdout(sys.stderr):
+            writer.start(kind, target)
+            results = analyzer(target, on_result=writer.on_result)
+            writer.finish(results)
+            export_metrics(args, kind, target, results)
+            show_results(results, target, render_pdf=render_pdf)
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+
+
+def render_command(argv):
+    """
+    'main.py render': generates PDF reports from stored JSON/JSONL results.
+    """
+    parser = argparse.ArgumentParser(
+        prog="main.py render",
+        description="Render PDF reports from stored analysis results\n"
+        "(--format json/jsonl output or batch results.jsonl).",
+        formatter_class=argparse.RawTextHelpFormatter,
+    )
+    parser.add_argument("files", nargs="+", help="JSON or JSONL result files")
+    parser.add_argument(
+        "--output-dir", default="reports", help="Directory for the PDF reports"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Processes used when rendering several reports (default: CPU count)",
+    )
+    args = parser.parse_args(argv)
+
+    items = []
+    for path in args.files:
+        items.extend(report_generator.load_results(path))
+    if not items:
+        print("❌ No analysis results found in the given files.")
+        return 1
+    failed = 0
+    for target, pdf_file, error in report_generator.render_reports(
+        items, output_dir=args.output_dir, workers=args.workers
+    ):
+        if error:
+            failed += 1
+            print(f"⚠️  Error rendering {target}: {error}")
+        else:
+            print(f"📄 PDF report generated: {pdf_file}")
+    return 1 if failed else 0
+
+
+def doctor_command(argv):
+    """
+    'main.py doctor': start-up profile, resolved configuration and optional
+    first-call latency of every collector.
+    """
+    parser = argparse.ArgumentParser(
+        prog="main.py doctor",
+        description="Report per-module import cost of the entry points, the\n"
+        "resolved configuration and, optionally, collector first-call latency.",
+        formatter_class=argparse.RawTextHelpFormatter,
+    )
+    parser.add_argument(
+        "--modules",
+        help="Comma-separated modules to profile (default: main, app and the\n"
+        "analyzers)",
+    )
+    parser.add_argument(
+        "--top", type=int, default=10, help="Heaviest imports listed per module"
+    )
+    parser.add_argument(
+        "-u", "--username", help="Also time every username collector on this target"
+    )
+    parser.add_argument(
+        "-e", "--email", help="Also time every email collector on this target"
+    )
+    parser.add_argument(
+        "-d", "--domain", help="Also time every domain collector on this target"
+    )
+    parser.add_argument(
+        "--no-config", action="store_true", help="Do not print the configuration"
+    )
+    parser.add_argument("--json", metavar="FILE", help="Also write the report as JSON")
+    args = parser.parse_args(argv)
+
+    from osint import doctor
+
+    modules = (
+        [m.strip() for m in args.modules.split(",") if m.strip()]
+        if args.modules
+        else doctor.ENTRY_POINTS
+    )
+    probes = [
+        (kind, target)
+        for kind, target in (
+            ("username", args.username),
+            ("email", args.email),
+            ("domain", args.domain),
+        )
+        if target
+    ]
+    report = doctor.run(
+        modules, top=args.top, probes=probes, show_config=not args.no_config
+    )
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, default=str)
+    return 1 if any(p.get("error") for p in report["imports"]) else 0
+
+
+def worker_command(argv):
+    """
+    'main.py worker': runs the worker processes that execute queued jobs
+    (submitted from the dashboard or the API).
+    """
+    parser = argparse.ArgumentParser(
+        prog="main.py worker",
+        description="Run worker processes for the shared job queue.",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        help="Number of worker processes (default: INFOHUNTER_JOB_WORKERS or 2)",
+    )
+    args = parser.parse_args(argv)
+
+    from osint import jobs
+
+    jobs.run_workers(args.processes)
+    return 0
+
+
+def serve_command(argv):
+    """
+    'main.py serve': HTTP API exposing the analyses as asynchronous jobs.
+    """
+    parser = argparse.ArgumentParser(
+        prog="main.py serve",
+        description="Serve the InfoHunter HTTP API (POST /analyze/<type>,\n"
+        "GET /jobs/<id>, GET /jobs/<id>/events).",
+        formatter_class=argparse.RawTextHelpFormatter,
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Worker threads in the server process (default: INFOHUNTER_JOB_WORKERS\n"
+        "or 2; 0 leaves the jobs to separate 'main.py worker' processes)",
+    )
+    args = parser.parse_args(argv)
+
+    from osint import server
+
+    server.serve(args.host, args.port, args.workers)
+    return 0
+
+
+def parse_node(text):
+    """
+    Parses 'type:value' (e.g. ip:1.2.3.4, breach:Adobe) or a bare domain,
+    email, username or IP address into a (type, value) graph node.
+    """
+    from osint import graph
+
+    node_type, sep, value = text.partition(":")
+    if sep and node_type in graph.NODE_TYPES:
+        return node_type, value
+    try:
+        ipaddress.ip_address(text)
+        return "ip", text
+    except ValueError:
+        return batch.detect_type(text), text
+
+
+def graph_command(argv):
+    """
+    'main.py graph': queries and exports the entity graph built from every
+    analysis.
+    """
+    parser = argparse.ArgumentParser(
+        prog="main.py graph",
+        description="Query the entity graph (domains, subdomains, IPs, emails,\n"
+        "usernames, breaches and profiles) built from every analysis.\n\n"
+        "Examples:\n"
+        "  python main.py graph stats\n"
+        "  python main.py graph show ejemplo.com\n"
+        "  python main.py graph related ip:93.184.216.34 --type domain\n"
+        "  python main.py graph pending --type email --output next.csv\n"
+        "  python main.py graph export --html graph.html --center ejemplo.com\n"
+        "  python main.py graph import results.jsonl\n",
+        formatter_class=argparse.RawTextHelpFormatter,
+    )
+    parser.add_argument(
+        "action",
+        choices=("stats", "show", "related", "pending", "export", "import"),
+        help="stats: node and edge counts\n"
+        "show NODE: direct links of a node\n"
+        "related NODE: nodes within --depth hops\n"
+        "pending: found but not yet analyzed domains, emails and usernames\n"
+        "export: write the graph as --html (pyvis) or --graphml (networkx)\n"
+        "import FILE...: add stored results (--format json/jsonl, batch output)",
+    )
+    parser.add_argument(
+        "items", nargs="*", help="NODE ('type:value' or a bare value) or FILEs"
+    )
+    parser.add_argument(
+        "--depth", type=int, default=2, help="Hops for related/export (default: 2)"
+    )
+    parser.add_argument(
+        "--type",
+        action="append",
+        dest="types",
+        metavar="TYPE",
+        help="Only nodes of TYPE (related, pending). Can be repeated.",
+    )
+    parser.add_argument("--limit", type=int, default=50, help="Maximum nodes listed")
+    parser.add_argument(
+        "--center", metavar="NODE", help="Export only the part around NODE"
+    )
+    parser.add_argument("--html", metavar="FILE", help="Interactive HTML export")
+    parser.add_argument("--graphml", metavar="FILE", help="GraphML export")
+    parser.add_argument(
+        "--output",
+        metavar="FILE",
+        help="pending: write the targets as a CSV usable with --input",
+    )
+    parser.add_argument("--json", action="store_true", help="Print JSON instead")
+    args = parser.parse_args(argv)
+
+    from osint import graph
+
+    if args.action in ("show", "related") and len(args.items) != 1:
+        parser.error(f"'{args.action}' needs exactly one NODE")
+
+    if args.action == "stats":
+        counts = graph.stats()
+        if args.json:
+            print(json.dumps(counts))
+        else:
+            graph.print_stats(counts)
+    elif args.action == "show":
+        node = parse_node(args.items[0])
+        items = graph.neighbors(*node)
+        if args.json:
+            print(json.dumps(items))
+        elif not items and graph.find(*node) is None:
+            print(f"❌ {node[0]}:{node[1]} is not in the graph.")
+            return 1
+        else:
+            graph.print_neighbors(*node, items)
+    elif args.action == "related":
+        node = parse_node(args.items[0])
+        items = graph.related(
+            *node, depth=args.depth, types=args.types, limit=args.limit
+        )
+        if args.json:
+            print(json.dumps(items))
+        else:
+            graph.print_related(*node, items)
+    elif args.action == "pending":
+        items = graph.pending(types=args.types or graph.TARGET_TYPES, limit=args.limit)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(["type", "target"])
+                writer.writerows([item["type"], item["value"]] for item in items)
+            print(f"✅ {len(items)} targets written to {args.output}")
+        elif args.json:
+            print(json.dumps(items))
+        else:
+            graph.print_pending(items)
+    elif args.action == "export":
+        if not args.html and not args.graphml:
+            parser.error("'export' needs --html and/or --graphml")
+        center = parse_node(args.center) if args.center else None
+        if args.html:
+            graph.export_html(args.html, center, args.depth)
+            print(f"🕸️  Graph written to {args.html}")
+        if args.graphml:
+            graph.export_graphml(args.graphml, center, args.depth)
+            print(f"🕸️  Graph written to {args.graphml}")
+    elif args.action == "import":
+        if not args.items:
+            parser.error("'import' needs at least one FILE")
+        count = 0
+        for path in args.items:
+            for kind, target, results in report_generator.load_results(path):
+                graph.ingest_results(kind, target, results)
+                count += 1
+        print(f"✅ {count} analyses added to the graph")
+    return 0
 
 
 def main():
     # Load environment variables from .env
     load_dotenv()
 
+    if len(sys.argv) > 1 and sys.argv[1] == "render":
+        sys.exit(render_command(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == "serve":
+        sys.exit(serve_command(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == "worker":
+        sys.exit(worker_command(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == "graph":
+        sys.exit(graph_command(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] in ("doctor", "--profile-startup"):
+        sys.exit(doctor_command(sys.argv[2:]))
+
     parser = argparse.ArgumentParser(
         description="InfoHunter OSINT Suite\n\n"
         "Examples:\n"
         "  python main.py -d ejemplo.com\n"
         "  python main.py -e usuario@correo.com\n"
-        "  python main.py -u johndoe\n",
+        "  python main.py -u johndoe\n"
+        "  python main.py -d ejemplo.com --format jsonl\n"
+        "  python main.py -d ejemplo.com --since-last\n"
+        "  python main.py --input targets.txt --concurrency 8\n"
+        "  python main.py render result.json\n"
+        "  python main.py doctor  (or --profile-startup)\n"
+        "  python main.py worker --processes 4\n"
+        "  python main.py serve --port 8000\n"
+        "  python main.py graph show ejemplo.com\n",
         formatter_class=argparse.RawTextHelpFormatter,
     )
     parser.add_argument(
@@ -74,7 +458,101 @@ def main():
         "-d", "--domain", help="Domain or company to collect public information"
     )
 
+    parser.add_argument(
+        "--input",
+        metavar="FILE",
+        help="Batch mode: analyze every target in FILE (.txt, .csv or .jsonl)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Number of targets analyzed at the same time in batch mode (default: 4)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=output.FORMATS,
+        help="Write machine-readable results: jsonl/ndjson-stream emit one record\n"
+        "per source as soon as it finishes, json one document at the end",
+    )
+    parser.add_argument(
+        "--output",
+        metavar="FILE",
+        help="File for --format results (default: stdout) or for batch results\n"
+        "(default: results.jsonl)",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        metavar="FILE",
+        help="Checkpoint file used to resume a batch (default: <output>.checkpoint)",
+    )
+    parser.add_argument(
+        "--pdf",
+        dest="pdf",
+        action="store_true",
+        default=None,
+        help="Generate the PDF report (default unless --format or --input is used)",
+    )
+    parser.add_argument(
+        "--no-pdf",
+        dest="pdf",
+        action="store_false",
+        help="Do not generate the PDF report",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or write the local result cache",
+    )
+    parser.add_argument(
+        "--refresh",
+        action="append",
+        default=[],
+        metavar="SOURCE",
+        help="Ignore cached results for SOURCE (e.g. hibp, shodan, whois or 'all').\n"
+        "Can be repeated or comma-separated.",
+    )
+
+    parser.add_argument(
+        "--since-last",
+        action="store_true",
+        help="Compare with the previous run of the same target and report only\n"
+        "what changed (sources still fresh in the cache are not fetched again)",
+    )
+
+    parser.add_argument(
+        "--metrics",
+        metavar="FILE",
+        help="Write per-source timings and counters in Prometheus text format",
+    )
+    parser.add_argument(
+        "--otel",
+        action="store_true",
+        help="Export per-source timings as OpenTelemetry spans\n"
+        "(needs opentelemetry-api and a configured SDK)",
+    )
+
     args = parser.parse_args()
+    cache.configure(
+        enabled=not args.no_cache,
+        refresh=[s.strip() for r in args.refresh for s in r.split(",") if s.strip()],
+    )
+
+    # Modo batch: analiza todos los objetivos del fichero y termina
+    if args.input:
+        try:
+            batch.run_batch(
+                args.input,
+                args.output or "results.jsonl",
+                concurrency=max(1, args.concurrency),
+                checkpoint_path=args.checkpoint,
+                render_pdf=bool(args.pdf),
+                metrics_path=args.metrics,
+                since_last=args.since_last,
+            )
+        except KeyboardInterrupt:
+            sys.exit(130)
+        sys.exit(0)
 
     # Si se pasa algún parámetro, ejecuta en modo automático
     if args.username or args.email or args.domain:
@@ -89,7 +567,9 @@ def main():
                 # Username analysis
                 username = input("🔎 Enter the username to analyze: ")
                 try:
-                    results = username_analyzer.analyze(username)
+                    from osint import username_analyzer
+
+                    results = batch.get_analyzer("username")(username)
                     report_generator.show_results_username(results, username)
                     username_analyzer.print_username_results(results)
 
@@ -102,7 +582,7 @@ def main():
                     validate_env_vars(["HIBP_API_KEY"])
                     validate_env_vars(["BREACHDIRECTORY_API_KEY"])
                     validate_env_vars(["INTELX_KEY"])
-                    results = email_analyzer.analyze(email)
+                    results = batch.get_analyzer("email")(email)
                     report_generator.show_results_email(results, email)
                     # email_analyzer.print_email_results(results)
                 except Exception as e:
@@ -114,7 +594,7 @@ def main():
                     validate_env_vars(
                         ["SHODAN_API_KEY", "VT_API_KEY", "HUNTER_API_KEY"]
                     )
-                    results = domain_analyzer.analyze(domain)
+                    results = batch.get_analyzer("domain")(domain)
                     report_generator.show_results_domain(results, domain)
                 except Exception as e:
                     print(f"⚠️  Error analyzing domain: {e}")
@@ -0,0 +1,294 @@
+import csv
+import importlib
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+
+from osint import config, graph, history, instrumentation, report_generator
+from osint.utils import utc_now
+
+# ANSI color codes for colored output
+RESET = "\033[0m"
+CYAN = "\033[36m"
+GREEN = "\033[32m"
+YELLOW = "\033[33m"
+RED = "\033[31m"
+MAGENTA = "\033[35m"
+BOLD = "\033[1m"
+
+TYPE_ALIASES = {
+    "d": "domain",
+    "domain": "domain",
+    "dominio": "domain",
+    "e": "email",
+    "email": "email",
+    "u": "username",
+    "user": "username",
+    "username": "username",
+    "usuario": "username",
+}
+
+# Los analizadores se importan al usarlos: cada uno arrastra sus librerías
+ANALYZERS = {
+    "domain": "osint.domain_analyzer",
+    "email": "osint.email_analyzer",
+    "username": "osint.username_analyzer",
+}
+
+
+def get_analyzer(kind):
+    """
+    Returns the analyze() function for a target type, importing its module.
+    Unless INFOHUNTER_GRAPH=off, every source result is also added to the
+    entity graph (osint/graph.py) as soon as it finishes.
+    """
+    analyze = importlib.import_module(ANALYZERS[kind]).analyze
+    if not config.graph_enabled():
+        return analyze
+
+    def analyze_and_record(target, on_result=None):
+        results = analyze(target, on_result=graph.hook(kind, target, on_result))
+        graph.record_analysis(kind, target, results)
+        return results
+
+    return analyze_and_record
+
+
+def detect_type(value):
+    """
+    Guesses the target type of a bare value: email, domain or username.
+    """
+    if "@" in value:
+        return "email"
+    if "." in value:
+        return "domain"
+    return "username"
+
+
+def _normalize_type(kind, value):
+    kind = (kind or "").strip().lower()
+    if not kind:
+        return detect_type(value)
+    if kind not in TYPE_ALIASES:
+        raise ValueError(f"Unknown target type '{kind}' for '{value}'")
+    return TYPE_ALIASES[kind]
+
+
+def read_targets(path):
+    """
+    Reads targets from a .txt (one per line, type auto-detected), .csv or .jsonl
+    file. CSV and JSONL rows use a 'target' (or 'value') field and an optional
+    'type' field. Returns a list of (type, target) tuples without duplicates.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    targets = []
+    with open(path, newline="", encoding="utf-8") as f:
+        if ext == ".csv":
+            rows = csv.DictReader(f)
+        elif ext in (".jsonl", ".ndjson"):
+            rows = (json.loads(line) for line in f if line.strip())
+        else:
+            rows = (
+                {"target": line.strip()}
+                for line in f
+                if line.strip() and not line.lstrip().startswith("#")
+            )
+        for row in rows:
+            value = (row.get("target") or row.get("value") or "").strip()
+            if not value:
+                continue
+            targets.append((_normalize_type(row.get("type"), value), value))
+
+    # Misma clave que el checkpoint: 'Example.com' y 'example.com' son uno
+    seen = set()
+    unique = []
+    for kind, value in targets:
+        key = target_key(kind, value)
+        if key not in seen:
+            seen.add(key)
+            unique.append((kind, value))
+    return unique
+
+
+def target_key(kind, target):
+    """
+    Returns the key used to record a target in the checkpoint file.
+    """
+    return f"{kind}:{target.strip().lower()}"
+
+
+def load_checkpoint(path):
+    """
+    Returns the set of target keys already completed in a previous run.
+    """
+    if not path or not os.path.exists(path):
+        return set()
+    with open(path, encoding="utf-8") as f:
+        return {line.strip() for line in f if line.strip()}
+
+
+def analyze_target(kind, target, since_last=False):
+    """
+    Runs the analyzer for one target and returns a JSON-serializable record.
+    With since_last, the record holds the changes since the previous run of
+    the target ("changes") instead of the full results.
+    """
+    started_at = utc_now()
+    start = time.monotonic()
+    try:
+        results = get_analyzer(kind)(target)
+        error = None
+    except Exception as e:
+        results = None
+        error = str(e)
+    record = {
+        "type": kind,
+        "target": target,
+        "started_at": started_at,
+        "finished_at": utc_now(),
+        "duration": round(time.monotonic() - start, 3),
+        "results": results,
+    }
+    if error:
+        record["error"] = error
+    elif since_last:
+        record["changes"] = history.since_last(kind, target, results)
+        record["meta"] = results.get("_meta")
+        del record["results"]
+    return record
+
+
+def run_batch(
+    input_path,
+    output_path,
+    concurrency=4,
+    checkpoint_path=None,
+    render_pdf=False,
+    output_dir="reports",
+    metrics_path=None,
+    since_last=False,
+):
+    """
+    Analyzes every target of input_path with a bounded pool of workers and
+    appends one JSON line per target to output_path as soon as it finishes.
+    Targets analyzed without error are recorded in the checkpoint file, so a
+    new run with the same files skips them and retries the failed ones.
+    With render_pdf, PDF reports are rendered in a background process pool
+    while the analysis continues. With metrics_path, the per-source metrics
+    of every target analyzed so far are kept in that file in Prometheus text
+    format. With since_last, each line holds only the changes since the
+    previous run of the target and no PDF is rendered.
+    Returns the number of targets analyzed in this run.
+    """
+    checkpoint_path = checkpoint_path or f"{output_path}.checkpoint"
+    targets = read_targets(input_path)
+    done = load_checkpoint(checkpoint_path)
+    pending = [(k, t) for k, t in targets if target_key(k, t) not in done]
+    total = len(targets)
+    completed = total - len(pending)
+    print(
+        f"{MAGENTA}{BOLD}=== Batch analysis: {total} targets, {completed} already done, "
+        f"{len(pending)} pending ({concurrency} workers) ==={RESET}"
+    )
+
+    analyzed = 0
+    failed = 0
+    renders = []
+    metrics = []
+    render_pool = (
+        ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn"))
+        if render_pdf
+        else None
+    )
+
+    with open(output_path, "a", encoding="utf-8") as out, open(
+        checkpoint_path, "a", encoding="utf-8"
+    ) as ckpt, ThreadPoolExecutor(max_workers=concurrency) as pool:
+
+        def finish(kind, target, record):
+            nonlocal completed, analyzed, failed
+            out.write(json.dumps(record, default=str) + "\n")
+            out.flush()
+            # Los objetivos con error no se marcan: se reintentan al reanudar
+            if not record.get("error"):
+                ckpt.write(target_key(kind, target) + "\n")
+                ckpt.flush()
+            else:
+                failed += 1
+            completed += 1
+            analyzed += 1
+            status = (
+                f"{RED}❌ error: {record['error']}"
+                if record.get("error")
+                else f"{GREEN}✅"
+            )
+            print(
+                f"{CYAN}[{completed}/{total}]{RESET} {status} "
+                f"{kind} {target} ({record['duration']:.1f}s){RESET}"
+            )
+            meta = record.get("meta") or (record.get("results") or {}).get("_meta")
+            if metrics_path and meta:
+                metrics.append((kind, target, meta))
+                instrumentation.write_prometheus(metrics_path, metrics)
+            if render_pool and record.get("results"):
+                renders.append(
+                    render_pool.submit(
+                        report_generator.render_report,
+                        kind,
+                        target,
+                        record["results"],
+                        output_dir,
+                    )
+                )
+
+        # Solo se encolan 'concurrency' objetivos a la vez para no leer de más
+        queue = iter(pending)
+        running = {}
+        try:
+            while True:
+                while len(running) < concurrency:
+                    item = next(queue, None)
+                    if item is None:
+                        break
+                    running[pool.submit(analyze_target, *item, since_last)] = item
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    kind, target = running.pop(future)
+                    finish(kind, target, future.result())
+        except KeyboardInterrupt:
+            print(
+                f"\n{YELLOW}[WARN] Interrupted. Rerun the same command to resume "
+                f"from the checkpoint.{RESET}"
+            )
+            for future in running:
+                future.cancel()
+            raise
+        finally:
+            if render_pool:
+                render_pool.shutdown(wait=True)
+
+    for future in renders:
+        try:
+            print(f"📄 PDF report generated: {future.result()}")
+        except Exception as e:
+            print(f"{RED}[ERROR] PDF rendering failed: {e}{RESET}")
+
+    print(
+        f"{MAGENTA}{BOLD}=== Batch finished: {analyzed} analyzed, results in "
+        f"{output_path} ==={RESET}"
+    )
+    if failed:
+        print(
+            f"{YELLOW}[WARN] {failed} targets failed; rerun the same command "
+            f"to retry them.{RESET}"
+        )
+    return analyzed
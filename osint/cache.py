@@ -0,0 +1,150 @@
+import functools
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from osint import config, instrumentation
+
+# Estado global del caché (lo ajusta main.py con --no-cache / --refresh)
+_enabled = True
+_refresh = set()
+_local = threading.local()
+
+
+def configure(enabled=True, refresh=None):
+    """
+    Enables or disables the cache and sets the sources that must be refreshed.
+    refresh may contain "all" to refresh every source.
+    """
+    global _enabled, _refresh
+    _enabled = enabled
+    _refresh = set(refresh or [])
+
+
+def normalize_target(target):
+    """
+    Normalizes a target (domain, email...) so equivalent inputs share a cache key.
+    """
+    return str(target).strip().lower().rstrip(".")
+
+
+def _connect():
+    """
+    Returns this thread's SQLite connection, creating the database on first use.
+    """
+    path = config.cache_path()
+    conn = getattr(_local, "conn", None)
+    if conn is not None and _local.key == (os.getpid(), path):
+        return conn
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS cache ("
+        " source TEXT NOT NULL,"
+        " target TEXT NOT NULL,"
+        " created REAL NOT NULL,"
+        " expires REAL NOT NULL,"
+        " value TEXT NOT NULL,"
+        " PRIMARY KEY (source, target))"
+    )
+    _local.conn = conn
+    _local.key = (os.getpid(), path)
+    return conn
+
+
+def _is_error(value):
+    return isinstance(value, dict) and "error" in value
+
+
+def lookup(source, target):
+    """
+    Returns (True, value) if a fresh cached result exists, otherwise (False, None).
+    """
+    if not _enabled or source in _refresh or "all" in _refresh:
+        return False, None
+    try:
+        row = (
+            _connect()
+            .execute(
+                "SELECT value FROM cache WHERE source = ? AND target = ? AND expires > ?",
+                (source, normalize_target(target), time.time()),
+            )
+            .fetchone()
+        )
+    except sqlite3.Error:
+        return False, None
+    if row is None:
+        instrumentation.add("cache_misses")
+        return False, None
+    instrumentation.add("cache_hits")
+    return True, json.loads(row[0])
+
+
+def store(source, target, value, ttl=None):
+    """
+    Stores a result for (source, target). Error results are never cached.
+    """
+    if not _enabled or _is_error(value):
+        return
+    ttl = config.cache_ttl(source) if ttl is None else ttl
+    now = time.time()
+    try:
+        conn = _connect()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (source, target, created, expires, value)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (
+                    source,
+                    normalize_target(target),
+                    now,
+                    now + ttl,
+                    json.dumps(value, default=str),
+                ),
+            )
+    except (sqlite3.Error, TypeError, ValueError):
+        pass
+
+
+def clear(source=None):
+    """
+    Deletes cached results, for one source or for all of them.
+    """
+    conn = _connect()
+    with conn:
+        if source:
+            conn.execute("DELETE FROM cache WHERE source = ?", (source,))
+        else:
+            conn.execute("DELETE FROM cache")
+
+
+def cached(source):
+    """
+    Decorator for collectors whose first argument is the target.
+    Returns the cached result while it is fresh, otherwise calls the collector
+    and stores its result with the source's TTL. Extra arguments are part of
+    the key, so non-default calls never reuse default results.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(target, *args, **kwargs):
+            key = target
+            if args or kwargs:
+                key = f"{target}|{json.dumps([args, kwargs], sort_keys=True, default=str)}"
+            hit, value = lookup(source, key)
+            if hit:
+                print(f"[CACHE] Using cached {source} result for {target}.")
+                return value
+            value = func(target, *args, **kwargs)
+            store(source, key, value)
+            return value
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,58 @@
+import os
+import threading
+
+# nombre -> función que construye el cliente a partir de la API key
+_factories = {}
+# (nombre, api_key) -> cliente ya construido en este proceso
+_clients = {}
+_pid = os.getpid()
+_lock = threading.Lock()
+
+
+def register(name, factory):
+    """
+    Registers the factory used to build a provider client from its API key.
+    Clients already built for that provider are discarded.
+    """
+    with _lock:
+        _factories[name] = factory
+        for key in [k for k in _clients if k[0] == name]:
+            del _clients[key]
+
+
+def get(name, api_key):
+    """
+    Returns the provider client for the API key, building it on first use.
+    Clients are shared by every thread of the process; a forked child builds
+    its own instead of reusing the parent's connections.
+    """
+    global _pid
+    with _lock:
+        if _pid != os.getpid():
+            _clients.clear()
+            _pid = os.getpid()
+        key = (name, api_key)
+        if key not in _clients:
+            _clients[key] = _factories[name](api_key)
+        return _clients[key]
+
+
+def reset():
+    """
+    Forgets every built client and restores the default factories.
+    """
+    with _lock:
+        _clients.clear()
+        _factories.clear()
+        _factories.update(DEFAULT_FACTORIES)
+
+
+def _hunter(api_key):
+    # Importación diferida; PyHunter mantiene su propia requests.Session
+    from pyhunter import PyHunter
+
+    return PyHunter(api_key)
+
+
+DEFAULT_FACTORIES = {"hunter": _hunter}
+_factories.update(DEFAULT_FACTORIES)
@@ -0,0 +1,462 @@
+import math
+import os
+
+# Valores por defecto (segundos) para cada fuente de análisis.
+# Se pueden sobrescribir con INFOHUNTER_TIMEOUT_<FUENTE> en el .env
+DEFAULT_SOURCE_TIMEOUTS = {
+    "whois": 30,
+    "dns": 30,
+    "hosts": 120,
+    "sublist3r": 300,
+    "crtsh": 60,
+    "hunter": 60,
+    "theharvester": 600,
+    "wayback": 120,
+    "shodan": 300,
+    "virustotal": 60,
+    "hibp": 60,
+    "breachdirectory": 60,
+    "holehe": 300,
+    "intelx": 120,
+    "sherlock": 120,
+    "maigret": 600,
+}
+DEFAULT_SOURCE_TIMEOUT = 120
+DEFAULT_ANALYSIS_DEADLINE = 900
+
+# Fuentes de theHarvester que no necesitan API key
+DEFAULT_THEHARVESTER_SOURCES = (
+    "anubis,baidu,bing,certspotter,crtsh,dnsdumpster,duckduckgo,hackertarget,"
+    "otx,rapiddns,subdomaincenter,threatminer,urlscan,yahoo"
+)
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+# Tiempo de vida (segundos) de los resultados cacheados por fuente.
+# Se pueden sobrescribir con INFOHUNTER_TTL_<FUENTE> en el .env
+DEFAULT_CACHE_TTLS = {
+    "whois": 7 * DAY,
+    "dns": 1 * HOUR,
+    "hosts": 1 * HOUR,
+    "sublist3r": 1 * DAY,
+    "crtsh": 12 * HOUR,
+    "hunter": 7 * DAY,
+    "theharvester": 1 * DAY,
+    "wayback": 1 * DAY,
+    "shodan": 1 * DAY,
+    "virustotal": 6 * HOUR,
+    "hibp": 1 * DAY,
+    "breachdirectory": 1 * DAY,
+    "holehe": 7 * DAY,
+    "intelx": 1 * DAY,
+    # Las previsualizaciones de IntelX son inmutables
+    "intelx_preview": 365 * DAY,
+}
+DEFAULT_CACHE_TTL = 1 * DAY
+
+# Límites de peticiones por proveedor, en formato "peticiones/segundos".
+# Se pueden sobrescribir con INFOHUNTER_RATE_<PROVEEDOR> en el .env
+DEFAULT_RATE_LIMITS = {
+    "hibp": "10/60",
+    "breachdirectory": "10/60",
+    "intelx": "1/1",
+    "intelx_preview": "5/1",
+    "virustotal": "4/60",
+    "shodan": "1/1",
+    "hunter": "10/1",
+    "crtsh": "5/60",
+    "wayback": "15/60",
+}
+
+
+def env_float(name, default):
+    """
+    Reads a float from the environment, falling back to default if unset or invalid.
+    """
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+
+def env_int(name, default):
+    """
+    Reads an integer from the environment, falling back to default if unset or invalid.
+    """
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        return default
+
+
+def source_timeout(source):
+    """
+    Returns the per-source timeout in seconds (INFOHUNTER_TIMEOUT_<SOURCE>).
+    """
+    default = DEFAULT_SOURCE_TIMEOUTS.get(source, DEFAULT_SOURCE_TIMEOUT)
+    return env_float(f"INFOHUNTER_TIMEOUT_{source.upper()}", default)
+
+
+def collector_threads():
+    """
+    Returns how many collector threads may run at the same time in this
+    process (INFOHUNTER_COLLECTOR_THREADS). Collectors abandoned after a
+    timeout keep their slot until they return, so they cannot pile up.
+    """
+    return max(1, env_int("INFOHUNTER_COLLECTOR_THREADS", 64))
+
+
+def analysis_deadline():
+    """
+    Returns the overall deadline in seconds for one analysis (INFOHUNTER_DEADLINE).
+    """
+    return env_float("INFOHUNTER_DEADLINE", DEFAULT_ANALYSIS_DEADLINE)
+
+
+def http_timeout():
+    """
+    Returns the default timeout in seconds for HTTP requests (INFOHUNTER_HTTP_TIMEOUT).
+    """
+    return env_float("INFOHUNTER_HTTP_TIMEOUT", 30)
+
+
+def http_connect_timeout():
+    """
+    Returns the connect timeout in seconds (INFOHUNTER_HTTP_CONNECT_TIMEOUT).
+    """
+    return env_float("INFOHUNTER_HTTP_CONNECT_TIMEOUT", 10)
+
+
+def http_max_connections():
+    """
+    Returns the maximum number of open connections in the shared HTTP pool.
+    """
+    return env_int("INFOHUNTER_HTTP_MAX_CONNECTIONS", 100)
+
+
+def http_max_per_host():
+    """
+    Returns the maximum number of concurrent requests to a single host.
+    """
+    return env_int("INFOHUNTER_HTTP_MAX_PER_HOST", 10)
+
+
+def http_keepalive_expiry():
+    """
+    Returns how long in seconds idle keep-alive connections are kept open.
+    """
+    return env_float("INFOHUNTER_HTTP_KEEPALIVE", 30)
+
+
+def data_dir():
+    """
+    Returns the directory where InfoHunter keeps its local state (INFOHUNTER_DATA_DIR).
+    """
+    return os.getenv("INFOHUNTER_DATA_DIR") or ".infohunter"
+
+
+def cache_path():
+    """
+    Returns the path of the SQLite result cache (INFOHUNTER_CACHE_PATH).
+    """
+    return os.getenv("INFOHUNTER_CACHE_PATH") or os.path.join(
+        data_dir(), "cache.sqlite3"
+    )
+
+
+def cache_ttl(source):
+    """
+    Returns the cache TTL in seconds for a source (INFOHUNTER_TTL_<SOURCE>).
+    """
+    default = DEFAULT_CACHE_TTLS.get(source, DEFAULT_CACHE_TTL)
+    return env_float(f"INFOHUNTER_TTL_{source.upper()}", default)
+
+
+def rate_limit(provider):
+    """
+    Returns (requests, seconds) allowed for a provider (INFOHUNTER_RATE_<PROVIDER>),
+    or None if the provider is not rate limited. A zero or negative number on
+    either side ("0/60", "10/0") disables the limit like "off".
+    """
+    value = os.getenv(f"INFOHUNTER_RATE_{provider.upper()}")
+    if not value:
+        value = DEFAULT_RATE_LIMITS.get(provider)
+    if not value or value.strip().lower() in ("0", "none", "off"):
+        return None
+    try:
+        requests, _, seconds = value.partition("/")
+        requests, seconds = float(requests), float(seconds or 1)
+    except ValueError:
+        return None
+    # Un cubo con tasa 0 dividiría por cero en la primera petición
+    if not (math.isfinite(requests) and math.isfinite(seconds)):
+        return None
+    if requests <= 0 or seconds <= 0:
+        return None
+    return requests, seconds
+
+
+def theharvester_sources():
+    """
+    Returns the theHarvester data sources (INFOHUNTER_THEHARVESTER_SOURCES,
+    comma-separated, or 'all' to let theHarvester query every source).
+    """
+    value = os.getenv("INFOHUNTER_THEHARVESTER_SOURCES", DEFAULT_THEHARVESTER_SOURCES)
+    return [s.strip() for s in value.split(",") if s.strip()]
+
+
+def theharvester_workers():
+    """
+    Returns how many theHarvester processes run in parallel, each one with a
+    subset of the sources.
+    """
+    return env_int("INFOHUNTER_THEHARVESTER_WORKERS", 4)
+
+
+def holehe_concurrency():
+    """
+    Returns how many Holehe site checks run at the same time.
+    """
+    return env_int("INFOHUNTER_HOLEHE_CONCURRENCY", 20)
+
+
+def holehe_timeout():
+    """
+    Returns the HTTP timeout in seconds for each Holehe site check.
+    """
+    return env_float("INFOHUNTER_HOLEHE_TIMEOUT", 10)
+
+
+def intelx_api_root():
+    """
+    Returns the Intelligence X API root (free.intelx.io unless INTELX_API_ROOT
+    points to a paid endpoint).
+    """
+    return os.getenv("INTELX_API_ROOT", "https://free.intelx.io").rstrip("/")
+
+
+def intelx_max_results():
+    """
+    Returns the maximum number of Intelligence X records kept per search.
+    """
+    return env_int("INFOHUNTER_INTELX_MAX_RESULTS", 100)
+
+
+def intelx_search_deadline():
+    """
+    Returns the maximum time in seconds spent polling one Intelligence X
+    search before it is terminated with the records read so far.
+    """
+    return env_float("INFOHUNTER_INTELX_SEARCH_DEADLINE", 60)
+
+
+def intelx_page_size():
+    """
+    Returns how many records are read per Intelligence X result page.
+    """
+    return env_int("INFOHUNTER_INTELX_PAGE_SIZE", 50)
+
+
+def intelx_max_previews():
+    """
+    Returns how many records per search get a preview fetched.
+    """
+    return env_int("INFOHUNTER_INTELX_MAX_PREVIEWS", 20)
+
+
+def intelx_preview_lines():
+    """
+    Returns how many lines each Intelligence X preview contains.
+    """
+    return env_int("INFOHUNTER_INTELX_PREVIEW_LINES", 8)
+
+
+def intelx_preview_concurrency():
+    """
+    Returns how many Intelligence X previews are downloaded at the same time.
+    """
+    return env_int("INFOHUNTER_INTELX_PREVIEW_CONCURRENCY", 5)
+
+
+def intelx_preview_timeout():
+    """
+    Returns the timeout in seconds for each Intelligence X preview request.
+    """
+    return env_float("INFOHUNTER_INTELX_PREVIEW_TIMEOUT", 15)
+
+
+def dns_resolvers():
+    """
+    Returns the nameservers set in INFOHUNTER_DNS_RESOLVERS (comma-separated),
+    or an empty list to use the system resolver configuration.
+    """
+    value = os.getenv("INFOHUNTER_DNS_RESOLVERS", "")
+    return [ns.strip() for ns in value.split(",") if ns.strip()]
+
+
+def dns_concurrency():
+    """
+    Returns how many names are resolved at the same time.
+    """
+    return env_int("INFOHUNTER_DNS_CONCURRENCY", 200)
+
+
+def dns_query_budget():
+    """
+    Returns the maximum number of DNS queries sent by one lookup operation.
+    """
+    return env_int("INFOHUNTER_DNS_QUERY_BUDGET", 20000)
+
+
+def dns_timeout():
+    """
+    Returns the total time in seconds allowed for one DNS query.
+    """
+    return env_float("INFOHUNTER_DNS_TIMEOUT", 5)
+
+
+def dns_negative_ttl():
+    """
+    Returns how long (seconds) NXDOMAIN/NODATA answers are remembered.
+    """
+    return env_float("INFOHUNTER_DNS_NEGATIVE_TTL", 300)
+
+
+def shodan_max_ips():
+    """
+    Returns the maximum number of IPs looked up in Shodan for one domain.
+    """
+    return env_int("INFOHUNTER_SHODAN_MAX_IPS", 50)
+
+
+def shodan_dns_batch():
+    """
+    Returns how many hostnames are sent per Shodan DNS resolve request.
+    """
+    return env_int("INFOHUNTER_SHODAN_DNS_BATCH", 100)
+
+
+def wayback_page_size():
+    """
+    Returns how many CDX rows are requested per Wayback page.
+    """
+    return env_int("INFOHUNTER_WAYBACK_PAGE_SIZE", 5000)
+
+
+def wayback_max_pages():
+    """
+    Returns the maximum number of CDX pages read for one domain.
+    """
+    return env_int("INFOHUNTER_WAYBACK_MAX_PAGES", 20)
+
+
+def wayback_sample_size():
+    """
+    Returns how many snapshots are kept as a sample in the Wayback result.
+    """
+    return env_int("INFOHUNTER_WAYBACK_SAMPLE", 20)
+
+
+def wayback_collapse():
+    """
+    Returns the CDX collapse field (INFOHUNTER_WAYBACK_COLLAPSE), e.g. 'digest'
+    to skip consecutive identical captures or 'timestamp:8' for one per day.
+    An empty value disables collapsing.
+    """
+    return os.getenv("INFOHUNTER_WAYBACK_COLLAPSE", "digest").strip()
+
+
+def http_retries():
+    """
+    Returns how many times a rate-limited (429/503) request is retried.
+    """
+    return env_int("INFOHUNTER_HTTP_RETRIES", 3)
+
+
+def jobs_path():
+    """
+    Returns the path of the SQLite job queue shared by the dashboard, the
+    API server and the workers (INFOHUNTER_JOBS_PATH).
+    """
+    return os.getenv("INFOHUNTER_JOBS_PATH") or os.path.join(data_dir(), "jobs.sqlite3")
+
+
+def job_workers():
+    """
+    Returns how many worker processes 'main.py worker' starts.
+    """
+    return env_int("INFOHUNTER_JOB_WORKERS", 2)
+
+
+def job_poll_interval():
+    """
+    Returns how often in seconds an idle worker checks the queue for new jobs.
+    """
+    return env_float("INFOHUNTER_JOB_POLL_INTERVAL", 1)
+
+
+def job_stale_after():
+    """
+    Returns after how many seconds without a heartbeat a running job is
+    considered abandoned (its worker died) and is queued again.
+    """
+    return env_float("INFOHUNTER_JOB_STALE_AFTER", 120)
+
+
+def api_token():
+    """
+    Returns the bearer token required by the HTTP API (INFOHUNTER_API_TOKEN),
+    or None to accept requests without one.
+    """
+    return os.getenv("INFOHUNTER_API_TOKEN") or None
+
+
+def api_threads():
+    """
+    Returns how many request threads the HTTP API server uses
+    (INFOHUNTER_API_THREADS). Every open /events stream holds one.
+    """
+    return max(1, env_int("INFOHUNTER_API_THREADS", 16))
+
+
+def history_path():
+    """
+    Returns the path of the SQLite store of past results used by --since-last
+    (INFOHUNTER_HISTORY_PATH).
+    """
+    return os.getenv("INFOHUNTER_HISTORY_PATH") or os.path.join(
+        data_dir(), "history.sqlite3"
+    )
+
+
+def history_keep():
+    """
+    Returns how many past runs are kept per target (INFOHUNTER_HISTORY_KEEP).
+    """
+    return env_int("INFOHUNTER_HISTORY_KEEP", 30)
+
+
+def graph_path():
+    """
+    Returns the path of the SQLite entity graph fed by every analysis
+    (INFOHUNTER_GRAPH_PATH).
+    """
+    return os.getenv("INFOHUNTER_GRAPH_PATH") or os.path.join(
+        data_dir(), "graph.sqlite3"
+    )
+
+
+def graph_enabled():
+    """
+    Returns False if results must not be added to the entity graph
+    (INFOHUNTER_GRAPH=off).
+    """
+    value = os.getenv("INFOHUNTER_GRAPH", "on").strip().lower()
+    return value not in ("0", "off", "false", "no")
@@ -0,0 +1,163 @@
+import asyncio
+import time
+
+from osint import config
+from osint.utils import run_async
+
+RECORD_TYPES = ("A", "AAAA", "MX", "NS", "TXT", "CNAME", "SOA", "CAA")
+
+_resolver = None
+_resolver_loop = None
+# (nombre, tipo) -> instante en que caduca la respuesta negativa.
+# tipo None significa NXDOMAIN: el nombre no existe para ningún tipo.
+_negative = {}
+
+
+class QueryBudget:
+    """
+    Caps how many DNS queries one operation may send, and counts the ones
+    that failed (timeout, SERVFAIL...).
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.used = 0
+        self.denied = 0
+        self.failed = 0
+
+    def take(self):
+        if self.used >= self.limit:
+            self.denied += 1
+            return False
+        self.used += 1
+        return True
+
+
+def _get_resolver():
+    """
+    Returns the shared async resolver for the running loop. Nameservers come
+    from INFOHUNTER_DNS_RESOLVERS, or from the system configuration if unset.
+    """
+    global _resolver, _resolver_loop
+    import dns.asyncresolver
+
+    loop = asyncio.get_running_loop()
+    if _resolver is None or _resolver_loop is not loop:
+        nameservers = config.dns_resolvers()
+        resolver = dns.asyncresolver.Resolver(configure=not nameservers)
+        if nameservers:
+            resolver.nameservers = nameservers
+        resolver.lifetime = config.dns_timeout()
+        _resolver = resolver
+        _resolver_loop = loop
+    return _resolver
+
+
+def _is_negative(name, record_type):
+    now = time.monotonic()
+    for key in ((name, None), (name, record_type)):
+        expires = _negative.get(key)
+        if expires is not None:
+            if expires > now:
+                return True
+            _negative.pop(key, None)
+    return False
+
+
+async def _resolve(name, record_type):
+    """
+    Sends one query and returns the answer records as text.
+    """
+    answers = await _get_resolver().resolve(name, record_type)
+    return [r.to_text() for r in answers]
+
+
+async def query(name, record_type, budget=None):
+    """
+    Resolves one record type for a name and returns its records as text.
+    Names or types known not to exist are answered from the negative cache
+    without a query; an empty list is returned for them and when the budget
+    is spent. A query that failed (timeout, SERVFAIL, network error) returns
+    None, so it is not mistaken for "no records".
+    """
+    import dns.exception
+    import dns.resolver
+
+    name = name.strip().lower().rstrip(".")
+    if _is_negative(name, record_type):
+        return []
+    if budget is not None and not budget.take():
+        return []
+    try:
+        return await _resolve(name, record_type)
+    except dns.resolver.NXDOMAIN:
+        _negative[(name, None)] = time.monotonic() + config.dns_negative_ttl()
+    except dns.resolver.NoAnswer:
+        _negative[(name, record_type)] = time.monotonic() + config.dns_negative_ttl()
+    except (dns.exception.DNSException, OSError):
+        if budget is not None:
+            budget.failed += 1
+        return None
+    return []
+
+
+async def lookup_records(name, record_types=RECORD_TYPES, budget=None):
+    """
+    Resolves every record type of one name concurrently.
+    Returns {record_type: [records]}, with None for the types whose query
+    failed.
+    """
+    answers = await asyncio.gather(
+        *(query(name, rtype, budget) for rtype in record_types)
+    )
+    return dict(zip(record_types, answers))
+
+
+async def resolve_hosts_async(names, budget=None):
+    """
+    Resolves A and AAAA records for many names with bounded concurrency.
+    Returns {host: [ips]} for the names that resolve.
+    """
+    if budget is None:
+        budget = QueryBudget(config.dns_query_budget())
+    slots = asyncio.Semaphore(config.dns_concurrency())
+
+    async def resolve_one(name):
+        async with slots:
+            records = await lookup_records(name, ("A", "AAAA"), budget)
+        return name, (records["A"] or []) + (records["AAAA"] or [])
+
+    hosts = {}
+    for name, ips in await asyncio.gather(*(resolve_one(n) for n in names)):
+        if ips:
+            hosts[name] = ips
+    return hosts
+
+
+def get_records(name, record_types=RECORD_TYPES):
+    """
+    Synchronous wrapper around lookup_records() for the collectors. Returns
+    {"error": ...} if every query failed, so a resolver outage is not
+    reported as a name without records.
+    """
+    budget = QueryBudget(config.dns_query_budget())
+    records = run_async(lookup_records(name, tuple(record_types), budget))
+    if records and all(values is None for values in records.values()):
+        return {"error": f"DNS lookup of {name} failed (timeout or SERVFAIL)"}
+    return records
+
+
+def resolve_hosts(names, budget=None):
+    """
+    Synchronous wrapper around resolve_hosts_async(). Names are normalised and
+    de-duplicated before resolving; returns the host->IPs map.
+    """
+    unique = sorted({n.strip().lower().rstrip(".") for n in names if n and n.strip()})
+    return run_async(resolve_hosts_async(unique, budget))
+
+
+def clear_negative_cache():
+    """
+    Forgets every cached negative answer.
+    """
+    _negative.clear()
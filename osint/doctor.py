@@ -0,0 +1,294 @@
+import ast
+import contextlib
+import importlib
+import importlib.util
+import inspect
+import io
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+from osint import cache, config
+
+# ANSI color codes for colored output
+RESET = "\033[0m"
+CYAN = "\033[36m"
+GREEN = "\033[32m"
+YELLOW = "\033[33m"
+RED = "\033[31m"
+BOLD = "\033[1m"
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Puntos de entrada cuyo arranque en frío se mide
+ENTRY_POINTS = (
+    "main",
+    "app",
+    "osint.username_analyzer",
+    "osint.email_analyzer",
+    "osint.domain_analyzer",
+    "osint.report_generator",
+)
+
+# Scripts que ejecutan código al importarse (app.py es un script de
+# Streamlit): se miden solo sus importaciones, sin ejecutarlos
+SCRIPTS = {"app": "app.py"}
+
+API_KEYS = (
+    "HIBP_API_KEY",
+    "BREACHDIRECTORY_API_KEY",
+    "INTELX_KEY",
+    "SHODAN_API_KEY",
+    "VT_API_KEY",
+    "HUNTER_API_KEY",
+)
+
+
+def parse_importtime(text):
+    """
+    Parses the stderr of 'python -X importtime' into a list of
+    {module, depth, self, cumulative} entries (times in seconds).
+    """
+    entries = []
+    for line in text.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:") :].split("|", 2)
+            entries.append(
+                {
+                    "module": name.strip(),
+                    "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+                    "self": int(self_us) / 1e6,
+                    "cumulative": int(cumulative_us) / 1e6,
+                }
+            )
+        except ValueError:
+            continue
+    return entries
+
+
+def script_imports(path):
+    """
+    Returns (code, modules) for the top-level import statements of a script:
+    the statements themselves and the names of the modules they import.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        source = f.read()
+    statements = []
+    modules = set()
+    for node in ast.parse(source).body:
+        if isinstance(node, ast.Import):
+            modules.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            modules.add(node.module)
+            modules.update(f"{node.module}.{alias.name}" for alias in node.names)
+        else:
+            continue
+        statements.append(ast.get_source_segment(source, node))
+    return "\n".join(statements), modules
+
+
+def profile_import(module, top=10, timeout=120):
+    """
+    Imports a module in a fresh interpreter with -X importtime and returns
+    {module, total, wall, top, error}: the module's cumulative import time,
+    the wall time of the whole interpreter start and its heaviest imports.
+    For the scripts in SCRIPTS only their imports run, not the script.
+    """
+    script = SCRIPTS.get(module)
+    if script:
+        code, roots = script_imports(os.path.join(ROOT_DIR, script))
+    else:
+        code, roots = f"import {module}", None
+    start = time.perf_counter()
+    try:
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            capture_output=True,
+            text=True,
+            cwd=ROOT_DIR,
+            timeout=timeout,
+        )
+    except subprocess.TimeoutExpired:
+        return {"module": module, "error": f"Import took more than {timeout}s"}
+    wall = time.perf_counter() - start
+    entries = parse_importtime(proc.stderr)
+    if proc.returncode != 0:
+        errors = [
+            line
+            for line in proc.stderr.splitlines()
+            if line and not line.startswith("import time:")
+        ]
+        return {
+            "module": module,
+            "error": errors[-1] if errors else f"exit code {proc.returncode}",
+        }
+    if roots is not None:
+        # Lo que importa el script son las entradas de primer nivel; las que ya
+        # cargó el intérprete al arrancar no aparecen ahí
+        imported = [e for e in entries if e["depth"] == 0 and e["module"] in roots]
+        imported.sort(key=lambda e: e["cumulative"], reverse=True)
+        return {
+            "module": module,
+            "total": sum(e["cumulative"] for e in imported),
+            "wall": round(wall, 3),
+            "top": imported[:top],
+            "error": None,
+        }
+    # La salida va en post-orden: lo que importa el módulo son las entradas
+    # más profundas que lo preceden (site y demás son del intérprete)
+    index = next(
+        (i for i in range(len(entries) - 1, -1, -1) if entries[i]["module"] == module),
+        None,
+    )
+    root = entries[index] if index is not None else None
+    children = []
+    if root is not None:
+        i = index - 1
+        while i >= 0 and entries[i]["depth"] > root["depth"]:
+            children.append(entries[i])
+            i -= 1
+    children.sort(key=lambda e: e["cumulative"], reverse=True)
+    return {
+        "module": module,
+        "total": root["cumulative"] if root else None,
+        "wall": round(wall, 3),
+        "top": children[:top],
+        "error": None,
+    }
+
+
+def resolved_config():
+    """
+    Returns the configuration the analyzers would use right now, after
+    applying the environment: timeouts, cache TTLs, rate limits, every
+    tuning setting, which API keys are set and which CLI tools are found.
+    """
+    settings = {}
+    for name, func in sorted(vars(config).items()):
+        if (
+            inspect.isfunction(func)
+            and func.__module__ == config.__name__
+            and not name.startswith("_")
+            and not inspect.signature(func).parameters
+        ):
+            settings[name] = func()
+    return {
+        "timeouts": {
+            s: config.source_timeout(s) for s in config.DEFAULT_SOURCE_TIMEOUTS
+        },
+        "cache_ttls": {s: config.cache_ttl(s) for s in config.DEFAULT_CACHE_TTLS},
+        "rate_limits": {p: config.rate_limit(p) for p in config.DEFAULT_RATE_LIMITS},
+        "settings": settings,
+        "api_keys": {key: bool(os.getenv(key)) for key in API_KEYS},
+        # Sherlock se lanza como módulo; Maigret y theHarvester desde el PATH
+        "tools": {
+            "sherlock": importlib.util.find_spec("sherlock_project") is not None,
+            "maigret": shutil.which("maigret") is not None,
+            "theHarvester": shutil.which("theHarvester") is not None,
+        },
+    }
+
+
+def probe_collectors(kind, target):
+    """
+    Runs one full analysis in this process and returns the analyzer's import
+    time and each collector's first-call latency and status. The result cache
+    is off meanwhile, so every collector hits the real source: this uses
+    network and API quota.
+    """
+    start = time.perf_counter()
+    module = importlib.import_module(f"osint.{kind}_analyzer")
+    import_time = time.perf_counter() - start
+    collectors = {}
+
+    def on_result(source, result, meta):
+        collectors[source] = {"duration": meta["duration"], "status": meta["status"]}
+
+    start = time.perf_counter()
+    # Los colectores imprimen su progreso; aquí solo interesan los tiempos
+    cache.configure(enabled=False)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            module.analyze(target, on_result=on_result)
+    finally:
+        cache.configure(enabled=True)
+    return {
+        "kind": kind,
+        "target": target,
+        "import": round(import_time, 3),
+        "total": round(time.perf_counter() - start, 3),
+        "collectors": collectors,
+    }
+
+
+def print_import_profile(profile, top=10):
+    if profile.get("error"):
+        print(f"  {RED}{profile['module']:<26} error: {profile['error']}{RESET}")
+        return
+    total = profile["total"] or 0.0
+    color = RED if total > 0.5 else YELLOW if total > 0.2 else GREEN
+    print(
+        f"  {BOLD}{profile['module']:<26}{RESET} {color}{total * 1000:8.1f} ms{RESET}"
+        f"  (interpreter start {profile['wall'] * 1000:.0f} ms)"
+    )
+    for entry in profile["top"][:top]:
+        print(
+            f"      {entry['cumulative'] * 1000:8.1f} ms  "
+            f"{'  ' * max(0, entry['depth'] - 1)}{entry['module']}"
+        )
+
+
+def print_config(resolved):
+    print(f"\n{CYAN}{BOLD}Resolved configuration{RESET}")
+    for section in ("timeouts", "cache_ttls", "rate_limits", "settings"):
+        print(f"  {BOLD}{section}{RESET}")
+        for name, value in resolved[section].items():
+            print(f"    {name:<28} {value}")
+    print(f"  {BOLD}api_keys{RESET}")
+    for key, present in resolved["api_keys"].items():
+        state = f"{GREEN}set{RESET}" if present else f"{YELLOW}missing{RESET}"
+        print(f"    {key:<28} {state}")
+    print(f"  {BOLD}tools{RESET}")
+    for tool, found in resolved["tools"].items():
+        state = f"{GREEN}found{RESET}" if found else f"{YELLOW}not found{RESET}"
+        print(f"    {tool:<28} {state}")
+
+
+def print_probe(probe):
+    print(
+        f"\n{CYAN}{BOLD}First-call latency: {probe['kind']} {probe['target']}{RESET}"
+        f" (import {probe['import'] * 1000:.0f} ms, analysis {probe['total']:.2f}s)"
+    )
+    for source, meta in sorted(
+        probe["collectors"].items(), key=lambda item: -item[1]["duration"]
+    ):
+        color = GREEN if meta["status"] == "ok" else RED
+        print(
+            f"  {source:<26} {meta['duration']:8.2f}s  {color}{meta['status']}{RESET}"
+        )
+
+
+def run(modules=ENTRY_POINTS, top=10, probes=(), show_config=True):
+    """
+    Runs the start-up checks and prints them. probes is a list of
+    (kind, target) analyses whose collectors are timed as well.
+    Returns everything measured as a dict.
+    """
+    report = {"imports": [], "config": None, "probes": []}
+    print(f"{CYAN}{BOLD}Import time (fresh interpreter, -X importtime){RESET}")
+    for module in modules:
+        profile = profile_import(module, top=top)
+        report["imports"].append(profile)
+        print_import_profile(profile, top=top)
+    if show_config:
+        report["config"] = resolved_config()
+        print_config(report["config"])
+    for kind, target in probes:
+        probe = probe_collectors(kind, target)
+        report["probes"].append(probe)
+        print_probe(probe)
+    return report
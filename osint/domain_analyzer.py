@@ -1,13 +1,27 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import hashlib
 import json
 import os
-import socket
 import subprocess
-import requests
-import whois
-import dns.resolver
-from shodan import Shodan
-import sublist3r
-from pyhunter import PyHunter
+import tempfile
+import time
+from osint import (
+    cache,
+    clients,
+    config,
+    dns_engine,
+    http_client,
+    instrumentation,
+    rate_limit,
+)
+from osint.subdomains import SubdomainIndex
+from osint.utils import (
+    iter_json_array,
+    kill_process_tree,
+    run_async,
+    run_collectors,
+)
 
 # ANSI color codes for colored output
 RESET = "\033[0m"
@@ -19,13 +33,31 @@ MAGENTA = "\033[35m"
 BOLD = "\033[1m"
 
 
+# Result key -> source name used for configuration (timeouts, etc.)
+SOURCE_NAMES = {
+    "whois": "whois",
+    "dns": "dns",
+    "hosts": "hosts",
+    "subdomains_sublist3r": "sublist3r",
+    "subdomains_crtsh": "crtsh",
+    "hunter": "hunter",
+    "theharvester": "theharvester",
+    "wayback": "wayback",
+    "shodan": "shodan",
+    "virustotal": "virustotal",
+}
+
+
 # --- WHOIS ---
+@cache.cached("whois")
 def get_whois(domain):
     """
     Retrieves WHOIS information for the domain.
     """
     print(f"{CYAN}[INFO] Getting WHOIS for {domain}...{RESET}")
     try:
+        import whois
+
         w = whois.whois(domain)
         print(f"{GREEN}[SUCCESS] WHOIS data retrieved.{RESET}")
         return dict(w)
@@ -35,30 +67,87 @@ def get_whois(domain):
 
 
 # --- DNS lookup ---
+@cache.cached("dns")
 def get_dns(domain):
     """
-    Retrieves A, MX, NS, TXT DNS records for the domain.
+    Retrieves A, AAAA, MX, NS, TXT, CNAME, SOA and CAA DNS records for the
+    domain, all record types queried concurrently. A type whose query failed
+    is stored as None; {"error": ...} is returned if every query failed.
     """
     print(f"{CYAN}[INFO] Performing DNS lookup for {domain}...{RESET}")
-    records = {}
-    for record_type in ["A", "MX", "NS", "TXT"]:
-        try:
-            answers = dns.resolver.resolve(domain, record_type)
-            records[record_type] = [r.to_text() for r in answers]
+    records = dns_engine.get_records(domain)
+    if "error" in records:
+        print(f"{RED}[ERROR] {records['error']}{RESET}")
+        return records
+    for record_type, values in records.items():
+        if values is None:
+            print(f"{RED}[ERROR] DNS {record_type} query failed.{RESET}")
+        elif values:
             print(f"{GREEN}[SUCCESS] DNS {record_type} records found.{RESET}")
-        except Exception:
-            records[record_type] = []
+        else:
             print(f"{YELLOW}[WARN] No DNS {record_type} records found.{RESET}")
     return records
 
 
+def collect_subdomains(domain, results):
+    """
+    Returns every subdomain found by the enumeration sources, plus the domain,
+    normalized and merged by the subdomain index.
+    """
+    return SubdomainIndex.from_results(domain, results).names()
+
+
+def resolve_subdomains(domain, names):
+    """
+    Resolves the discovered subdomains concurrently and returns a host->IPs
+    map that later stages (Shodan, report) reuse. The map is cached for the
+    "hosts" TTL while the set of names does not change.
+    """
+    # La clave incluye un resumen de los nombres: si las fuentes encuentran
+    # subdominios nuevos, se vuelve a resolver
+    digest = hashlib.sha256("\n".join(sorted(names)).encode()).hexdigest()
+    key = f"{domain}|{digest}"
+    hit, hosts = cache.lookup("hosts", key)
+    if hit:
+        print(f"[CACHE] Using cached hosts result for {domain}.")
+        return hosts
+    print(f"{CYAN}[INFO] Resolving {len(names)} hostnames for {domain}...{RESET}")
+    try:
+        budget = dns_engine.QueryBudget(config.dns_query_budget())
+        hosts = dns_engine.resolve_hosts(names, budget)
+        if budget.failed and not hosts:
+            raise RuntimeError(f"all {budget.failed} DNS queries failed")
+        if budget.denied:
+            print(
+                f"{YELLOW}[WARN] DNS query budget exhausted, "
+                f"{budget.denied} queries skipped.{RESET}"
+            )
+        if budget.failed:
+            print(
+                f"{YELLOW}[WARN] {budget.failed} DNS queries failed "
+                f"(timeout or SERVFAIL).{RESET}"
+            )
+        if not budget.denied and not budget.failed:
+            # Un resultado parcial (presupuesto agotado, fallos) no se guarda
+            cache.store("hosts", key, hosts)
+        print(f"{GREEN}[SUCCESS] {len(hosts)} hostnames resolved.{RESET}")
+        return hosts
+    except Exception as e:
+        print(f"{RED}[ERROR] Hostname resolution failed: {e}{RESET}")
+        return {"error": str(e)}
+
+
 # --- Subdomain enumeration (Sublist3r) ---
+@cache.cached("sublist3r")
 def get_subdomains_sublist3r(domain):
     """
     Uses Sublist3r to enumerate subdomains.
     """
     print(f"{CYAN}[INFO] Enumerating subdomains with Sublist3r for {domain}...{RESET}")
     try:
+        # Importación diferida: Sublist3r tarda en cargar y solo se usa aquí
+        import sublist3r
+
         subdomains = sublist3r.main(
             domain,
             40,
@@ -77,34 +166,43 @@ def get_subdomains_sublist3r(domain):
 
 
 # --- crt.sh for certificate transparency ---
+@cache.cached("crtsh")
 def get_crtsh_subdomains(domain):
     """
     Retrieves subdomains from crt.sh certificate transparency logs.
+    The response is parsed while it downloads, so memory grows with the number
+    of unique subdomains and not with the size of the certificate list.
     """
     print(f"{CYAN}[INFO] Querying crt.sh for {domain}...{RESET}")
     url = f"https://crt.sh/?q=%25.{domain}&output=json"
+    domain = domain.strip().lower().rstrip(".")
+    suffix = "." + domain
     try:
-        r = requests.get(url, timeout=15)
-        if r.status_code == 200:
-            data = r.json()
+        with http_client.stream("GET", url, provider="crtsh", timeout=15) as r:
+            if r.status_code != 200:
+                print(f"{YELLOW}[WARN] crt.sh returned status {r.status_code}.{RESET}")
+                return []
             subs = set()
-            for entry in data:
+            for entry in iter_json_array(r.iter_text()):
                 name = entry.get("name_value")
-                if name:
-                    for sub in name.split("\n"):
-                        if domain in sub:
-                            subs.add(sub.strip())
-            print(f"{GREEN}[SUCCESS] crt.sh found {len(subs)} subdomains.{RESET}")
-            return list(subs)
-        else:
-            print(f"{YELLOW}[WARN] crt.sh returned status {r.status_code}.{RESET}")
-            return []
+                if not name:
+                    continue
+                for sub in name.split("\n"):
+                    sub = sub.strip().lower().rstrip(".")
+                    # Los comodines (*.example.com) se conservan: el índice de
+                    # subdominios los normaliza y los marca como tales
+                    base = sub[2:] if sub.startswith("*.") else sub
+                    if base == domain or base.endswith(suffix):
+                        subs.add(sub)
+        print(f"{GREEN}[SUCCESS] crt.sh found {len(subs)} subdomains.{RESET}")
+        return sorted(subs)
     except Exception as e:
         print(f"{RED}[ERROR] crt.sh failed: {e}{RESET}")
         return {"error": str(e)}
 
 
 # --- PyHunter (Hunter.io) ---
+@cache.cached("hunter")
 def hunter_domain_search(domain):
     """
     Uses Hunter.io to search for public emails associated with a domain.
@@ -114,8 +212,9 @@ def hunter_domain_search(domain):
     if not api_key:
         print(f"{RED}[ERROR] HUNTER_API_KEY not set in environment variables.{RESET}")
         return {"error": "HUNTER_API_KEY not set in environment variables."}
-    hunter = PyHunter(api_key)
+    hunter = clients.get("hunter", api_key)
     try:
+        rate_limit.acquire("hunter")
         results = hunter.domain_search(domain, limit=50)
         emails = []
         for email in results.get("emails", []):
@@ -139,14 +238,17 @@ def hunter_domain_search(domain):
 
 
 # --- theHarvester ---
-def theharvester_search(domain, sources="all", limit=100):
+THEHARVESTER_FIELDS = ("emails", "hosts", "subdomains", "ips", "asn")
+
+
+def _run_theharvester(domain, sources, limit, timeout):
     """
-    Runs theHarvester as a CLI subprocess and parses the JSON output.
-    Returns a dictionary with emails, hosts, subdomains, and raw output.
+    Runs one theHarvester process for a subset of sources in its own
+    temporary directory and returns its parsed JSON output. The process (and
+    its children) are killed if it exceeds the timeout.
     """
-    try:
-        # theHarvester admite salida en JSON con -f <filename> -s json
-        output_file = f"theharvester_{domain}.json"
+    with tempfile.TemporaryDirectory(prefix="theharvester-") as workdir:
+        # theHarvester admite salida en JSON con -f <filename>
         cmd = [
             "theHarvester",
             "-d",
@@ -156,69 +258,177 @@ def theharvester_search(domain, sources="all", limit=100):
             "-l",
             str(limit),
             "-f",
-            output_file,
+            "results.json",
         ]
         print(f"[INFO] Running theHarvester: {' '.join(cmd)}")
-        subprocess.run(cmd, check=True)
-        # Lee el JSON generado
+        with open(os.path.join(workdir, "output.log"), "w+") as log:
+            process = subprocess.Popen(
+                cmd,
+                cwd=workdir,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                start_new_session=os.name == "posix",
+            )
+            try:
+                returncode = process.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                kill_process_tree(process)
+                process.wait()
+                raise TimeoutError(f"theHarvester timed out after {timeout:g}s")
+            output_file = os.path.join(workdir, "results.json")
+            if not os.path.exists(output_file):
+                log.seek(0)
+                tail = log.read()[-300:].strip()
+                raise RuntimeError(
+                    f"theHarvester exited with code {returncode}: {tail or 'no output'}"
+                )
         with open(output_file, "r") as f:
-            data = json.load(f)
-        # Limpia el archivo si quieres
-        try:
-            os.remove(output_file)
-        except Exception:
-            pass
-
-        emails = data.get("emails", [])
-        hosts = data.get("hosts", [])
-        subdomains = data.get("subdomains", [])
-        ips = data.get("ips", [])
-        asn = data.get("asn", [])
-        return {
-            "emails": emails,
-            "hosts": hosts,
-            "subdomains": subdomains,
-            "ips": ips,
-            "asn": asn,
-            "raw": data,
-        }
-    except Exception as e:
-        print(f"[ERROR] theHarvester CLI failed: {e}")
-        return {"error": str(e)}
+            return json.load(f)
 
 
-def theharvester_cleanup():
+@cache.cached("theharvester")
+def theharvester_search(domain, sources=None, limit=100):
     """
-    Cleans up any temporary files created by theHarvester.
+    Runs theHarvester as a CLI subprocess and parses the JSON output.
+    Sources are split into subsets that run in parallel processes (see
+    INFOHUNTER_THEHARVESTER_WORKERS), each in its own temporary directory;
+    every subset is merged as soon as its process exits.
+    Returns a dictionary with emails, hosts, subdomains, and raw output.
     """
-    try:
-        for file in os.listdir("."):
-            if file.startswith("theharvester_") and file.endswith(".xml"):
-                os.remove(file)
-                print(f"{GREEN}[SUCCESS] Cleaned up {file}.{RESET}")
-    except Exception as e:
-        print(f"{RED}[ERROR] Cleanup failed: {e}{RESET}")
+    sources = sources.split(",") if isinstance(sources, str) else sources
+    sources = sources or config.theharvester_sources()
+    workers = max(1, min(config.theharvester_workers(), len(sources)))
+    if "all" in sources:
+        subsets = ["all"]
+    else:
+        subsets = [",".join(sources[i::workers]) for i in range(workers)]
+    timeout = config.source_timeout("theharvester")
+
+    merged = {field: [] for field in THEHARVESTER_FIELDS}
+    seen = {field: set() for field in THEHARVESTER_FIELDS}
+    errors = {}
+    with ThreadPoolExecutor(max_workers=len(subsets)) as pool:
+        futures = {
+            pool.submit(_run_theharvester, domain, subset, limit, timeout): subset
+            for subset in subsets
+        }
+        for future in as_completed(futures):
+            subset = futures[future]
+            try:
+                data = future.result()
+            except Exception as e:
+                print(f"[ERROR] theHarvester ({subset}) failed: {e}")
+                errors[subset] = str(e)
+                continue
+            for field in THEHARVESTER_FIELDS:
+                for value in data.get(field) or []:
+                    key = json.dumps(value, sort_keys=True, default=str)
+                    if key not in seen[field]:
+                        seen[field].add(key)
+                        merged[field].append(value)
+
+    if len(errors) == len(subsets):
+        print(f"[ERROR] theHarvester CLI failed: {'; '.join(errors.values())}")
+        return {"error": "; ".join(errors.values())}
+    return {**merged, "raw": {**merged, "errors": errors}}
 
 
 # --- Shodan (requires API key) ---
-def shodan_dns_resolve(domain, api_key):
+SHODAN_API_URL = "https://api.shodan.io"
+
+
+def shodan_dns_resolve(hostnames, api_key):
     """
-    Resolves a domain to IP using Shodan's DNS resolve API endpoint.
+    Resolves hostnames to IPs with Shodan's DNS resolve endpoint, sending them
+    in comma-separated batches. Returns {hostname: ip} for the resolved ones.
     """
-    url = f"https://api.shodan.io/dns/resolve?hostnames={domain}&key={api_key}"
-    try:
-        response = requests.get(url)
+    if isinstance(hostnames, str):
+        hostnames = [hostnames]
+    batch_size = max(1, config.shodan_dns_batch())
+    resolved = {}
+    for i in range(0, len(hostnames), batch_size):
+        batch = hostnames[i : i + batch_size]
+        try:
+            response = http_client.get(
+                f"{SHODAN_API_URL}/dns/resolve",
+                provider="shodan",
+                params={"hostnames": ",".join(batch), "key": api_key},
+            )
+            response.raise_for_status()
+            resolved.update({name: ip for name, ip in response.json().items() if ip})
+        except Exception as e:
+            print(f"{RED}[ERROR] Shodan DNS resolve failed: {e}{RESET}")
+    return resolved
+
+
+def _shodan_service(entry):
+    """
+    Keeps the fields of a Shodan service banner that the report uses.
+    """
+    service = {
+        "port": entry.get("port"),
+        "transport": entry.get("transport"),
+        "product": entry.get("product"),
+        "version": entry.get("version"),
+        "data": (entry.get("data") or "")[:200],
+    }
+    title = (entry.get("http") or {}).get("title")
+    if title:
+        service["http"] = {"title": title}
+    return service
+
+
+async def _shodan_host(ip, api_key):
+    """
+    Returns Shodan's host data for one IP, from the cache when it is fresh.
+    """
+    hit, value = cache.lookup("shodan", ip)
+    if hit:
+        return value
+    response = await http_client.fetch(
+        "GET",
+        f"{SHODAN_API_URL}/shodan/host/{ip}",
+        provider="shodan",
+        params={"key": api_key},
+    )
+    # 404: Shodan no tiene información de esa IP (no es un error)
+    if response.status_code == 404:
+        value = {"ip_str": ip, "ports": [], "data": [], "not_found": True}
+    else:
         response.raise_for_status()
-        data = response.json()
-        return data.get(domain, None)
-    except Exception as e:
-        print(f"{RED}[ERROR] Shodan DNS resolve failed: {e}{RESET}")
-        return None
+        host = response.json()
+        value = {
+            "ip_str": host.get("ip_str", ip),
+            "org": host.get("org"),
+            "isp": host.get("isp"),
+            "country_name": host.get("country_name"),
+            "os": host.get("os"),
+            "hostnames": host.get("hostnames", []),
+            "ports": sorted(host.get("ports", [])),
+            "vulns": sorted(host.get("vulns", [])),
+            "data": [_shodan_service(entry) for entry in host.get("data", [])],
+        }
+    cache.store("shodan", ip, value)
+    return value
+
+
+async def _shodan_hosts(ips, api_key):
+    async def one(ip):
+        try:
+            return ip, await _shodan_host(ip, api_key)
+        except Exception as e:
+            return ip, {"error": str(e)}
+
+    return dict(await asyncio.gather(*(one(ip) for ip in ips)))
 
 
-def shodan_scan(domain):
+def shodan_scan(domain, hostnames=None, hosts=None):
     """
-    Uses Shodan to scan for exposed services related to the domain.
+    Uses Shodan to scan for exposed services on every IP of the domain.
+    hosts is the host->IPs map from the DNS stage; hostnames missing from it
+    (by default just the domain) are resolved in bulk through Shodan. Host
+    data is fetched concurrently within the Shodan rate limit and cached per
+    IP. Returns the aggregated ports and vulnerabilities plus one entry per IP.
     """
     print(f"{CYAN}[INFO] Scanning with Shodan for {domain}...{RESET}")
     api_key = os.getenv("SHODAN_API_KEY")
@@ -226,22 +436,62 @@ def shodan_scan(domain):
         print(f"{YELLOW}[WARN] SHODAN_API_KEY not set in environment variables.{RESET}")
         return {"error": "SHODAN_API_KEY not set in environment variables."}
     try:
-        from shodan import Shodan
+        hosts = dict(hosts or {})
+        hostnames = sorted(set(hostnames or [domain]))
+        missing = [name for name in hostnames if name not in hosts]
+        if missing:
+            for name, ip in shodan_dns_resolve(missing, api_key).items():
+                hosts[name] = [ip]
 
-        ip = shodan_dns_resolve(domain, api_key)
-        if not ip:
+        # IP -> nombres que resuelven a ella (solo IPv4)
+        ip_hosts = {}
+        for name, ips in hosts.items():
+            for ip in ips:
+                if ":" not in ip:
+                    ip_hosts.setdefault(ip, []).append(name)
+        if not ip_hosts:
             print(f"{YELLOW}[WARN] Could not resolve domain to IP via Shodan.{RESET}")
             return {"error": "Could not resolve domain to IP via Shodan."}
-        api = Shodan(api_key)
-        shodan_data = api.host(ip)
-        print(f"{GREEN}[SUCCESS] Shodan scan complete for {ip}.{RESET}")
-        return shodan_data
+
+        # Primero las IPs compartidas por más nombres
+        ordered = sorted(ip_hosts, key=lambda ip: (-len(ip_hosts[ip]), ip))
+        max_ips = config.shodan_max_ips()
+        selected = ordered[:max_ips]
+        if len(ordered) > max_ips:
+            print(
+                f"{YELLOW}[WARN] {len(ordered)} IPs found, only the first "
+                f"{max_ips} are looked up in Shodan.{RESET}"
+            )
+
+        per_ip = run_async(
+            _shodan_hosts(selected, api_key), timeout=config.source_timeout("shodan")
+        )
+        ports, vulns, errors = set(), set(), {}
+        for ip, host in per_ip.items():
+            if "error" in host:
+                errors[ip] = host["error"]
+                continue
+            host["resolved_from"] = sorted(ip_hosts[ip])
+            ports.update(host.get("ports", []))
+            vulns.update(host.get("vulns", []))
+        ips = {ip: host for ip, host in per_ip.items() if "error" not in host}
+        if errors and not ips:
+            raise RuntimeError(next(iter(errors.values())))
+        print(f"{GREEN}[SUCCESS] Shodan scan complete for {len(ips)} IPs.{RESET}")
+        return {
+            "ips": ips,
+            "ports": sorted(ports),
+            "vulns": sorted(vulns),
+            "errors": errors,
+            "skipped": len(ordered) - len(selected),
+        }
     except Exception as e:
         print(f"{RED}[ERROR] Shodan scan failed: {e}{RESET}")
         return {"error": str(e)}
 
 
 # --- VirusTotal (requires API key) ---
+@cache.cached("virustotal")
 def vt_domain_report(domain):
     """
     Uses VirusTotal to get domain reputation and relations.
@@ -254,7 +504,7 @@ def vt_domain_report(domain):
     url = f"https://www.virustotal.com/api/v3/domains/{domain}"
     headers = {"x-apikey": api_key}
     try:
-        r = requests.get(url, headers=headers)
+        r = http_client.get(url, provider="virustotal", headers=headers)
         print(f"{GREEN}[SUCCESS] VirusTotal query complete.{RESET}")
         return r.json()
     except Exception as e:
@@ -263,46 +513,154 @@ def vt_domain_report(domain):
 
 
 # --- Wayback Machine (historical snapshots) ---
-def get_wayback_snapshots(domain):
+WAYBACK_CDX_URL = "http://web.archive.org/cdx/search/cdx"
+WAYBACK_FIELDS = ("timestamp", "original", "statuscode", "mimetype")
+
+
+@cache.cached("wayback")
+def get_wayback_snapshots(domain, since=None, until=None):
     """
     Retrieves historical snapshots from the Wayback Machine.
+    The CDX index is read page by page (limit/showResumeKey) and streamed into
+    per-year and per-status counters; only a small sample of rows is kept.
+    since/until are CDX timestamps or prefixes (e.g. '2015' or '20150601').
     """
     print(f"{CYAN}[INFO] Querying Wayback Machine for {domain}...{RESET}")
-    url = f"http://web.archive.org/cdx/search/cdx?url={domain}&output=json"
+    params = {
+        "url": domain,
+        "fl": ",".join(WAYBACK_FIELDS),
+        "limit": config.wayback_page_size(),
+        "showResumeKey": "true",
+    }
+    collapse = config.wayback_collapse()
+    if collapse:
+        params["collapse"] = collapse
+    if since:
+        params["from"] = since
+    if until:
+        params["to"] = until
+
+    sample_size = config.wayback_sample_size()
+    summary = {
+        "total": 0,
+        "first": None,
+        "last": None,
+        "per_year": {},
+        "per_status": {},
+        "sample": [],
+        "truncated": False,
+    }
     try:
-        r = requests.get(url)
-        if r.status_code == 200:
-            data = r.json()
-            print(
-                f"{GREEN}[SUCCESS] Wayback Machine returned {len(data)-1} snapshots.{RESET}"
-            )
-            return data[1:] if len(data) > 1 else []
-        print(f"{YELLOW}[WARN] Wayback Machine returned status {r.status_code}.{RESET}")
-        return []
+        for page in range(config.wayback_max_pages()):
+            resume_key = None
+            with http_client.stream(
+                "GET", WAYBACK_CDX_URL, provider="wayback", params=params
+            ) as r:
+                if r.status_code != 200:
+                    print(
+                        f"{YELLOW}[WARN] Wayback Machine returned status {r.status_code}.{RESET}"
+                    )
+                    summary["truncated"] = page > 0
+                    break
+                end_of_rows = False
+                for line in r.iter_lines():
+                    line = line.strip()
+                    # Tras una línea vacía llega la clave para la siguiente página
+                    if not line:
+                        end_of_rows = True
+                        continue
+                    if end_of_rows:
+                        resume_key = line
+                        continue
+                    row = dict(zip(WAYBACK_FIELDS, line.split(" ")))
+                    timestamp = row.get("timestamp", "")
+                    year = timestamp[:4]
+                    status = row.get("statuscode", "-")
+                    summary["total"] += 1
+                    summary["per_year"][year] = summary["per_year"].get(year, 0) + 1
+                    summary["per_status"][status] = (
+                        summary["per_status"].get(status, 0) + 1
+                    )
+                    if summary["first"] is None or timestamp < summary["first"]:
+                        summary["first"] = timestamp
+                    if summary["last"] is None or timestamp > summary["last"]:
+                        summary["last"] = timestamp
+                    if len(summary["sample"]) < sample_size:
+                        summary["sample"].append(row)
+            if not resume_key:
+                break
+            params["resumeKey"] = resume_key
+        else:
+            # Se alcanzó el máximo de páginas con datos pendientes
+            summary["truncated"] = True
+        summary["per_year"] = dict(sorted(summary["per_year"].items()))
+        print(
+            f"{GREEN}[SUCCESS] Wayback Machine returned {summary['total']} snapshots.{RESET}"
+        )
+        return summary
     except Exception as e:
         print(f"{RED}[ERROR] Wayback Machine query failed: {e}{RESET}")
         return {"error": str(e)}
 
 
 # --- Main analysis function ---
-def analyze(domain):
+def analyze(domain, on_result=None):
     """
     Performs a full OSINT analysis on the domain and returns a results dictionary.
+    All sources run concurrently; each one is bounded by its own timeout and by
+    the overall analysis deadline (see osint.config). Once they finish, the
+    subdomains they found are resolved into results["hosts"] (host -> IPs),
+    and Shodan looks up every resolved IP. Per-source timings and counters
+    are stored in results["_meta"] (see osint.instrumentation).
+    on_result, if given, is called as on_result(key, result, meta) as soon as
+    each source finishes.
     """
     print(f"{MAGENTA}{BOLD}=== Starting OSINT Domain Analysis for {domain} ==={RESET}")
-    results = {}
-    results["whois"] = get_whois(domain)
-    results["dns"] = get_dns(domain)
-    results["subdomains_sublist3r"] = get_subdomains_sublist3r(domain)
-    results["subdomains_crtsh"] = get_crtsh_subdomains(domain)
-    results["hunter"] = hunter_domain_search(domain)
-    results["theharvester"] = theharvester_search(domain)
-    results["wayback"] = get_wayback_snapshots(domain)
-    results["shodan"] = shodan_scan(domain)
-    results["virustotal"] = vt_domain_report(domain)
-    print(f"{MAGENTA}{BOLD}=== Domain Analysis Complete ==={RESET}")
+    collectors = {
+        "whois": lambda: get_whois(domain),
+        "dns": lambda: get_dns(domain),
+        "subdomains_sublist3r": lambda: get_subdomains_sublist3r(domain),
+        "subdomains_crtsh": lambda: get_crtsh_subdomains(domain),
+        "hunter": lambda: hunter_domain_search(domain),
+        "theharvester": lambda: theharvester_search(domain),
+        "wayback": lambda: get_wayback_snapshots(domain),
+        "virustotal": lambda: vt_domain_report(domain),
+    }
+    timeouts = {key: config.source_timeout(SOURCE_NAMES[key]) for key in collectors}
+    deadline = config.analysis_deadline()
+    start = time.monotonic()
+    recorder = instrumentation.Recorder(on_result)
+    results = run_collectors(
+        collectors,
+        timeouts=timeouts,
+        deadline=deadline,
+        on_result=recorder.on_result,
+    )
+
+    def run_stage(key, func):
+        remaining = max(0.0, deadline - (time.monotonic() - start))
+        results.update(
+            run_collectors(
+                {key: func},
+                timeouts={key: config.source_timeout(SOURCE_NAMES[key])},
+                deadline=remaining,
+                on_result=recorder.on_result,
+            )
+        )
+
+    # Segunda fase: resolver los subdominios encontrados por las fuentes
+    names = collect_subdomains(domain, results)
+    run_stage("hosts", lambda: resolve_subdomains(domain, names))
 
-    # Clean up any temporary files created by theHarvester
-    theharvester_cleanup()
+    # Tercera fase: Shodan sobre todas las IPs resueltas
+    hosts = results["hosts"] if "error" not in results["hosts"] else {}
+    run_stage("shodan", lambda: shodan_scan(domain, names, hosts))
+
+    for key, result in results.items():
+        if isinstance(result, dict) and result.get("timeout"):
+            print(f"{YELLOW}[WARN] {result['error']}, result discarded.{RESET}")
+    results["_meta"] = recorder.meta()
+    instrumentation.print_summary(results["_meta"])
+    print(f"{MAGENTA}{BOLD}=== Domain Analysis Complete ==={RESET}")
 
     return results
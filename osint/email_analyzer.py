@@ -1,8 +1,11 @@
-import csv
-import glob
+import asyncio
+import functools
+import importlib
 import os
-import requests
-import subprocess
+import pkgutil
+import time
+from osint import cache, config, http_client, instrumentation
+from osint.utils import run_async, run_collectors
 
 # ANSI color codes for colored output
 RESET = "\033[0m"
@@ -13,16 +16,9 @@ RED = "\033[31m"
 MAGENTA = "\033[35m"
 BOLD = "\033[1m"
 
-# Try to import intelxapi for Intelligence X integration
-try:
-    from intelxapi import intelx
-
-    INTELX_AVAILABLE = True
-except ImportError:
-    INTELX_AVAILABLE = False
-
 
 # ---------- HIBP ----------
+@cache.cached("hibp")
 def analyze_hibp(email):
     """
     Checks if the email appears in breaches using Have I Been Pwned (HIBP) API.
@@ -40,7 +36,9 @@ def analyze_hibp(email):
     params = {"truncateResponse": "false"}
 
     try:
-        response = requests.get(url, headers=headers, params=params, timeout=30)
+        response = http_client.get(
+            url, provider="hibp", headers=headers, params=params, timeout=30
+        )
         if response.status_code == 200:
             breaches = response.json()
             print(f"{GREEN}[SUCCESS] [HIBP] {len(breaches)} breaches found.{RESET}")
@@ -56,12 +54,13 @@ def analyze_hibp(email):
                 "error": f"API error {response.status_code}: {response.text}",
                 "email": email,
             }
-    except requests.RequestException as e:
+    except http_client.HTTPError as e:
         print(f"{RED}[ERROR] [HIBP] Request error: {e}{RESET}")
         return {"error": str(e), "email": email}
 
 
 # ---------- BreachDirectory ----------
+@cache.cached("breachdirectory")
 def analyze_breachdirectory(email):
     """
     Checks if the email appears in breaches using BreachDirectory via RapidAPI.
@@ -82,7 +81,13 @@ def analyze_breachdirectory(email):
     }
 
     try:
-        response = requests.get(url, headers=headers, params=querystring, timeout=30)
+        response = http_client.get(
+            url,
+            provider="breachdirectory",
+            headers=headers,
+            params=querystring,
+            timeout=30,
+        )
         if response.status_code == 200:
             data = response.json()
             return parse_breachdirectory_response(email, data)
@@ -103,7 +108,7 @@ def analyze_breachdirectory(email):
                 "error": f"API error {response.status_code}: {response.text}",
                 "email": email,
             }
-    except requests.RequestException as e:
+    except http_client.HTTPError as e:
         print(f"{RED}[ERROR] [BreachDirectory] Request error: {e}{RESET}")
         return {"error": str(e), "email": email}
 
@@ -128,8 +133,12 @@ def parse_breachdirectory_response(email, response_json):
         has_password = entry.get("hash_password")
         if has_password is None:
             has_password = entry.get("has_password", False)
+        # 'sources' llega como lista en la API actual
+        source = entry.get("sources", "Unknown")
+        if isinstance(source, list):
+            source = ", ".join(str(s) for s in source) or "Unknown"
         leak_info = {
-            "source": entry.get("sources", "Unknown"),
+            "source": source,
             "has_password": has_password,
             "password": entry.get("password", None),
             "sha1": entry.get("sha1", None),
@@ -152,123 +161,312 @@ def parse_breachdirectory_response(email, response_json):
 
 
 # ---------- Holehe ----------
-#
-def analyze_holehe(email):
+@functools.lru_cache(maxsize=1)
+def _holehe_modules():
     """
-    Runs Holehe CLI to check the presence of the email in online services.
+    Imports Holehe's site modules once and returns their check functions.
     """
-    print(f"\n{CYAN}[INFO] [Holehe] Checking services for {email}...{RESET}")
-    # Ejecuta Holehe con CSV y solo servicios donde existe el email
-    subprocess.run(
-        ["holehe", "--csv", "--only-used", email],
-        capture_output=True,
-        text=True,
-    )
-    print(f"{GREEN}[SUCCESS] [Holehe] Finished.{RESET}")
+    import holehe.modules
+    from holehe.core import get_functions
+
+    # holehe.core.import_submodules() recorre los subpaquetes sin prefijo y
+    # acaba importando 'osint' (este paquete) en lugar de holehe.modules.osint
+    package = holehe.modules
+    modules = {
+        info.name: importlib.import_module(info.name)
+        for info in pkgutil.walk_packages(package.__path__, package.__name__ + ".")
+        if not info.ispkg
+    }
+    return get_functions(modules)
+
+
+def _holehe_summary(out):
+    """
+    Turns Holehe's raw module output into the structured result.
+    """
+    used = []
+    rate_limited = []
+    for entry in sorted(out, key=lambda e: e.get("name", "")):
+        if entry.get("exists"):
+            used.append(
+                {
+                    "name": entry.get("name"),
+                    "domain": entry.get("domain"),
+                    "method": entry.get("method"),
+                    "emailrecovery": entry.get("emailrecovery"),
+                    "phoneNumber": entry.get("phoneNumber"),
+                    "others": entry.get("others"),
+                }
+            )
+        elif entry.get("rateLimit"):
+            rate_limited.append(entry.get("domain"))
+    return {"used": used, "rate_limited": rate_limited, "checked": len(out)}
+
+
+async def check_holehe(emails):
+    """
+    Runs every Holehe site module for each email on the running event loop,
+    sharing one HTTP client and at most INFOHUNTER_HOLEHE_CONCURRENCY checks
+    at a time. Returns {email: structured result}.
+    """
+    from holehe.core import launch_module
+
+    modules = _holehe_modules()
+    slots = asyncio.Semaphore(config.holehe_concurrency())
+    # Como en el CLI de Holehe: sin redirecciones ni cabeceras por defecto
+    client = http_client.new_client(timeout=config.holehe_timeout())
+    outputs = {email: [] for email in emails}
 
-    # Busca el archivo CSV generado (nombre dinámico)
-    pattern = f"holehe_*_{email}_results.csv"
-    matching_files = glob.glob(pattern)
-    if not matching_files:
-        print(f"{YELLOW}[WARNING] [Holehe] CSV output file not found.{RESET}")
-        return []
+    async def check(module, email):
+        async with slots:
+            await launch_module(module, email, client, outputs[email])
 
-    csv_file = matching_files[0]  # Toma el primero (debería ser único)
-    domains = []
     try:
-        with open(csv_file, newline="", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                domain = row.get("domain") or row.get("Domain")
-                if domain:
-                    domains.append(domain.strip())
+        await asyncio.gather(
+            *(check(module, email) for email in emails for module in modules)
+        )
     finally:
-        try:
-            os.remove(csv_file)
-        except Exception as e:
-            print(f"{YELLOW}[WARNING] [Holehe] Could not delete CSV: {e}{RESET}")
-    return domains
+        await client.aclose()
+    return {email: _holehe_summary(out) for email, out in outputs.items()}
+
+
+def analyze_holehe_many(emails):
+    """
+    Checks several emails with Holehe in one pass over the shared event loop.
+    """
+    return run_async(
+        check_holehe(list(emails)), timeout=config.source_timeout("holehe")
+    )
+
+
+@cache.cached("holehe")
+def analyze_holehe(email):
+    """
+    Checks the presence of the email in online services with Holehe's site
+    modules, run in-process. Returns the services where the email is used.
+    """
+    print(f"\n{CYAN}[INFO] [Holehe] Checking services for {email}...{RESET}")
+    try:
+        result = analyze_holehe_many([email])[email]
+    except Exception as e:
+        print(f"{RED}[ERROR] [Holehe] {e}{RESET}")
+        return {"error": str(e)}
+    print(
+        f"{GREEN}[SUCCESS] [Holehe] Finished: {len(result['used'])} of "
+        f"{result['checked']} services use this email.{RESET}"
+    )
+    return result
 
 
 # ---------- Intelligence X ----------
-def get_intelx_preview(api_key, systemid, api_root="https://free.intelx.io"):
+INTELX_BUCKETS = [
+    "leaks.public.wikileaks",
+    "leaks.public.general",
+    "dumpster",
+    "documents.public.scihub",
+]
+
+# Estados de /intelligent/search/result
+INTELX_MORE = 0
+INTELX_DONE = 1
+INTELX_NOT_FOUND = 2
+INTELX_PENDING = 3
+
+
+async def _intelx_preview(api_key, record, slots):
     """
-    Fetches the preview for a given systemid from Intelligence X API.
+    Returns the text preview of one record. Previews never change, so they
+    are cached by systemid with a long TTL.
     """
-    url = f"{api_root}/file/preview"
-    headers = {"x-key": api_key, "User-Agent": "InfoHunter-OSINT"}
-    params = {"systemid": systemid}
+    systemid = record.get("systemid")
+    if not systemid or not record.get("storageid"):
+        return "Preview not available: missing systemid"
+    lines = config.intelx_preview_lines()
+    key = f"{systemid}|{lines}"
+    hit, preview = cache.lookup("intelx_preview", key)
+    if hit:
+        return preview
+    params = {
+        "sid": record["storageid"],
+        "b": record.get("bucket", ""),
+        "c": record.get("type", 0),
+        "m": record.get("media", 0),
+        "f": 0,
+        "l": lines,
+    }
     try:
-        response = requests.get(url, headers=headers, params=params, timeout=15)
-        if response.status_code == 200:
-            return response.text
-        else:
-            return f"Preview not available: HTTP {response.status_code}"
+        async with slots:
+            response = await http_client.fetch(
+                "GET",
+                f"{config.intelx_api_root()}/file/preview",
+                provider="intelx_preview",
+                headers={"x-key": api_key},
+                params=params,
+                timeout=config.intelx_preview_timeout(),
+            )
     except Exception as e:
         return f"Preview not available: {e}"
+    if response.status_code != 200:
+        return f"Preview not available: HTTP {response.status_code}"
+    cache.store("intelx_preview", key, response.text)
+    return response.text
+
+
+async def _intelx_search(api_key, term):
+    """
+    Starts one search and reads its result pages by search ID until the
+    search finishes, the configured maximum of records is reached or the
+    polling deadline passes; an unfinished search is terminated.
+    """
+    api_root = config.intelx_api_root()
+    headers = {"x-key": api_key}
+    max_results = config.intelx_max_results()
+    response = await http_client.fetch(
+        "POST",
+        f"{api_root}/intelligent/search",
+        provider="intelx",
+        headers=headers,
+        json={
+            "term": term,
+            "buckets": INTELX_BUCKETS,
+            "lookuplevel": 0,
+            "maxresults": max_results,
+            "timeout": 5,
+            "sort": 2,
+            "media": 0,
+            "terminate": [],
+        },
+    )
+    response.raise_for_status()
+    search_id = response.json()["id"]
+
+    records = []
+    status = INTELX_MORE
+    # Límite propio: si el colector vence, run_async cancela la corrutina,
+    # pero una búsqueda que siempre está pendiente no debe sondearse sin fin
+    deadline = time.monotonic() + config.intelx_search_deadline()
+    while len(records) < max_results and time.monotonic() < deadline:
+        response = await http_client.fetch(
+            "GET",
+            f"{api_root}/intelligent/search/result",
+            provider="intelx",
+            headers=headers,
+            params={
+                "id": search_id,
+                "limit": min(config.intelx_page_size(), max_results - len(records)),
+            },
+        )
+        response.raise_for_status()
+        page = response.json()
+        status = page.get("status", INTELX_DONE)
+        records.extend(page.get("records") or [])
+        if status in (INTELX_DONE, INTELX_NOT_FOUND):
+            break
+        if status == INTELX_PENDING:
+            # Aún no hay resultados nuevos: esperar antes de volver a pedir
+            await asyncio.sleep(1)
+    truncated = status not in (INTELX_DONE, INTELX_NOT_FOUND)
+    if truncated:
+        await http_client.fetch(
+            "GET",
+            f"{api_root}/intelligent/search/terminate",
+            provider="intelx",
+            headers=headers,
+            params={"id": search_id},
+        )
+    return {"records": records[:max_results], "truncated": truncated}
+
+
+async def search_intelx(emails, api_key):
+    """
+    Searches several emails in one Intelligence X session: searches run
+    concurrently (within the IntelX rate limit) and the previews of every
+    result are then fetched through a capped pool. Returns {email: result}.
+    """
+    slots = asyncio.Semaphore(config.intelx_preview_concurrency())
+
+    async def one(email):
+        try:
+            result = await _intelx_search(api_key, email)
+        except Exception as e:
+            return email, {"error": str(e)}
+        records = result["records"][: config.intelx_max_previews()]
+        previews = await asyncio.gather(
+            *(_intelx_preview(api_key, record, slots) for record in records)
+        )
+        for record, preview in zip(records, previews):
+            record["preview"] = preview
+        return email, result
+
+    return dict(await asyncio.gather(*(one(email) for email in emails)))
 
 
+def analyze_intelx_many(emails):
+    """
+    Synchronous wrapper around search_intelx() for several emails.
+    """
+    api_key = os.getenv("INTELX_KEY")
+    if not api_key:
+        return {
+            email: {"error": "INTELX_KEY not set in environment variables."}
+            for email in emails
+        }
+    return run_async(
+        search_intelx(list(emails), api_key), timeout=config.source_timeout("intelx")
+    )
+
+
+@cache.cached("intelx")
 def analyze_intelx(email):
     """
     Queries Intelligence X using the API key, returns results with previews for each record.
     """
     print(f"\n{CYAN}[INFO] [Intelligence X] Searching leaks for {email}...{RESET}")
-    api_key = os.getenv("INTELX_KEY")
-    if not INTELX_AVAILABLE:
-        print(f"{RED}[ERROR] [Intelligence X] intelxapi not installed.{RESET}")
-        return {"error": "intelxapi not installed."}
-    if not api_key:
+    if not os.getenv("INTELX_KEY"):
         print(
             f"{RED}[ERROR] [Intelligence X] INTELX_KEY not set in environment variables.{RESET}"
         )
         return {"error": "INTELX_KEY not set in environment variables."}
     try:
-        from intelxapi import intelx
-
-        ix = intelx(api_key)
-        ix.API_ROOT = "https://free.intelx.io"
-        buckets = [
-            "leaks.public.wikileaks",
-            "leaks.public.general",
-            "dumpster",
-            "documents.public.scihub",
-        ]
-        results = ix.search(email, buckets=buckets)
-        records = results.get("records", [])
-        print(f"{GREEN}[SUCCESS] [Intelligence X] {len(records)} results found.{RESET}")
-        # Fetch preview for each record using manual HTTP request
-        for record in records:
-            systemid = record.get("systemid")
-            if not systemid:
-                record["preview"] = "Preview not available: missing systemid"
-                continue
-            # preview = get_intelx_preview(api_key, systemid, api_root=ix.API_ROOT)
-        # record["preview"] = preview
-        return results
+        result = analyze_intelx_many([email])[email]
     except Exception as e:
-        print(f"{RED}[ERROR] [Intelligence X] Error: {e}{RESET}")
-        return {"error": str(e)}
+        result = {"error": str(e)}
+    if "error" in result:
+        print(f"{RED}[ERROR] [Intelligence X] Error: {result['error']}{RESET}")
+        return result
+    print(
+        f"{GREEN}[SUCCESS] [Intelligence X] {len(result['records'])} results found.{RESET}"
+    )
+    return result
 
 
 # ---------- Combined Analysis ----------
-def analyze(email):
+def analyze(email, on_result=None):
     """
     Performs a combined OSINT analysis using HIBP, BreachDirectory, Holehe, and Intelligence X.
-    Returns a dictionary with all results.
+    The sources run concurrently, each bounded by its configured timeout.
+    on_result, if given, is called as on_result(key, result, meta) as soon as
+    each source finishes. Returns a dictionary with all results and the
+    per-source timings and counters under "_meta".
     """
     print(f"\n{BOLD}{MAGENTA}[START] OSINT email analysis for: {email}{RESET}")
-    hibp_result = analyze_hibp(email)
-    breachdirectory_result = analyze_breachdirectory(email)
-    holehe_result = analyze_holehe(email)
-    intelx_result = analyze_intelx(email)
-    print(f"{BOLD}{MAGENTA}[END] Email analysis finished for: {email}{RESET}\n")
-    return {
-        "email": email,
-        "hibp": hibp_result,
-        "breachdirectory": breachdirectory_result,
-        "holehe": holehe_result,
-        "intelx": intelx_result,
+    collectors = {
+        "hibp": lambda: analyze_hibp(email),
+        "breachdirectory": lambda: analyze_breachdirectory(email),
+        "holehe": lambda: analyze_holehe(email),
+        "intelx": lambda: analyze_intelx(email),
     }
+    recorder = instrumentation.Recorder(on_result)
+    found = run_collectors(
+        collectors,
+        timeouts={key: config.source_timeout(key) for key in collectors},
+        deadline=config.analysis_deadline(),
+        on_result=recorder.on_result,
+    )
+    meta = recorder.meta()
+    instrumentation.print_summary(meta)
+    print(f"{BOLD}{MAGENTA}[END] Email analysis finished for: {email}{RESET}\n")
+    return {"email": email, **found, "_meta": meta}
 
 
 # ---------- Console Report ----------
@@ -316,8 +514,15 @@ def print_email_results(results):
 
     # Holehe
     print(f"\n{CYAN}🔹 [Holehe]{RESET}")
-    holehe = results.get("holehe", "")
-    print(holehe if holehe else f"{YELLOW}  No results or error.{RESET}")
+    holehe = results.get("holehe", {})
+    if isinstance(holehe, dict) and holehe.get("error"):
+        print(f"{RED}  [ERROR] {holehe['error']}{RESET}")
+    elif isinstance(holehe, dict) and holehe.get("used"):
+        print(f"{GREEN}  Used on {len(holehe['used'])} services:{RESET}")
+        for service in holehe["used"]:
+            print(f"   - {service['domain']}")
+    else:
+        print(f"{YELLOW}  No results or error.{RESET}")
 
     # Intelligence X
     print(f"\n{CYAN}🔹 [Intelligence X]{RESET}")
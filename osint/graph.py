@@ -0,0 +1,654 @@
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+
+from osint import config
+
+# ANSI color codes for colored output
+RESET = "\033[0m"
+CYAN = "\033[36m"
+GREEN = "\033[32m"
+YELLOW = "\033[33m"
+RED = "\033[31m"
+MAGENTA = "\033[35m"
+BOLD = "\033[1m"
+
+NODE_TYPES = (
+    "domain",
+    "subdomain",
+    "ip",
+    "email",
+    "username",
+    "breach",
+    "profile",
+)
+
+# Tipos de nodo que se pueden analizar (y sugerir como siguiente objetivo)
+TARGET_TYPES = ("domain", "email", "username")
+
+# Nodos como máximo que recorre una consulta de vecindad
+MAX_WALK = 200000
+
+_local = threading.local()
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS nodes ("
+    " id INTEGER PRIMARY KEY,"
+    " type TEXT NOT NULL,"
+    " value TEXT NOT NULL,"
+    " first_seen REAL NOT NULL,"
+    " last_seen REAL NOT NULL,"
+    " analyzed REAL,"
+    " UNIQUE (type, value))",
+    "CREATE TABLE IF NOT EXISTS edges ("
+    " src INTEGER NOT NULL,"
+    " dst INTEGER NOT NULL,"
+    " rel TEXT NOT NULL,"
+    " source TEXT NOT NULL,"
+    " first_seen REAL NOT NULL,"
+    " last_seen REAL NOT NULL,"
+    " PRIMARY KEY (src, dst, rel, source)) WITHOUT ROWID",
+    "CREATE INDEX IF NOT EXISTS edges_dst ON edges (dst, src)",
+    "CREATE INDEX IF NOT EXISTS nodes_pending ON nodes (type, analyzed)",
+)
+
+
+def _connect():
+    """
+    Returns this thread's connection to the graph database, creating it on first use.
+    """
+    path = config.graph_path()
+    conn = getattr(_local, "conn", None)
+    if conn is not None and _local.key == (os.getpid(), path):
+        return conn
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    with conn:
+        for statement in SCHEMA:
+            conn.execute(statement)
+    _local.conn = conn
+    _local.key = (os.getpid(), path)
+    return conn
+
+
+def _iso(timestamp):
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+
+def normalize(node_type, value):
+    """
+    Returns the stored form of a node value: hostnames, emails and usernames
+    are case-insensitive; breach names and profile URLs are kept as given.
+    """
+    value = str(value).strip()
+    if node_type in ("domain", "subdomain"):
+        return value.lower().rstrip(".")
+    if node_type in ("email", "username"):
+        return value.lower()
+    if node_type == "profile":
+        return value.rstrip("/")
+    return value
+
+
+# ---------- Extracting entities from results ----------
+# Cada extractor recibe el objetivo y el resultado de una fuente y devuelve
+# las aristas ((tipo, valor), relación, (tipo, valor)) que aporta.
+def _host_node(domain, name):
+    from osint.subdomains import normalize as normalize_host
+
+    normalized = normalize_host(name)
+    if normalized is None:
+        return None
+    name = normalized[0]
+    if name == domain:
+        return ("domain", name)
+    if name.endswith("." + domain):
+        return ("subdomain", name)
+    return None
+
+
+def _email_edges(email):
+    """
+    Edges known from an email alone: it belongs to its domain and its local
+    part (without '+tag') is a likely username on other sites.
+    """
+    email = normalize("email", email)
+    local, _, domain = email.rpartition("@")
+    local = local.split("+", 1)[0]
+    if domain:
+        yield ("domain", domain), "has_email", ("email", email)
+    if local:
+        yield ("email", email), "local_part", ("username", local)
+
+
+def _subdomain_edges(domain, names):
+    for name in names or []:
+        node = _host_node(domain, name)
+        if node and node[0] == "subdomain":
+            yield ("domain", domain), "has_subdomain", node
+
+
+def _domain_list(domain, result):
+    if isinstance(result, list):
+        yield from _subdomain_edges(domain, result)
+
+
+def _domain_theharvester(domain, result):
+    yield from _subdomain_edges(domain, result.get("subdomains"))
+    for host in result.get("hosts") or []:
+        if not isinstance(host, str):
+            continue
+        name, _, ip = host.partition(":")
+        node = _host_node(domain, name)
+        if node is None:
+            continue
+        if node[0] == "subdomain":
+            yield ("domain", domain), "has_subdomain", node
+        if ip:
+            yield node, "resolves_to", ("ip", ip)
+    for email in result.get("emails") or []:
+        if isinstance(email, str) and "@" in email:
+            yield from _email_edges(email)
+    for ip in result.get("ips") or []:
+        if isinstance(ip, str):
+            yield ("domain", domain), "related_ip", ("ip", ip)
+
+
+def _domain_hunter(domain, result):
+    for email in result.get("emails") or []:
+        if "@" in (email.get("value") or ""):
+            yield from _email_edges(email["value"])
+
+
+def _domain_hosts(domain, result):
+    for name, ips in result.items():
+        node = _host_node(domain, name)
+        if node is None:
+            continue
+        for ip in ips:
+            yield node, "resolves_to", ("ip", ip)
+
+
+def _domain_dns(domain, result):
+    for record_type in ("A", "AAAA"):
+        for ip in result.get(record_type) or []:
+            yield ("domain", domain), "resolves_to", ("ip", ip)
+
+
+def _email_hibp(email, result):
+    for breach in result.get("breaches") or []:
+        name = breach.get("Name") or breach.get("Title")
+        if name:
+            yield ("email", email), "breached_in", ("breach", name)
+
+
+def _email_breachdirectory(email, result):
+    # Varias fuentes de una misma filtración llegan unidas por ", "
+    for leak in result.get("leaks") or []:
+        for name in str(leak.get("source") or "").split(", "):
+            if name and name.lower() != "unknown":
+                yield ("email", email), "breached_in", ("breach", name)
+
+
+def _profile_urls(result):
+    # Las listas antiguas mezclaban mensajes "Error running ..." con las URLs
+    return [url for url in result if isinstance(url, str) and url.startswith("http")]
+
+
+def _username_profiles(username, result):
+    if isinstance(result, list):
+        for url in _profile_urls(result):
+            yield ("username", username), "has_profile", ("profile", url)
+
+
+# Tipo de análisis -> {clave del resultado: (fuente, extractor)}
+EXTRACTORS = {
+    "domain": {
+        "subdomains_sublist3r": ("sublist3r", _domain_list),
+        "subdomains_crtsh": ("crtsh", _domain_list),
+        "theharvester": ("theharvester", _domain_theharvester),
+        "hunter": ("hunter", _domain_hunter),
+        "hosts": ("dns", _domain_hosts),
+        "dns": ("dns", _domain_dns),
+    },
+    "email": {
+        "hibp": ("hibp", _email_hibp),
+        "breachdirectory": ("breachdirectory", _email_breachdirectory),
+    },
+    "username": {
+        "sherlock_profiles": ("sherlock", _username_profiles),
+        "maigret_profiles": ("maigret", _username_profiles),
+    },
+}
+
+
+# ---------- Writing ----------
+def _node_id(conn, node_type, value, now, analyzed=False):
+    row = conn.execute(
+        "INSERT INTO nodes (type, value, first_seen, last_seen, analyzed)"
+        " VALUES (?, ?, ?, ?, ?)"
+        " ON CONFLICT (type, value) DO UPDATE SET last_seen = excluded.last_seen,"
+        " analyzed = COALESCE(excluded.analyzed, analyzed)"
+        " RETURNING id",
+        (node_type, value, now, now, now if analyzed else None),
+    ).fetchone()
+    return row[0]
+
+
+def add_edges(edges, source):
+    """
+    Adds (src_node, rel, dst_node) edges found by source in one transaction,
+    creating their nodes if needed and refreshing last_seen on known ones.
+    Returns the number of edges written.
+    """
+    now = time.time()
+    conn = _connect()
+    ids = {}
+    count = 0
+    with conn:
+        for src, rel, dst in edges:
+            for node in (src, dst):
+                if node not in ids:
+                    ids[node] = _node_id(conn, node[0], normalize(*node), now)
+            conn.execute(
+                "INSERT INTO edges (src, dst, rel, source, first_seen, last_seen)"
+                " VALUES (?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (src, dst, rel, source)"
+                " DO UPDATE SET last_seen = excluded.last_seen",
+                (ids[src], ids[dst], rel, source, now, now),
+            )
+            count += 1
+    return count
+
+
+def add_target(kind, target):
+    """
+    Adds what is known from the target itself (an email's domain and local
+    part) before its analysis runs.
+    """
+    if kind == "email" and "@" in target:
+        add_edges(list(_email_edges(target)), "target")
+
+
+def mark_analyzed(kind, target):
+    """
+    Records that target has been analyzed, so it leaves pending().
+    """
+    conn = _connect()
+    with conn:
+        _node_id(conn, kind, normalize(kind, target), time.time(), analyzed=True)
+
+
+def has_results(kind, results):
+    """
+    Returns True if at least one source of an analysis finished and returned
+    a result without error. A profile list holding only error messages
+    counts as a failure.
+    """
+    sources = (results.get("_meta") or {}).get("sources")
+    if sources is None:
+        # Resultados guardados sin '_meta': se miran las fuentes conocidas
+        sources = {key: {"status": "ok"} for key in EXTRACTORS.get(kind, {})}
+    for key, meta in sources.items():
+        result = results.get(key)
+        if meta.get("status") != "ok" or result is None:
+            continue
+        if isinstance(result, dict) and "error" in result:
+            continue
+        # Una lista que solo contiene mensajes de error es una fuente fallida
+        if isinstance(result, list) and result and not _profile_urls(result):
+            continue
+        return True
+    return False
+
+
+def record_analysis(kind, target, results):
+    """
+    Marks target as analyzed once its analysis has returned, unless every
+    source failed: then it stays pending and is suggested again.
+    """
+    try:
+        if isinstance(results, dict) and has_results(kind, results):
+            mark_analyzed(kind, target)
+    except Exception as e:
+        print(f"{YELLOW}[WARN] Entity graph not updated: {e}{RESET}")
+
+
+def ingest(kind, target, key, result):
+    """
+    Adds the entities found by one source of an analysis to the graph.
+    Failed sources and unknown keys are ignored. Returns the number of edges.
+    """
+    entry = EXTRACTORS.get(kind, {}).get(key)
+    if entry is None or result is None:
+        return 0
+    if isinstance(result, dict) and "error" in result:
+        return 0
+    source, extract = entry
+    return add_edges(list(extract(normalize(kind, target), result)), source)
+
+
+def hook(kind, target, forward=None):
+    """
+    Returns an on_result(key, result, meta) callback for an analyzer that adds
+    every source to the graph as soon as it finishes, then calls forward.
+    A graph error never interrupts the analysis. The target is marked as
+    analyzed separately, with record_analysis() once the analysis returns.
+    """
+    try:
+        add_target(kind, target)
+    except Exception as e:
+        print(f"{YELLOW}[WARN] Entity graph not updated: {e}{RESET}")
+
+    def on_result(key, result, meta):
+        try:
+            ingest(kind, target, key, result)
+        except Exception as e:
+            print(f"{YELLOW}[WARN] Entity graph not updated ({key}): {e}{RESET}")
+        if forward:
+            forward(key, result, meta)
+
+    return on_result
+
+
+def ingest_results(kind, target, results):
+    """
+    Adds a complete, stored analysis result to the graph (e.g. results
+    written by --format or batch mode before the graph existed).
+    """
+    add_target(kind, target)
+    count = sum(
+        ingest(kind, target, key, result)
+        for key, result in results.items()
+        if not key.startswith("_")
+    )
+    record_analysis(kind, target, results)
+    return count
+
+
+# ---------- Queries ----------
+def _node_dict(row):
+    return {
+        "type": row["type"],
+        "value": row["value"],
+        "first_seen": _iso(row["first_seen"]),
+        "last_seen": _iso(row["last_seen"]),
+        "analyzed": _iso(row["analyzed"]),
+    }
+
+
+def find(node_type, value):
+    """
+    Returns a node as a dict, or None if it is not in the graph.
+    """
+    row = (
+        _connect()
+        .execute(
+            "SELECT * FROM nodes WHERE type = ? AND value = ?",
+            (node_type, normalize(node_type, value)),
+        )
+        .fetchone()
+    )
+    return _node_dict(row) if row else None
+
+
+def neighbors(node_type, value, rel=None):
+    """
+    Returns the nodes linked to a node in either direction, each with the
+    relation, its direction ("out" or "in"), the sources that reported it
+    and when it was first and last seen.
+    """
+    conn = _connect()
+    row = conn.execute(
+        "SELECT id FROM nodes WHERE type = ? AND value = ?",
+        (node_type, normalize(node_type, value)),
+    ).fetchone()
+    if row is None:
+        return []
+    rows = conn.execute(
+        "SELECT n.type, n.value, e.rel, 'out' AS direction,"
+        " group_concat(e.source) AS sources,"
+        " min(e.first_seen) AS first_seen, max(e.last_seen) AS last_seen"
+        " FROM edges e JOIN nodes n ON n.id = e.dst WHERE e.src = ?"
+        " GROUP BY e.dst, e.rel"
+        " UNION ALL "
+        "SELECT n.type, n.value, e.rel, 'in' AS direction,"
+        " group_concat(e.source) AS sources,"
+        " min(e.first_seen) AS first_seen, max(e.last_seen) AS last_seen"
+        " FROM edges e JOIN nodes n ON n.id = e.src WHERE e.dst = ?"
+        " GROUP BY e.src, e.rel",
+        (row["id"], row["id"]),
+    ).fetchall()
+    return [
+        {
+            "type": r["type"],
+            "value": r["value"],
+            "rel": r["rel"],
+            "direction": r["direction"],
+            "sources": sorted(set(r["sources"].split(","))),
+            "first_seen": _iso(r["first_seen"]),
+            "last_seen": _iso(r["last_seen"]),
+        }
+        for r in rows
+        if rel is None or r["rel"] == rel
+    ]
+
+
+def _chunks(ids, size=500):
+    # Por tandas para no pasar del límite de parámetros de SQLite
+    ids = list(ids)
+    for i in range(0, len(ids), size):
+        yield ids[i : i + size]
+
+
+def _walk(conn, start_id, depth, limit=MAX_WALK):
+    """
+    Breadth-first walk from a node over edges in both directions. Returns
+    {node_id: distance} for up to limit nodes.
+    """
+    distances = {start_id: 0}
+    frontier = [start_id]
+    for distance in range(1, depth + 1):
+        if not frontier or len(distances) >= limit:
+            break
+        found = []
+        for chunk in _chunks(frontier):
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT dst AS id FROM edges WHERE src IN ({placeholders})"
+                f" UNION SELECT src AS id FROM edges WHERE dst IN ({placeholders})",
+                chunk + chunk,
+            )
+            for r in rows:
+                if r["id"] not in distances and len(distances) < limit:
+                    distances[r["id"]] = distance
+                    found.append(r["id"])
+        frontier = found
+    return distances
+
+
+def related(node_type, value, depth=2, types=None, limit=1000):
+    """
+    Returns up to limit nodes reachable from a node within depth hops,
+    nearest first, optionally only of the given types. For example, the
+    other domains sharing an IP or the emails that appear in the same breach.
+    """
+    conn = _connect()
+    row = conn.execute(
+        "SELECT id FROM nodes WHERE type = ? AND value = ?",
+        (node_type, normalize(node_type, value)),
+    ).fetchone()
+    if row is None:
+        return []
+    distances = _walk(conn, row["id"], depth)
+    del distances[row["id"]]
+    found = []
+    for chunk in _chunks(distances):
+        rows = conn.execute(
+            f"SELECT * FROM nodes WHERE id IN ({','.join('?' * len(chunk))})", chunk
+        )
+        for r in rows:
+            if types and r["type"] not in types:
+                continue
+            found.append({**_node_dict(r), "distance": distances[r["id"]]})
+    found.sort(key=lambda n: (n["distance"], n["type"], n["value"]))
+    return found[:limit]
+
+
+def pending(types=TARGET_TYPES, limit=50):
+    """
+    Returns the domains, emails and usernames found by earlier analyses that
+    have not been analyzed themselves, most connected first: the natural
+    next targets of an investigation.
+    """
+    placeholders = ",".join("?" * len(types))
+    rows = (
+        _connect()
+        .execute(
+            "SELECT n.*, (SELECT count(*) FROM edges WHERE src = n.id)"
+            " + (SELECT count(*) FROM edges WHERE dst = n.id) AS degree"
+            f" FROM nodes n WHERE n.type IN ({placeholders}) AND n.analyzed IS NULL"
+            " ORDER BY degree DESC, n.last_seen DESC LIMIT ?",
+            (*types, limit),
+        )
+        .fetchall()
+    )
+    return [{**_node_dict(r), "degree": r["degree"]} for r in rows]
+
+
+def stats():
+    """
+    Returns the number of nodes per type and the number of edges.
+    """
+    conn = _connect()
+    nodes = dict(conn.execute("SELECT type, count(*) FROM nodes GROUP BY type"))
+    edges = conn.execute("SELECT count(*) FROM edges").fetchone()[0]
+    return {"nodes": nodes, "edges": edges}
+
+
+# ---------- Export ----------
+def to_networkx(center=None, depth=2, limit=5000):
+    """
+    Returns the graph (or the part within depth hops of center, a
+    (type, value) tuple) as a networkx MultiDiGraph. Nodes are keyed
+    'type:value'; edges carry rel and source. Needs networkx.
+    """
+    import networkx as nx
+
+    conn = _connect()
+    if center is None:
+        ids = None
+    else:
+        row = conn.execute(
+            "SELECT id FROM nodes WHERE type = ? AND value = ?",
+            (center[0], normalize(*center)),
+        ).fetchone()
+        ids = set(_walk(conn, row["id"], depth, limit)) if row else set()
+
+    graph = nx.MultiDiGraph()
+    labels = {}
+    for r in conn.execute("SELECT * FROM nodes"):
+        if ids is not None and r["id"] not in ids:
+            continue
+        labels[r["id"]] = f"{r['type']}:{r['value']}"
+        graph.add_node(
+            labels[r["id"]],
+            type=r["type"],
+            value=r["value"],
+            analyzed=r["analyzed"] is not None,
+        )
+    for r in conn.execute("SELECT src, dst, rel, source FROM edges"):
+        if r["src"] in labels and r["dst"] in labels:
+            graph.add_edge(
+                labels[r["src"]], labels[r["dst"]], rel=r["rel"], source=r["source"]
+            )
+    return graph
+
+
+# Colores por tipo de nodo en la exportación HTML
+NODE_COLORS = {
+    "domain": "#1F4E79",
+    "subdomain": "#2E86C1",
+    "ip": "#7F8C8D",
+    "email": "#D35400",
+    "username": "#27AE60",
+    "breach": "#C0392B",
+    "profile": "#8E44AD",
+}
+
+
+def export_html(path, center=None, depth=2, limit=5000):
+    """
+    Writes an interactive HTML view of the graph with pyvis. Needs pyvis.
+    """
+    from pyvis.network import Network
+
+    graph = to_networkx(center, depth, limit)
+    # in_line: un único fichero HTML, sin carpeta lib/ junto a él
+    net = Network(height="800px", width="100%", directed=True, cdn_resources="in_line")
+    for name, data in graph.nodes(data=True):
+        net.add_node(
+            name,
+            label=data["value"],
+            title=name,
+            color=NODE_COLORS.get(data["type"], "#888888"),
+            borderWidth=3 if data["analyzed"] else 1,
+        )
+    seen = set()
+    for src, dst, data in graph.edges(data=True):
+        if (src, dst, data["rel"]) not in seen:
+            seen.add((src, dst, data["rel"]))
+            net.add_edge(src, dst, title=data["rel"])
+    net.write_html(path)
+    return path
+
+
+def export_graphml(path, center=None, depth=2, limit=5000):
+    """
+    Writes the graph in GraphML (Gephi, Cytoscape...). Needs networkx.
+    """
+    import networkx as nx
+
+    nx.write_graphml(to_networkx(center, depth, limit), path)
+    return path
+
+
+# ---------- Console ----------
+def print_neighbors(node_type, value, items):
+    print(f"{MAGENTA}{BOLD}=== {node_type}:{value} ({len(items)} links) ==={RESET}")
+    for item in sorted(items, key=lambda i: (i["rel"], i["type"], i["value"])):
+        arrow = "->" if item["direction"] == "out" else "<-"
+        print(
+            f"  {CYAN}{item['rel']:<14}{RESET} {arrow} {item['type']}:{item['value']}"
+            f"  {YELLOW}[{', '.join(item['sources'])}]{RESET}"
+        )
+
+
+def print_related(node_type, value, items):
+    print(
+        f"{MAGENTA}{BOLD}=== Related to {node_type}:{value} ({len(items)}) ==={RESET}"
+    )
+    for item in items:
+        mark = f"{GREEN}analyzed{RESET}" if item["analyzed"] else ""
+        print(f"  {item['distance']}  {item['type']}:{item['value']}  {mark}")
+
+
+def print_pending(items):
+    print(f"{MAGENTA}{BOLD}=== Suggested next targets ({len(items)}) ==={RESET}")
+    for item in items:
+        print(f"  {item['degree']:>4}  {item['type']}:{item['value']}")
+
+
+def print_stats(counts):
+    print(f"{CYAN}{BOLD}Entity graph: {config.graph_path()}{RESET}")
+    for node_type in NODE_TYPES:
+        print(f"  {node_type:<10} {counts['nodes'].get(node_type, 0)}")
+    print(f"  {'edges':<10} {counts['edges']}")
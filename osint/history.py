@@ -0,0 +1,352 @@
+import itertools
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+
+from osint import cache, config
+
+# ANSI color codes for colored output
+RESET = "\033[0m"
+CYAN = "\033[36m"
+GREEN = "\033[32m"
+YELLOW = "\033[33m"
+RED = "\033[31m"
+MAGENTA = "\033[35m"
+BOLD = "\033[1m"
+
+_local = threading.local()
+
+
+def _connect():
+    """
+    Returns this thread's connection to the history database.
+    """
+    path = config.history_path()
+    conn = getattr(_local, "conn", None)
+    if conn is not None and _local.key == (os.getpid(), path):
+        return conn
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    with conn:
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS runs ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " kind TEXT NOT NULL,"
+            " target TEXT NOT NULL,"
+            " created REAL NOT NULL,"
+            " results TEXT NOT NULL)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS runs_target ON runs (kind, target, created)"
+        )
+    _local.conn = conn
+    _local.key = (os.getpid(), path)
+    return conn
+
+
+def _iso(timestamp):
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+
+def save(kind, target, results):
+    """
+    Stores the results of one run and prunes runs beyond the configured
+    history size. Returns the run timestamp as an ISO string.
+    """
+    now = time.time()
+    target = cache.normalize_target(target)
+    conn = _connect()
+    with conn:
+        conn.execute(
+            "INSERT INTO runs (kind, target, created, results) VALUES (?, ?, ?, ?)",
+            (kind, target, now, json.dumps(results, default=str)),
+        )
+        conn.execute(
+            "DELETE FROM runs WHERE kind = ? AND target = ? AND id NOT IN ("
+            " SELECT id FROM runs WHERE kind = ? AND target = ?"
+            " ORDER BY created DESC LIMIT ?)",
+            (kind, target, kind, target, config.history_keep()),
+        )
+    return _iso(now)
+
+
+def last(kind, target):
+    """
+    Returns (created_at, results) of the latest stored run, or None.
+    """
+    for run in runs(kind, target):
+        return run
+    return None
+
+
+def runs(kind, target):
+    """
+    Yields (created_at, results) for every stored run of a target, newest
+    first. Each run is decoded only when it is reached.
+    """
+    rows = (
+        _connect()
+        .execute(
+            "SELECT created, results FROM runs WHERE kind = ? AND target = ?"
+            " ORDER BY created DESC",
+            (kind, cache.normalize_target(target)),
+        )
+        .fetchall()
+    )
+    for created, results in rows:
+        yield _iso(created), json.loads(results)
+
+
+# ---------- What is compared ----------
+# Cada extractor recibe el resultado y el objetivo y devuelve el conjunto de
+# elementos de un aspecto, o None si su fuente falló (así un error no parece
+# un borrado).
+def _ok(value):
+    return value is not None and not (isinstance(value, dict) and "error" in value)
+
+
+def _subdomains(results, target):
+    sources = [results.get("subdomains_sublist3r"), results.get("subdomains_crtsh")]
+    if not any(isinstance(source, list) for source in sources) and not _ok(
+        results.get("theharvester")
+    ):
+        return None
+    from osint.subdomains import SubdomainIndex
+
+    return set(SubdomainIndex.from_results(target, results).names())
+
+
+def _hosts(results, target):
+    hosts = results.get("hosts")
+    if not _ok(hosts):
+        return None
+    return {f"{host} {ip}" for host, ips in hosts.items() for ip in ips}
+
+
+def _open_ports(results, target):
+    shodan = results.get("shodan")
+    if not _ok(shodan) or "ips" not in shodan:
+        return None
+    return {
+        f"{ip}:{port}"
+        for ip, host in shodan["ips"].items()
+        for port in host.get("ports", [])
+    }
+
+
+def _vulns(results, target):
+    shodan = results.get("shodan")
+    if not _ok(shodan):
+        return None
+    return set(shodan.get("vulns") or [])
+
+
+def _domain_emails(results, target):
+    emails = set()
+    valid = False
+    hunter = results.get("hunter")
+    if _ok(hunter):
+        valid = True
+        emails.update(
+            e["value"].lower() for e in hunter.get("emails", []) if e.get("value")
+        )
+    theharvester = results.get("theharvester")
+    if _ok(theharvester):
+        valid = True
+        emails.update(e.lower() for e in theharvester.get("emails") or [])
+    return emails if valid else None
+
+
+# El serial del SOA cambia con cada actualización de la zona: no se compara
+DNS_DIFF_TYPES = ("A", "AAAA", "CNAME", "MX", "NS", "TXT", "CAA")
+
+
+def _dns(results, target):
+    dns = results.get("dns")
+    # Un tipo cuya consulta falló (None) no puede compararse
+    if not _ok(dns) or any(dns.get(rtype, []) is None for rtype in DNS_DIFF_TYPES):
+        return None
+    return {
+        f"{rtype} {record}"
+        for rtype, records in dns.items()
+        if rtype in DNS_DIFF_TYPES
+        for record in records or []
+    }
+
+
+def _breaches(results, target):
+    hibp = results.get("hibp")
+    if not _ok(hibp):
+        return None
+    return {b.get("Name") or b.get("Title") for b in hibp.get("breaches", [])}
+
+
+def _leaks(results, target):
+    bd = results.get("breachdirectory")
+    if not _ok(bd):
+        return None
+    return {leak.get("source") for leak in bd.get("leaks", []) if leak.get("source")}
+
+
+def _services(results, target):
+    holehe = results.get("holehe")
+    if not _ok(holehe) or not isinstance(holehe, dict):
+        return None
+    return {s.get("domain") or s.get("name") for s in holehe.get("used", [])}
+
+
+def _intelx(results, target):
+    intelx = results.get("intelx")
+    if not _ok(intelx):
+        return None
+    return {r.get("systemid") or r.get("name") for r in intelx.get("records", [])}
+
+
+def _profiles(results, target):
+    # Solo URLs: los mensajes de error de una herramienta no son perfiles
+    lists = [
+        profiles
+        for profiles in (
+            results.get("sherlock_profiles"),
+            results.get("maigret_profiles"),
+        )
+        if isinstance(profiles, list)
+        and (not profiles or any(str(p).startswith("http") for p in profiles))
+    ]
+    if not lists:
+        return None
+    return {
+        url.rstrip("/").lower()
+        for profiles in lists
+        for url in profiles
+        if isinstance(url, str) and url.startswith("http")
+    }
+
+
+# Tipo de análisis -> {aspecto comparado: extractor}
+DIFF_FIELDS = {
+    "domain": {
+        "subdomains": _subdomains,
+        "hosts": _hosts,
+        "open_ports": _open_ports,
+        "vulns": _vulns,
+        "emails": _domain_emails,
+        "dns": _dns,
+    },
+    "email": {
+        "breaches": _breaches,
+        "leaks": _leaks,
+        "services": _services,
+        "intelx_records": _intelx,
+    },
+    "username": {"profiles": _profiles},
+}
+
+
+def diff(kind, target, previous, current):
+    """
+    Compares a result with the earlier runs of the same target. previous is
+    an iterable of earlier results, newest first. Each aspect is compared
+    with the newest run in which its source did not fail, so what appeared
+    while a source was down is still reported once it is back.
+    Returns (changes, skipped): changes maps each aspect with differences to
+    {"added": [...], "removed": [...]}; skipped lists the aspects that could
+    not be compared because their source failed now or in every earlier run.
+    An empty previous is a baseline: nothing is reported as changed.
+    """
+    fields = DIFF_FIELDS[kind]
+    after = {field: extract(current, target) for field, extract in fields.items()}
+    before = {}
+    seen = False
+    for results in previous:
+        seen = True
+        for field, extract in fields.items():
+            if field not in before and after[field] is not None:
+                value = extract(results, target)
+                if value is not None:
+                    before[field] = value
+        if len(before) == sum(value is not None for value in after.values()):
+            break
+    if not seen:
+        return {}, []
+
+    changes = {}
+    skipped = []
+    for field in fields:
+        if after[field] is None or field not in before:
+            skipped.append(field)
+            continue
+        added = sorted(str(x) for x in after[field] - before[field])
+        removed = sorted(str(x) for x in before[field] - after[field])
+        if added or removed:
+            changes[field] = {"added": added, "removed": removed}
+    return changes, skipped
+
+
+def since_last(kind, target, results):
+    """
+    Diffs a new result against the previous runs of the same target (see
+    diff()), stores it as the latest run and returns the change report.
+    Sources still fresh in the result cache were not fetched again; they are
+    listed in "reused".
+    """
+    earlier = runs(kind, target)
+    previous = next(earlier, None)
+    changes, skipped = diff(
+        kind,
+        target,
+        itertools.chain([previous[1]], (r for _, r in earlier)) if previous else [],
+        results,
+    )
+    sources = (results.get("_meta") or {}).get("sources", {})
+    reused = sorted(
+        source
+        for source, meta in sources.items()
+        if meta.get("cache_hits") and not meta.get("requests")
+    )
+    return {
+        "type": kind,
+        "target": target,
+        "previous_run": previous[0] if previous else None,
+        "current_run": save(kind, target, results),
+        "first_run": previous is None,
+        "changed": bool(changes),
+        "changes": changes,
+        "skipped": skipped,
+        "reused": reused,
+    }
+
+
+def print_changes(report):
+    """
+    Prints a change report from since_last() for the console.
+    """
+    title = f"{report['type']} {report['target']}"
+    if report["first_run"]:
+        print(f"{CYAN}[HISTORY] First run for {title}: baseline stored.{RESET}")
+        return
+    print(
+        f"{MAGENTA}{BOLD}=== Changes for {title} since {report['previous_run']} ==={RESET}"
+    )
+    if report["reused"]:
+        print(f"{CYAN}[INFO] Reused from cache: {', '.join(report['reused'])}{RESET}")
+    if report["skipped"]:
+        print(
+            f"{YELLOW}[WARN] Not compared (source failed): "
+            f"{', '.join(report['skipped'])}{RESET}"
+        )
+    if not report["changed"]:
+        print(f"{GREEN}No changes.{RESET}")
+        return
+    for field, change in report["changes"].items():
+        print(f"{BOLD}{field}{RESET}")
+        for item in change["added"]:
+            print(f"  {GREEN}+ {item}{RESET}")
+        for item in change["removed"]:
+            print(f"  {RED}- {item}{RESET}")
@@ -0,0 +1,238 @@
+import asyncio
+from urllib.parse import urlsplit
+
+import httpx
+
+from osint import config, instrumentation, rate_limit
+from osint.utils import run_async
+
+USER_AGENT = "InfoHunter-OSINT"
+
+# Respuestas que indican límite de peticiones y se reintentan
+RETRY_STATUS = (429, 503)
+
+# Excepción base que deben capturar los colectores
+HTTPError = httpx.HTTPError
+
+_client = None
+_client_loop = None
+_host_slots = {}
+_transport = None
+
+
+def _http2_available():
+    """
+    HTTP/2 needs the optional 'h2' package; fall back to HTTP/1.1 without it.
+    """
+    try:
+        import h2  # noqa: F401
+
+        return True
+    except ImportError:
+        return False
+
+
+async def _on_response(response):
+    # Cuenta cada respuesta (redirecciones incluidas) en la fuente que la pidió;
+    # los bytes se suman al leer el cuerpo, que aquí aún no ha llegado
+    instrumentation.record_response(response.status_code)
+
+
+def new_client(**kwargs):
+    """
+    Creates a separate AsyncClient with the configured pool limits and
+    transport, for libraries that need their own client settings (e.g. no
+    redirects or no default headers). The caller must close it.
+    Responses are counted in the running source's instrumentation.
+    """
+    options = {
+        "http2": _http2_available(),
+        "timeout": httpx.Timeout(
+            config.http_timeout(), connect=config.http_connect_timeout()
+        ),
+        "limits": httpx.Limits(
+            max_connections=config.http_max_connections(),
+            max_keepalive_connections=config.http_max_connections(),
+            keepalive_expiry=config.http_keepalive_expiry(),
+        ),
+        "transport": _transport,
+        "event_hooks": {"response": [_on_response]},
+    }
+    options.update(kwargs)
+    return httpx.AsyncClient(**options)
+
+
+def _get_client():
+    """
+    Returns the shared AsyncClient for the running loop, creating it on first use.
+    """
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client_loop is not loop:
+        _client = new_client(
+            headers={"User-Agent": USER_AGENT},
+            follow_redirects=True,
+        )
+        _client_loop = loop
+        _host_slots.clear()
+    return _client
+
+
+def _host_slot(url):
+    """
+    Returns the semaphore limiting concurrent requests to the URL's host.
+    """
+    host = urlsplit(url).netloc
+    slot = _host_slots.get(host)
+    if slot is None:
+        slot = _host_slots[host] = asyncio.Semaphore(config.http_max_per_host())
+    return slot
+
+
+async def fetch(method, url, provider=None, **kwargs):
+    """
+    Sends a request through the shared pooled client and returns the fully read
+    httpx.Response. Keyword arguments are passed to httpx (params, headers,
+    json, timeout...); without an explicit timeout the configured policy applies.
+    429/503 answers are retried after their Retry-After delay. When provider
+    is given, the request first waits for that provider's rate limit and a
+    Retry-After delay also holds back the provider's other requests.
+    """
+    client = _get_client()
+    retries = config.http_retries()
+    attempt = 0
+    while True:
+        await rate_limit.acquire_async(provider)
+        async with _host_slot(url):
+            response = await client.request(method, url, **kwargs)
+        instrumentation.add("bytes", len(response.content))
+        if response.status_code not in RETRY_STATUS or attempt >= retries:
+            return response
+        delay = rate_limit.parse_retry_after(
+            response.headers.get("Retry-After"), default=2**attempt
+        )
+        # Todas las peticiones al mismo proveedor esperan, no solo esta
+        rate_limit.penalize(provider, delay)
+        instrumentation.add("retries")
+        await asyncio.sleep(delay)
+        attempt += 1
+
+
+def request(method, url, provider=None, **kwargs):
+    """
+    Synchronous wrapper around fetch() for the collectors.
+    """
+    return run_async(fetch(method, url, provider=provider, **kwargs))
+
+
+def get(url, provider=None, **kwargs):
+    """
+    Synchronous GET through the shared pooled client.
+    """
+    return request("GET", url, provider=provider, **kwargs)
+
+
+async def _open_stream(method, url, provider=None, **kwargs):
+    """
+    Like fetch() but returns as soon as the headers arrive, leaving the body
+    unread so it can be consumed incrementally.
+    """
+    client = _get_client()
+    retries = config.http_retries()
+    attempt = 0
+    while True:
+        await rate_limit.acquire_async(provider)
+        async with _host_slot(url):
+            response = await client.send(
+                client.build_request(method, url, **kwargs), stream=True
+            )
+        if response.status_code not in RETRY_STATUS or attempt >= retries:
+            return response
+        await response.aclose()
+        delay = rate_limit.parse_retry_after(
+            response.headers.get("Retry-After"), default=2**attempt
+        )
+        rate_limit.penalize(provider, delay)
+        instrumentation.add("retries")
+        await asyncio.sleep(delay)
+        attempt += 1
+
+
+class StreamedResponse:
+    """
+    Synchronous view of a streamed response. The body is pulled from the
+    shared event loop one chunk at a time, so only the current chunk is held
+    in memory. Use it as a context manager so the connection is released.
+    """
+
+    def __init__(self, response):
+        self._response = response
+        self.status_code = response.status_code
+        self.headers = response.headers
+
+    def iter_bytes(self, chunk_size=65536):
+        chunks = self._response.aiter_bytes(chunk_size)
+        while True:
+            try:
+                yield run_async(chunks.__anext__())
+            except StopAsyncIteration:
+                return
+
+    def iter_text(self, chunk_size=65536):
+        chunks = self._response.aiter_text(chunk_size)
+        while True:
+            try:
+                yield run_async(chunks.__anext__())
+            except StopAsyncIteration:
+                return
+
+    def iter_lines(self):
+        lines = self._response.aiter_lines()
+        while True:
+            try:
+                yield run_async(lines.__anext__())
+            except StopAsyncIteration:
+                return
+
+    def close(self):
+        run_async(self._response.aclose())
+        instrumentation.add("bytes", self._response.num_bytes_downloaded)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def stream(method, url, provider=None, **kwargs):
+    """
+    Sends a request through the shared pooled client and returns a
+    StreamedResponse whose body is read incrementally. Retries, rate limits
+    and timeouts follow the same policy as fetch().
+    """
+    return StreamedResponse(
+        run_async(_open_stream(method, url, provider=provider, **kwargs))
+    )
+
+
+def set_transport(transport):
+    """
+    Replaces the network transport of the shared client, e.g. with an
+    httpx.MockTransport that replays recorded responses offline (benchmarks).
+    None restores the default network transport.
+    """
+    global _transport, _client
+    _transport = transport
+    _client = None
+
+
+async def aclose():
+    """
+    Closes the shared client and its pooled connections.
+    """
+    global _client, _client_loop
+    if _client is not None:
+        await _client.aclose()
+    _client = None
+    _client_loop = None
@@ -0,0 +1,259 @@
+import contextlib
+import contextvars
+import os
+import threading
+import time
+from datetime import datetime
+
+from osint.utils import utc_now
+
+# ANSI color codes for colored output
+RESET = "\033[0m"
+CYAN = "\033[36m"
+GREEN = "\033[32m"
+YELLOW = "\033[33m"
+RED = "\033[31m"
+BOLD = "\033[1m"
+
+# Contadores que registra cada fuente (todos empiezan en 0)
+COUNTERS = ("requests", "bytes", "retries", "cache_hits", "cache_misses")
+
+# Estadísticas de la fuente que se está ejecutando. Se hereda en el bucle
+# asyncio compartido, así que las peticiones HTTP se atribuyen a su colector.
+_current = contextvars.ContextVar("infohunter_source", default=None)
+
+
+class SourceStats:
+    """
+    Counters for one collector run: HTTP requests, bytes received, response
+    status codes, retries and cache hits/misses.
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.http_status = {}
+        self.lock = threading.Lock()
+
+    def add(self, counter, value=1):
+        with self.lock:
+            self.counters[counter] = self.counters.get(counter, 0) + value
+
+    def add_status(self, status_code):
+        with self.lock:
+            key = str(status_code)
+            self.http_status[key] = self.http_status.get(key, 0) + 1
+
+    def snapshot(self):
+        """
+        Returns the counters collected so far as a plain dict.
+        """
+        with self.lock:
+            return {**self.counters, "http_status": dict(self.http_status)}
+
+
+@contextlib.contextmanager
+def activate(stats):
+    """
+    Attributes everything recorded inside the block to the given stats.
+    """
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def add(counter, value=1):
+    """
+    Adds to a counter of the running source; does nothing outside a collector.
+    """
+    stats = _current.get()
+    if stats is not None:
+        stats.add(counter, value)
+
+
+def record_response(status_code, num_bytes=0):
+    """
+    Records one HTTP response received by the running source.
+    """
+    stats = _current.get()
+    if stats is not None:
+        stats.add("requests")
+        stats.add("bytes", num_bytes)
+        stats.add_status(status_code)
+
+
+class Recorder:
+    """
+    Collects the per-source metadata reported by run_collectors() during one
+    analysis and forwards it to the caller's on_result callback, if any.
+    meta() returns the '_meta' section stored in the results.
+    """
+
+    def __init__(self, on_result=None):
+        self.forward = on_result
+        self.sources = {}
+        self.started_at = utc_now()
+        self.start = time.monotonic()
+
+    def on_result(self, source, result, meta):
+        self.sources[source] = meta
+        if self.forward:
+            self.forward(source, result, meta)
+
+    def meta(self):
+        return {
+            "started_at": self.started_at,
+            "finished_at": utc_now(),
+            "duration": round(time.monotonic() - self.start, 3),
+            "sources": dict(self.sources),
+        }
+
+
+def _format_bytes(num):
+    for unit in ("B", "KB", "MB"):
+        if num < 1024:
+            return f"{num:.0f} {unit}" if unit == "B" else f"{num:.1f} {unit}"
+        num /= 1024
+    return f"{num:.1f} GB"
+
+
+def print_summary(meta):
+    """
+    Prints one row per source with its outcome, duration and counters.
+    """
+    print(f"\n{CYAN}{BOLD}[SUMMARY] Sources ({meta['duration']:.2f}s total){RESET}")
+    print(
+        f"  {'source':<22} {'status':<8} {'time':>8} {'reqs':>5} {'bytes':>9} "
+        f"{'retry':>5} {'cache':>7}  http"
+    )
+    for source, m in sorted(
+        meta["sources"].items(), key=lambda item: -item[1].get("duration", 0)
+    ):
+        color = {"ok": GREEN, "timeout": YELLOW}.get(m.get("status"), RED)
+        cache = f"{m.get('cache_hits', 0)}/{m.get('cache_misses', 0)}"
+        codes = " ".join(
+            f"{code}x{count}"
+            for code, count in sorted(m.get("http_status", {}).items())
+        )
+        print(
+            f"  {source:<22} {color}{m.get('status', '?'):<8}{RESET} "
+            f"{m.get('duration', 0):>7.2f}s {m.get('requests', 0):>5} "
+            f"{_format_bytes(m.get('bytes', 0)):>9} {m.get('retries', 0):>5} "
+            f"{cache:>7}  {codes}"
+        )
+
+
+def _label_value(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus_text(analyses):
+    """
+    Renders the metadata of one or more analyses in the Prometheus text
+    exposition format (e.g. for node_exporter's textfile collector).
+    analyses is a list of (kind, target, meta) tuples.
+    """
+    metrics = {
+        "infohunter_analysis_duration_seconds": ("gauge", "Total analysis time"),
+        "infohunter_source_duration_seconds": ("gauge", "Time spent by a source"),
+        "infohunter_source_up": ("gauge", "1 if the source finished without error"),
+        "infohunter_source_requests_total": ("counter", "HTTP requests sent"),
+        "infohunter_source_bytes_total": ("counter", "HTTP response bytes received"),
+        "infohunter_source_retries_total": ("counter", "HTTP requests retried"),
+        "infohunter_source_cache_hits_total": ("counter", "Result cache hits"),
+        "infohunter_source_cache_misses_total": ("counter", "Result cache misses"),
+        "infohunter_source_http_responses_total": (
+            "counter",
+            "HTTP responses by status code",
+        ),
+    }
+    samples = {name: [] for name in metrics}
+
+    def labels(**values):
+        return ",".join(f'{k}="{_label_value(v)}"' for k, v in values.items())
+
+    for kind, target, meta in analyses:
+        samples["infohunter_analysis_duration_seconds"].append(
+            (labels(kind=kind, target=target), meta["duration"])
+        )
+        for source, m in meta["sources"].items():
+            base = dict(kind=kind, target=target, source=source)
+            samples["infohunter_source_duration_seconds"].append(
+                (labels(**base, status=m.get("status")), m.get("duration", 0))
+            )
+            samples["infohunter_source_up"].append(
+                (labels(**base), 1 if m.get("status") == "ok" else 0)
+            )
+            for counter in COUNTERS:
+                samples[f"infohunter_source_{counter}_total"].append(
+                    (labels(**base), m.get(counter, 0))
+                )
+            for code, count in m.get("http_status", {}).items():
+                samples["infohunter_source_http_responses_total"].append(
+                    (labels(**base, code=code), count)
+                )
+
+    lines = []
+    for name, (metric_type, help_text) in metrics.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        lines.extend(f"{name}{{{lbl}}} {value}" for lbl, value in samples[name])
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path, analyses):
+    """
+    Writes prometheus_text() to a file, replacing it atomically so a scraper
+    never reads it half written.
+    """
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(prometheus_text(analyses))
+    os.replace(tmp, path)
+
+
+def _epoch_ns(timestamp):
+    return int(datetime.fromisoformat(timestamp).timestamp() * 1e9)
+
+
+def export_otel(kind, target, meta):
+    """
+    Emits the analysis as OpenTelemetry spans: one parent span for the
+    analysis and one child per source with its counters as attributes.
+    Needs the optional 'opentelemetry-api' package and a configured SDK
+    (e.g. run under 'opentelemetry-instrument'); returns False without it.
+    """
+    try:
+        from opentelemetry import trace
+    except ImportError:
+        print(
+            f"{YELLOW}[WARN] opentelemetry-api is not installed; spans not exported.{RESET}"
+        )
+        return False
+
+    tracer = trace.get_tracer("infohunter")
+    end = _epoch_ns(meta["finished_at"])
+    parent = tracer.start_span(
+        f"analyze {kind}",
+        start_time=_epoch_ns(meta["started_at"]),
+        attributes={"infohunter.kind": kind, "infohunter.target": target},
+    )
+    context = trace.set_span_in_context(parent)
+    for source, m in meta["sources"].items():
+        span_end = _epoch_ns(m["finished_at"]) if m.get("finished_at") else end
+        attributes = {"infohunter.source": source, "infohunter.status": m.get("status")}
+        for counter in COUNTERS:
+            attributes[f"infohunter.{counter}"] = m.get(counter, 0)
+        span = tracer.start_span(
+            source,
+            context=context,
+            start_time=span_end - int(m.get("duration", 0) * 1e9),
+            attributes=attributes,
+        )
+        if m.get("status") != "ok":
+            span.set_status(trace.Status(trace.StatusCode.ERROR, m.get("status")))
+        span.end(end_time=span_end)
+    parent.end(end_time=end)
+    return True
@@ -0,0 +1,445 @@
+import json
+import multiprocessing
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+
+from osint import config
+
+# ANSI color codes for colored output
+RESET = "\033[0m"
+CYAN = "\033[36m"
+GREEN = "\033[32m"
+YELLOW = "\033[33m"
+RED = "\033[31m"
+MAGENTA = "\033[35m"
+BOLD = "\033[1m"
+
+KINDS = ("domain", "email", "username")
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+ERROR = "error"
+CANCELLED = "cancelled"
+ACTIVE = (QUEUED, RUNNING)
+
+# Veces que se reintenta un trabajo cuyo worker ha muerto antes de darlo por fallido
+MAX_ATTEMPTS = 3
+
+_local = threading.local()
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS jobs ("
+    " id TEXT PRIMARY KEY,"
+    " kind TEXT NOT NULL,"
+    " target TEXT NOT NULL,"
+    " status TEXT NOT NULL,"
+    " created REAL NOT NULL,"
+    " started REAL,"
+    " finished REAL,"
+    " heartbeat REAL,"
+    " worker TEXT,"
+    " attempts INTEGER NOT NULL DEFAULT 0,"
+    " results TEXT,"
+    " error TEXT)",
+    "CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created)",
+    "CREATE TABLE IF NOT EXISTS job_sources ("
+    " job_id TEXT NOT NULL,"
+    " source TEXT NOT NULL,"
+    " meta TEXT NOT NULL,"
+    " result TEXT NOT NULL,"
+    " PRIMARY KEY (job_id, source))",
+    "CREATE TABLE IF NOT EXISTS workers ("
+    " id TEXT PRIMARY KEY,"
+    " pid INTEGER NOT NULL,"
+    " started REAL NOT NULL,"
+    " heartbeat REAL NOT NULL,"
+    " job_id TEXT)",
+)
+
+
+def _connect():
+    """
+    Returns this thread's connection to the job database, creating it on first use.
+    """
+    path = config.jobs_path()
+    conn = getattr(_local, "conn", None)
+    if conn is not None and _local.key == (os.getpid(), path):
+        return conn
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    with conn:
+        for statement in SCHEMA:
+            conn.execute(statement)
+    _local.conn = conn
+    _local.key = (os.getpid(), path)
+    return conn
+
+
+def _iso(timestamp):
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+
+# ---------- Queue ----------
+def submit(kind, target, reuse=True):
+    """
+    Queues the analysis of one target and returns its job id.
+    With reuse, a job for the same target that is still queued or running
+    is returned instead of queueing a duplicate, so several users asking
+    for the same target share one analysis.
+    """
+    if kind not in KINDS:
+        raise ValueError(f"Unknown analysis type '{kind}'")
+    target = target.strip()
+    if not target:
+        raise ValueError("Empty target")
+    conn = _connect()
+    with conn:
+        if reuse:
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE kind = ? AND target = ? AND status IN (?, ?)"
+                " ORDER BY created DESC LIMIT 1",
+                (kind, target, *ACTIVE),
+            ).fetchone()
+            if row:
+                return row["id"]
+        job_id = uuid.uuid4().hex
+        conn.execute(
+            "INSERT INTO jobs (id, kind, target, status, created) VALUES (?, ?, ?, ?, ?)",
+            (job_id, kind, target, QUEUED, time.time()),
+        )
+    return job_id
+
+
+def get(job_id):
+    """
+    Returns a job as a dict, or None if it does not exist. While the job runs,
+    "results" holds the sources finished so far; "sources" always holds
+    their timing metadata (see osint.instrumentation).
+    """
+    conn = _connect()
+    row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    if row is None:
+        return None
+    sources = conn.execute(
+        "SELECT source, meta, result FROM job_sources WHERE job_id = ? ORDER BY rowid",
+        (job_id,),
+    ).fetchall()
+    job = _job_dict(row)
+    job["sources"] = {s["source"]: json.loads(s["meta"]) for s in sources}
+    if row["results"] is not None:
+        job["results"] = json.loads(row["results"])
+    else:
+        job["results"] = {s["source"]: json.loads(s["result"]) for s in sources}
+    return job
+
+
+def _job_dict(row):
+    return {
+        "id": row["id"],
+        "type": row["kind"],
+        "target": row["target"],
+        "status": row["status"],
+        "created_at": _iso(row["created"]),
+        "started_at": _iso(row["started"]),
+        "finished_at": _iso(row["finished"]),
+        "worker": row["worker"],
+        "attempts": row["attempts"],
+        "error": row["error"],
+    }
+
+
+def list_jobs(limit=50, status=None):
+    """
+    Returns the most recent jobs (without their results), newest first.
+    """
+    query = "SELECT * FROM jobs"
+    params = []
+    if status:
+        query += " WHERE status = ?"
+        params.append(status)
+    query += " ORDER BY created DESC LIMIT ?"
+    params.append(limit)
+    rows = _connect().execute(query, params).fetchall()
+    if not rows:
+        return []
+    counts = dict(
+        _connect()
+        .execute(
+            "SELECT job_id, COUNT(*) FROM job_sources WHERE job_id IN (%s)"
+            " GROUP BY job_id" % ",".join("?" * len(rows)),
+            [r["id"] for r in rows],
+        )
+        .fetchall()
+    )
+    jobs = []
+    for row in rows:
+        job = _job_dict(row)
+        job["finished_sources"] = counts.get(row["id"], 0)
+        jobs.append(job)
+    return jobs
+
+
+def cancel(job_id):
+    """
+    Cancels a job that has not started yet. Returns True if it was cancelled.
+    """
+    conn = _connect()
+    with conn:
+        cursor = conn.execute(
+            "UPDATE jobs SET status = ?, finished = ? WHERE id = ? AND status = ?",
+            (CANCELLED, time.time(), job_id, QUEUED),
+        )
+    return cursor.rowcount > 0
+
+
+def active_workers():
+    """
+    Returns how many workers have sent a heartbeat recently.
+    """
+    since = time.time() - config.job_stale_after()
+    row = (
+        _connect()
+        .execute("SELECT COUNT(*) FROM workers WHERE heartbeat > ?", (since,))
+        .fetchone()
+    )
+    return row[0]
+
+
+# ---------- Worker side ----------
+def claim(worker_id):
+    """
+    Atomically takes the oldest queued job for a worker and marks it running.
+    Returns the job row, or None if the queue is empty.
+    """
+    now = time.time()
+    conn = _connect()
+    with conn:
+        rows = conn.execute(
+            "UPDATE jobs SET status = ?, started = ?, heartbeat = ?, worker = ?,"
+            " attempts = attempts + 1"
+            " WHERE id = (SELECT id FROM jobs WHERE status = ? ORDER BY created LIMIT 1)"
+            " AND status = ? RETURNING *",
+            (RUNNING, now, now, worker_id, QUEUED, QUEUED),
+        ).fetchall()
+    return rows[0] if rows else None
+
+
+def requeue_stale():
+    """
+    Queues again the running jobs whose worker stopped sending heartbeats,
+    discarding their partial results. Jobs that already failed MAX_ATTEMPTS
+    times are marked as errors instead.
+    """
+    now = time.time()
+    since = now - config.job_stale_after()
+    conn = _connect()
+    with conn:
+        stale = conn.execute(
+            "SELECT id, attempts FROM jobs WHERE status = ? AND heartbeat < ?",
+            (RUNNING, since),
+        ).fetchall()
+        for row in stale:
+            conn.execute("DELETE FROM job_sources WHERE job_id = ?", (row["id"],))
+            if row["attempts"] >= MAX_ATTEMPTS:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, finished = ?, error = ? WHERE id = ?",
+                    (
+                        ERROR,
+                        now,
+                        f"Worker lost {row['attempts']} times, giving up",
+                        row["id"],
+                    ),
+                )
+            else:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, worker = NULL WHERE id = ?",
+                    (QUEUED, row["id"]),
+                )
+    return len(stale)
+
+
+def record_source(job_id, source, result, meta):
+    """
+    Stores one finished source of a running job (its partial result).
+    """
+    conn = _connect()
+    with conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO job_sources (job_id, source, meta, result)"
+            " VALUES (?, ?, ?, ?)",
+            (
+                job_id,
+                source,
+                json.dumps(meta, default=str),
+                json.dumps(result, default=str),
+            ),
+        )
+        conn.execute(
+            "UPDATE jobs SET heartbeat = ? WHERE id = ?", (time.time(), job_id)
+        )
+
+
+def _finish(job_id, status, results=None, error=None):
+    conn = _connect()
+    with conn:
+        conn.execute(
+            "UPDATE jobs SET status = ?, finished = ?, results = ?, error = ? WHERE id = ?",
+            (
+                status,
+                time.time(),
+                json.dumps(results, default=str) if results is not None else None,
+                error,
+                job_id,
+            ),
+        )
+
+
+def _requeue(job_id):
+    conn = _connect()
+    with conn:
+        conn.execute("DELETE FROM job_sources WHERE job_id = ?", (job_id,))
+        conn.execute(
+            "UPDATE jobs SET status = ?, worker = NULL, attempts = attempts - 1"
+            " WHERE id = ?",
+            (QUEUED, job_id),
+        )
+
+
+def run_job(job):
+    """
+    Runs one claimed job, storing every source as soon as it finishes and the
+    full results at the end. An interrupted job is put back in the queue.
+    """
+    from osint import batch
+
+    job_id = job["id"]
+    print(f"{CYAN}[JOB] {job_id} {job['kind']} {job['target']} started{RESET}")
+    try:
+        analyzer = batch.get_analyzer(job["kind"])
+        results = analyzer(
+            job["target"],
+            on_result=lambda source, result, meta: record_source(
+                job_id, source, result, meta
+            ),
+        )
+    except (KeyboardInterrupt, SystemExit):
+        _requeue(job_id)
+        raise
+    except Exception as e:
+        _finish(job_id, ERROR, error=str(e))
+        print(f"{RED}[JOB] {job_id} failed: {e}{RESET}")
+        return
+    _finish(job_id, DONE, results=results)
+    print(f"{GREEN}[JOB] {job_id} done{RESET}")
+
+
+def _heartbeat(worker_id, state, stop):
+    """
+    Keeps the worker (and its current job) marked alive until stop is set.
+    """
+    interval = max(1.0, config.job_stale_after() / 4)
+    while not stop.wait(interval):
+        now = time.time()
+        conn = _connect()
+        with conn:
+            conn.execute(
+                "UPDATE workers SET heartbeat = ?, job_id = ? WHERE id = ?",
+                (now, state.get("job_id"), worker_id),
+            )
+            if state.get("job_id"):
+                conn.execute(
+                    "UPDATE jobs SET heartbeat = ? WHERE id = ? AND status = ?",
+                    (now, state["job_id"], RUNNING),
+                )
+
+
+def work(stop=None, worker_id=None):
+    """
+    Worker loop: takes queued jobs one at a time and runs them until stop
+    (a threading.Event) is set. Several workers, in threads or processes,
+    can share the same queue.
+    """
+    stop = stop or threading.Event()
+    worker_id = worker_id or (
+        f"{socket.gethostname()}:{os.getpid()}:{threading.current_thread().name}"
+    )
+    conn = _connect()
+    now = time.time()
+    with conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO workers (id, pid, started, heartbeat)"
+            " VALUES (?, ?, ?, ?)",
+            (worker_id, os.getpid(), now, now),
+        )
+    state = {}
+    beat_stop = threading.Event()
+    threading.Thread(
+        target=_heartbeat,
+        args=(worker_id, state, beat_stop),
+        name=f"heartbeat-{worker_id}",
+        daemon=True,
+    ).start()
+    try:
+        while not stop.is_set():
+            requeue_stale()
+            job = claim(worker_id)
+            if job is None:
+                stop.wait(config.job_poll_interval())
+                continue
+            state["job_id"] = job["id"]
+            run_job(job)
+            state["job_id"] = None
+    finally:
+        beat_stop.set()
+        with conn:
+            conn.execute("DELETE FROM workers WHERE id = ?", (worker_id,))
+
+
+def _process_main():
+    try:
+        work()
+    except KeyboardInterrupt:
+        pass
+
+
+def run_workers(processes=None):
+    """
+    Starts a pool of worker processes and waits for them (Ctrl+C stops them;
+    the jobs they were running go back to the queue).
+    """
+    processes = processes or config.job_workers()
+    print(
+        f"{MAGENTA}{BOLD}=== {processes} InfoHunter workers on {config.jobs_path()} ==={RESET}"
+    )
+    context = multiprocessing.get_context("spawn")
+    pool = [
+        context.Process(target=_process_main, name=f"infohunter-worker-{i}")
+        for i in range(processes)
+    ]
+    for process in pool:
+        process.start()
+    try:
+        for process in pool:
+            process.join()
+    except KeyboardInterrupt:
+        # Los hijos reciben el mismo Ctrl+C y devuelven sus trabajos a la cola
+        print(f"{YELLOW}[WARN] Stopping workers (Ctrl+C again to kill them).{RESET}")
+        try:
+            for process in pool:
+                process.join()
+        except KeyboardInterrupt:
+            # Sus trabajos vuelven a la cola cuando caduque su heartbeat
+            for process in pool:
+                process.terminate()
@@ -0,0 +1,93 @@
+import json
+import time
+
+from osint.utils import utc_now
+
+FORMATS = ("jsonl", "json", "ndjson-stream")
+
+
+class ResultWriter:
+    """
+    Writes analysis results in a machine-readable format.
+
+    - jsonl: one record per source, written and flushed as soon as it finishes.
+    - ndjson-stream: the jsonl records plus "start" and "end" events, for
+      consumers that follow the stream live.
+    - json: a single document with every source, written at the end.
+
+    Every source record carries its timing metadata (started_at, finished_at,
+    duration and status) and instrumentation counters (requests, bytes,
+    http_status, retries, cache hits and misses).
+    """
+
+    def __init__(self, fmt, stream):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown output format '{fmt}'")
+        self.fmt = fmt
+        self.stream = stream
+        self.sources = {}
+        self.kind = None
+        self.target = None
+        self.started_at = None
+        self.start_time = None
+
+    def _write(self, record):
+        self.stream.write(json.dumps(record, default=str) + "\n")
+        self.stream.flush()
+
+    def start(self, kind, target):
+        """
+        Marks the beginning of the analysis of one target.
+        """
+        self.kind = kind
+        self.target = target
+        self.sources = {}
+        self.started_at = utc_now()
+        self.start_time = time.monotonic()
+        if self.fmt == "ndjson-stream":
+            self._write(
+                {
+                    "event": "start",
+                    "type": kind,
+                    "target": target,
+                    "started_at": self.started_at,
+                }
+            )
+
+    def on_result(self, source, result, meta):
+        """
+        Callback for the analyzers: records one finished source.
+        """
+        self.sources[source] = meta
+        if self.fmt == "json":
+            return
+        record = {"type": self.kind, "target": self.target, "source": source}
+        if self.fmt == "ndjson-stream":
+            record = {"event": "source", **record}
+        record.update(meta)
+        record["result"] = result
+        self._write(record)
+
+    def finish(self, results):
+        """
+        Marks the end of the analysis; writes the whole document in json format.
+        """
+        summary = {
+            "type": self.kind,
+            "target": self.target,
+            "started_at": self.started_at,
+            "finished_at": utc_now(),
+            "duration": round(time.monotonic() - self.start_time, 3),
+        }
+        if self.fmt == "json":
+            self.stream.write(
+                json.dumps(
+                    {**summary, "sources": self.sources, "results": results},
+                    default=str,
+                    indent=2,
+                )
+                + "\n"
+            )
+            self.stream.flush()
+        elif self.fmt == "ndjson-stream":
+            self._write({"event": "end", **summary, "sources": self.sources})
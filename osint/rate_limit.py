@@ -0,0 +1,114 @@
+import asyncio
+import email.utils
+import threading
+import time
+
+from osint import config
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket allowing 'rate' requests every 'per' seconds.
+    Callers reserve a token and receive how long they must wait before using
+    it, so waiting happens outside the lock (time.sleep or asyncio.sleep).
+    """
+
+    def __init__(self, rate, per):
+        self.capacity = max(1.0, rate)
+        self.fill_rate = rate / per
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        """
+        Takes one token and returns the seconds to wait before it can be used.
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated) * self.fill_rate
+            )
+            self.updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.fill_rate if self.tokens < 0 else 0.0
+            return max(wait, self.blocked_until - now)
+
+    def penalize(self, seconds):
+        """
+        Blocks the bucket for the given seconds (e.g. after a 429 Retry-After).
+        """
+        with self.lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+
+def get_bucket(provider):
+    """
+    Returns the shared bucket for a provider, or None if it has no limit.
+    """
+    with _buckets_lock:
+        if provider not in _buckets:
+            limit = config.rate_limit(provider)
+            _buckets[provider] = TokenBucket(*limit) if limit else None
+        return _buckets[provider]
+
+
+def acquire(provider):
+    """
+    Blocks the calling thread until the provider allows one more request.
+    """
+    bucket = get_bucket(provider) if provider else None
+    if bucket:
+        wait = bucket.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+
+async def acquire_async(provider):
+    """
+    Asynchronous version of acquire() for code running on the event loop.
+    """
+    bucket = get_bucket(provider) if provider else None
+    if bucket:
+        wait = bucket.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+def penalize(provider, seconds):
+    """
+    Makes every caller for the provider wait the given seconds.
+    """
+    bucket = get_bucket(provider) if provider else None
+    if bucket:
+        bucket.penalize(seconds)
+
+
+def parse_retry_after(value, default):
+    """
+    Parses a Retry-After header (seconds or HTTP date) into seconds to wait.
+    """
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+        return max(0.0, when.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return default
+
+
+def reset():
+    """
+    Forgets every bucket so limits are read again from the environment.
+    """
+    with _buckets_lock:
+        _buckets.clear()
@@ -1,14 +1,31 @@
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
-from reportlab.lib.units import inch
-from reportlab.lib.colors import HexColor
-from reportlab.platypus import Table, TableStyle
-from reportlab.lib import colors
+# reportlab se importa dentro de los generadores para no pagar su carga
+# en las ejecuciones que no generan ningún PDF
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
+import functools
+import io
+import json
+import multiprocessing
 import os
 
 col_widths = [90, 40, 40, 70, 70, 60, 100]
 
+LOGO_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "assets", "logo.png"
+)
+
+
+@functools.lru_cache(maxsize=1)
+def get_logo():
+    """
+    Returns the bundled report logo as an ImageReader.
+    It is read from disk once per process and shared by all PDF generators.
+    """
+    from reportlab.lib.utils import ImageReader
+
+    with open(LOGO_PATH, "rb") as f:
+        return ImageReader(io.BytesIO(f.read()))
+
 
 def generate_osint_pdf_username(
     username, sherlock_results, maigret_results, output_dir="reports"
@@ -16,17 +33,26 @@ def generate_osint_pdf_username(
     """
     Generate a colorful, structured PDF OSINT report for a given username.
     Includes Sherlock and Maigret results, executive summary, and analyst recommendations.
-    The PDF is saved as reports/<username>.pdf.
+    The PDF is saved as reports/<username>.pdf. A tool that failed is passed
+    as {"error": ...} and shown as such.
     """
+    from reportlab.lib.colors import HexColor
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.units import inch
+    from reportlab.pdfgen import canvas
+
     # Ensure the reports directory exists
-    if output_dir and not os.path.exists(output_dir):
-        os.makedirs(output_dir)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
     pdf_filename = os.path.join(output_dir, f"{username}.pdf")
     page_width, page_height = letter
     title = "OSINT Username Analysis Report"
     header_text = "InfoHunter"
     date_str = datetime.now().strftime("%Y-%m-%d %H:%M")
 
+    sherlock_results, sherlock_error = tool_profiles(sherlock_results)
+    maigret_results, maigret_error = tool_profiles(maigret_results)
+
     c = canvas.Canvas(pdf_filename, pagesize=letter)
     page_num = 1
 
@@ -41,6 +67,14 @@ def generate_osint_pdf_username(
         c.drawRightString(page_width - inch / 2, 0.5 * inch, f"Page {page_num}")
 
     def add_title():
+        c.drawImage(
+            get_logo(),
+            inch / 2,
+            page_height - inch - 10,
+            width=36,
+            height=36,
+            mask="auto",
+        )
         c.setFont("Helvetica-Bold", 26)
         c.setFillColor(HexColor("#0B3D91"))
         c.drawCentredString(page_width / 2, page_height - inch, title)
@@ -124,6 +158,9 @@ def generate_osint_pdf_username(
                 y = page_height - inch
             add_text(f"- {url}", y, color=HexColor("#0B5394"))
             y -= line_height
+    elif sherlock_error:
+        add_text(sherlock_error, y, color=HexColor("#FF0000"))
+        y -= line_height
     else:
         add_text("No profiles found.", y, color=HexColor("#FF0000"))
         y -= line_height
@@ -142,6 +179,9 @@ def generate_osint_pdf_username(
                 y = page_height - inch
             add_text(f"- {url}", y, color=HexColor("#2874A6"))
             y -= line_height
+    elif maigret_error:
+        add_text(maigret_error, y, color=HexColor("#FF0000"))
+        y -= line_height
     else:
         add_text("No profiles found.", y, color=HexColor("#FF0000"))
         y -= line_height
@@ -155,31 +195,52 @@ def generate_osint_pdf_username(
     return pdf_filename
 
 
-def show_results_username(results, username):
+def tool_profiles(result):
     """
-    Print results to console and generate a PDF report for the given username.
+    Splits a Sherlock or Maigret result into (profile URLs, error message).
+    The error is None unless the tool failed ({"error": ...}).
+    """
+    if isinstance(result, dict):
+        return [], result.get("error")
+    return [url for url in result or [] if str(url).startswith("http")], None
+
+
+def show_results_username(results, username, render_pdf=True):
+    """
+    Print results to console and, unless render_pdf is False, generate a PDF
+    report for the given username.
     """
     print(f"\n🔎 Results for '{username}':\n")
-    print("Sherlock found:")
-    if results.get("sherlock_profiles"):
-        for url in results["sherlock_profiles"]:
-            print("  -", url)
-    else:
-        print("  No profiles found.")
-    print("Maigret found:")
-    if results.get("maigret_profiles"):
-        for url in results["maigret_profiles"]:
-            print("  -", url)
-    else:
-        print("  No profiles found.")
+    for tool, key in (
+        ("Sherlock", "sherlock_profiles"),
+        ("Maigret", "maigret_profiles"),
+    ):
+        profiles, error = tool_profiles(results.get(key))
+        print(f"{tool} found:")
+        if error:
+            print(f"  {error}")
+        elif profiles:
+            for url in profiles:
+                print("  -", url)
+        else:
+            print("  No profiles found.")
 
     # Generate PDF report
-    pdf_file = generate_osint_pdf_username(
-        username,
-        results.get("sherlock_profiles", []),
-        results.get("maigret_profiles", []),
-    )
-    print(f"\n📄 PDF report generated: {pdf_file}")
+    if render_pdf:
+        pdf_file = render_report("username", username, results)
+        print(f"\n📄 PDF report generated: {pdf_file}")
+
+
+def holehe_services(holehe_results):
+    """
+    Returns the domains where Holehe found the email. Older results were a
+    plain list of domains taken from the CLI's CSV output.
+    """
+    if isinstance(holehe_results, dict):
+        return [s.get("domain") for s in holehe_results.get("used", [])]
+    if isinstance(holehe_results, list):
+        return holehe_results
+    return []
 
 
 def generate_osint_pdf_email(
@@ -194,8 +255,13 @@ def generate_osint_pdf_email(
     Generate a colorful, structured PDF OSINT report for a given email.
     Handles missing or faulty data gracefully.
     """
-    if output_dir and not os.path.exists(output_dir):
-        os.makedirs(output_dir)
+    from reportlab.lib.colors import HexColor
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.units import inch
+    from reportlab.pdfgen import canvas
+
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
     pdf_filename = os.path.join(output_dir, f"{email}.pdf")
     page_width, page_height = letter
     title = "OSINT Email Analysis Report"
@@ -214,6 +280,14 @@ def generate_osint_pdf_email(
         c.drawCentredString(page_width / 2, 0.5 * inch, f"Page {page_num_local}")
 
     def add_title():
+        c.drawImage(
+            get_logo(),
+            inch / 2,
+            page_height - inch - 10,
+            width=36,
+            height=36,
+            mask="auto",
+        )
         c.setFont("Helvetica-Bold", 26)
         c.setFillColor(HexColor("#0B3D91"))
         c.drawCentredString(page_width / 2, page_height - inch, title)
@@ -251,7 +325,7 @@ def generate_osint_pdf_email(
         except Exception:
             bd_count = 0
         try:
-            holehe_count = len(holehe_results) if holehe_results else 0
+            holehe_count = len(holehe_services(holehe_results))
         except Exception:
             holehe_count = 0
         try:
@@ -268,7 +342,7 @@ def generate_osint_pdf_email(
             f"- Email analyzed: {email}",
             f"- HIBP breaches found: {hibp_count}",
             f"- BreachDirectory leaks found: {bd_count}",
-            f"- Holehe services checked (output lines): {holehe_count}",
+            f"- Holehe services using this email: {holehe_count}",
             f"- Intelligence X records found: {intelx_count}",
             "- See recommendations at the end of the report.",
         ]
@@ -385,12 +459,16 @@ def generate_osint_pdf_email(
     add_section_title("Holehe Results:", y)
     y -= line_height
     try:
-        if holehe_results and isinstance(holehe_results, list):
-            if len(holehe_results) == 0:
+        services = holehe_services(holehe_results)
+        if isinstance(holehe_results, dict) and holehe_results.get("error"):
+            add_text(f"Error: {holehe_results['error']}", y, color=HexColor("#FF0000"))
+            y -= line_height
+        elif holehe_results:
+            if len(services) == 0:
                 add_text("No results found.", y, color=HexColor("#FF0000"))
                 y -= line_height
             else:
-                for domain in holehe_results:
+                for domain in services:
                     if y < inch:
                         c.showPage()
                         page_num += 1
@@ -425,6 +503,10 @@ def generate_osint_pdf_email(
                 type_ = rec.get("type", "")
                 media = rec.get("media", "")
                 preview = rec.get("preview", "No preview available")
+                # La previsualización tiene varias líneas; se muestra en una
+                preview = " | ".join(
+                    line.strip() for line in str(preview).splitlines() if line.strip()
+                )[:120]
                 add_text(f"- System ID: {systemid}, Type: {type_}, Media: {media}", y)
                 y -= line_height
                 add_text(f"  Preview: {preview}", y)
@@ -445,9 +527,10 @@ def generate_osint_pdf_email(
     return pdf_filename
 
 
-def show_results_email(results, email):
+def show_results_email(results, email, render_pdf=True):
     """
-    Print results to console and generate a PDF report for the given email.
+    Print results to console and, unless render_pdf is False, generate a PDF
+    report for the given email.
     """
     print(f"\n🔎 Results for email: '{email}':\n")
 
@@ -477,9 +560,10 @@ def show_results_email(results, email):
 
     # Holehe
     print("\nHolehe found:")
-    holehe = results.get("holehe", "")
-    if holehe:
-        print(holehe)
+    services = holehe_services(results.get("holehe"))
+    if services:
+        for domain in services:
+            print(f"  - {domain}")
     else:
         print("  No results found.")
 
@@ -497,14 +581,9 @@ def show_results_email(results, email):
         print("  No results found.")
 
     # Generate PDF report
-    pdf_file = generate_osint_pdf_email(
-        email,
-        results.get("hibp", {}),
-        results.get("breachdirectory", {}),
-        results.get("holehe", ""),
-        results.get("intelx", {}),
-    )
-    print(f"\n📄 PDF report generated: {pdf_file}")
+    if render_pdf:
+        pdf_file = render_report("email", email, results)
+        print(f"\n📄 PDF report generated: {pdf_file}")
 
 
 def format_whois_date(date):
@@ -520,6 +599,63 @@ def format_whois_date(date):
         return str(date)
 
 
+def wayback_summary(wayback_results):
+    """
+    Returns the Wayback aggregate dict. Results saved before the CDX client
+    was paginated are a list of raw CDX rows and are summarised here.
+    """
+    if not isinstance(wayback_results, list):
+        return wayback_results
+    summary = {"total": 0, "per_year": {}, "per_status": {}, "sample": []}
+    for row in wayback_results:
+        # urlkey, timestamp, original, mimetype, statuscode, digest, length
+        if not isinstance(row, list) or len(row) < 5:
+            continue
+        year, status = row[1][:4], row[4]
+        summary["total"] += 1
+        summary["per_year"][year] = summary["per_year"].get(year, 0) + 1
+        summary["per_status"][status] = summary["per_status"].get(status, 0) + 1
+        if len(summary["sample"]) < 5:
+            summary["sample"].append(
+                {"timestamp": row[1], "original": row[2], "statuscode": status}
+            )
+    summary["per_year"] = dict(sorted(summary["per_year"].items()))
+    return summary
+
+
+# Puertos cuya exposición a Internet suele ser un riesgo
+SENSITIVE_PORTS = {
+    21: "FTP",
+    23: "Telnet",
+    445: "SMB",
+    1433: "MSSQL",
+    3306: "MySQL",
+    3389: "RDP",
+    5432: "PostgreSQL",
+    5900: "VNC",
+    6379: "Redis",
+    9200: "Elasticsearch",
+    11211: "Memcached",
+    27017: "MongoDB",
+}
+
+
+def shodan_summary(shodan_results):
+    """
+    Returns the aggregated Shodan dict ({"ips": {...}, "ports", "vulns"}).
+    Results saved when only one host was scanned are wrapped here.
+    """
+    if not isinstance(shodan_results, dict) or "ips" in shodan_results:
+        return shodan_results
+    if "ip_str" not in shodan_results:
+        return shodan_results
+    return {
+        "ips": {shodan_results["ip_str"]: shodan_results},
+        "ports": sorted(shodan_results.get("ports", [])),
+        "vulns": sorted(shodan_results.get("vulns", [])),
+    }
+
+
 def generate_osint_pdf_domain(
     domain,
     whois_results,
@@ -532,10 +668,21 @@ def generate_osint_pdf_domain(
     shodan_results,
     virustotal_results,
     output_dir="reports",
+    hosts_results=None,
+    subdomain_index=None,
 ):
-    if output_dir and not os.path.exists(output_dir):
-        os.makedirs(output_dir)
+    from reportlab.lib import colors
+    from reportlab.lib.colors import HexColor
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.units import inch
+    from reportlab.pdfgen import canvas
+    from reportlab.platypus import Table, TableStyle
+
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
     pdf_filename = os.path.join(output_dir, f"{domain}.pdf")
+    wayback_results = wayback_summary(wayback_results)
+    shodan_results = shodan_summary(shodan_results)
     page_width, page_height = letter
     margin_top = inch
     margin_bottom = inch
@@ -546,7 +693,6 @@ def generate_osint_pdf_domain(
     header_text = "InfoHunter"
     date_str = datetime.now().strftime("%Y-%m-%d %H:%M")
     copyright_text = "© 2025 InfoHunter | OSINT Project"
-    logo_url = "https://img.icons8.com/ios-filled/100/1F4E79/hacker.png"
 
     c = canvas.Canvas(pdf_filename, pagesize=letter)
 
@@ -608,27 +754,15 @@ def generate_osint_pdf_domain(
     c.drawCentredString(page_width / 2, page_height - 3.3 * inch, f"Domain: {domain}")
     c.setFont("Helvetica-Oblique", 10)
     c.drawCentredString(page_width / 2, page_height - 3.7 * inch, f"Date: {date_str}")
-    # Logo (opcional, solo si tienes PIL y requests)
-    try:
-        import requests
-        from io import BytesIO
-        from PIL import Image
-
-        response = requests.get(logo_url)
-        img = Image.open(BytesIO(response.content))
-        img_path = os.path.join(output_dir, "_logo_temp.png")
-        img.save(img_path)
-        c.drawImage(
-            img_path,
-            page_width / 2 - 30,
-            page_height - 1.3 * inch,
-            width=60,
-            height=60,
-            mask="auto",
-        )
-        os.remove(img_path)
-    except Exception:
-        pass
+    # Logo
+    c.drawImage(
+        get_logo(),
+        page_width / 2 - 30,
+        page_height - 1.3 * inch,
+        width=60,
+        height=60,
+        mask="auto",
+    )
     c.setFillColor(colors.white)
     c.setFont("Helvetica", 12)
     c.drawCentredString(page_width / 2, inch, "© 2025 InfoHunter | OSINT Project")
@@ -646,8 +780,8 @@ def generate_osint_pdf_domain(
         "Executive Summary",
         "WHOIS",
         "DNS Records",
-        "Sublist3r Subdomains",
-        "crt.sh Subdomains",
+        "Subdomains",
+        "Resolved Hosts",
         "Hunter.io Emails",
         "theHarvester Results",
         "Wayback Machine Snapshots",
@@ -744,6 +878,7 @@ def generate_osint_pdf_domain(
             f"- Hunter.io emails found: {hunter_count}",
             f"- theHarvester subdomains found: {theharv_count}",
             f"- theHarvester IPs found: {theharvester_ips}",
+            f"- Unique subdomains (all sources): {len(subdomain_index or [])}",
             "- See recommendations at the end of the report.",
         ]
         c.setFont("Helvetica-Bold", 14)
@@ -808,13 +943,44 @@ def generate_osint_pdf_domain(
                     f"https://www.virustotal.com/gui/domain/{domain}",
                 ]
             )
-        # Shodan puertos abiertos
+        # Shodan puertos abiertos en todas las IPs
         ports = shodan_results.get("ports", [])
         if ports:
+            shown = ", ".join(str(p) for p in ports[:15])
+            if len(ports) > 15:
+                shown += f" (+{len(ports) - 15})"
             alerts.append(
                 [
                     "Puertos abiertos detectados (Shodan)",
-                    ", ".join(str(p) for p in ports),
+                    shown,
+                    f"https://www.shodan.io/search?query={domain}",
+                ]
+            )
+        # Servicios sensibles expuestos, por IP
+        for ip, host in (shodan_results.get("ips") or {}).items():
+            exposed = [
+                f"{SENSITIVE_PORTS[p]} ({p})"
+                for p in host.get("ports", [])
+                if p in SENSITIVE_PORTS
+            ]
+            if exposed:
+                alerts.append(
+                    [
+                        f"Servicios sensibles expuestos en {ip}",
+                        ", ".join(exposed),
+                        f"https://www.shodan.io/host/{ip}",
+                    ]
+                )
+        # Vulnerabilidades conocidas (CVE) según Shodan
+        vulns = shodan_results.get("vulns", [])
+        if vulns:
+            shown = ", ".join(vulns[:5])
+            if len(vulns) > 5:
+                shown += f" (+{len(vulns) - 5})"
+            alerts.append(
+                [
+                    "Vulnerabilidades conocidas (Shodan)",
+                    shown,
                     f"https://www.shodan.io/search?query={domain}",
                 ]
             )
@@ -900,9 +1066,9 @@ def generate_osint_pdf_domain(
         return buf
 
     # Insertar gráfico de subdominios por TLD (si hay subdominios)
-    if sublist3r_results and len(sublist3r_results) > 3:
+    if subdomain_index and len(subdomain_index) > 3:
         try:
-            buf = plot_subdomain_tld_chart(sublist3r_results)
+            buf = plot_subdomain_tld_chart(subdomain_index.names())
             if buf:
                 check_page_space(8, 60)
                 c.drawImage(buf, inch, y - 60, width=220, height=60)
@@ -913,28 +1079,14 @@ def generate_osint_pdf_domain(
             pass
 
     # --- Visualización simple: línea de tiempo de snapshots de Wayback ---
-    def plot_wayback_timeline(snapshots):
+    def plot_wayback_timeline(per_year):
         import matplotlib.pyplot as plt
         import io
-        from datetime import datetime
 
-        if not snapshots:
+        if not per_year:
             return None
-        # Extraer años de los snapshots
-        years = []
-        for snap in snapshots:
-            try:
-                if isinstance(snap, str) and len(snap) >= 4:
-                    year = int(snap[:4])
-                    years.append(year)
-            except Exception:
-                continue
-        if not years:
-            return None
-        from collections import Counter
-
-        counter = Counter(years)
-        labels, values = zip(*sorted(counter.items()))
+        labels = [int(year) for year in per_year]
+        values = list(per_year.values())
         fig, ax = plt.subplots(figsize=(4, 2))
         ax.plot(labels, values, marker="o", color="#D35400")
         ax.set_title("Snapshots Wayback por año")
@@ -947,9 +1099,12 @@ def generate_osint_pdf_domain(
         buf.seek(0)
         return buf
 
-    if wayback_results and len(wayback_results) > 3:
+    if (
+        isinstance(wayback_results, dict)
+        and len(wayback_results.get("per_year", {})) > 1
+    ):
         try:
-            buf = plot_wayback_timeline(wayback_results)
+            buf = plot_wayback_timeline(wayback_results["per_year"])
             if buf:
                 check_page_space(8, 60)
                 c.drawImage(buf, inch + 250, y - 60, width=220, height=60)
@@ -1006,58 +1161,100 @@ def generate_osint_pdf_domain(
             add_text(f"Error: {dns_results['error']}", color=HexColor("#FF0000"))
         else:
             dns_table = []
-            for rtype in ["A", "MX", "NS"]:
+            for rtype in ["A", "AAAA", "MX", "NS", "CNAME", "SOA", "CAA"]:
                 records = dns_results.get(rtype, [])
-                if records:
+                if records is None:
+                    dns_table.append([rtype, "Query failed"])
+                elif records:
                     for rec in records:
                         dns_table.append([rtype, rec])
-                else:
+                elif rtype in ("A", "MX", "NS"):
                     dns_table.append([rtype, "None"])
             add_table(dns_table, ["Type", "Value"], [60, 410])
     except Exception:
         add_text("Error retrieving DNS data.", color=HexColor("#FF0000"))
     y -= line_height * 2
 
-    # Sublist3r
-    add_section_title("Sublist3r Subdomains")
+    # Subdominios de todas las fuentes, fusionados y con su procedencia
+    add_section_title("Subdomains")
     try:
-        if isinstance(sublist3r_results, dict) and sublist3r_results.get("error"):
-            add_text(f"Error: {sublist3r_results['error']}", color=HexColor("#FF0000"))
-        elif sublist3r_results:
-            max_show = 20
-            subdomains = sublist3r_results[:max_show]
-            sub_table = [[s] for s in subdomains]
-            add_table(sub_table, ["Subdomain"], [470])
-            if len(sublist3r_results) > max_show:
+        errors = [
+            (name, result["error"])
+            for name, result in (
+                ("Sublist3r", sublist3r_results),
+                ("crt.sh", crtsh_results),
+                ("theHarvester", theharvester_results),
+            )
+            if isinstance(result, dict) and result.get("error")
+        ]
+        for name, error in errors:
+            add_text(f"{name} error: {error}", color=HexColor("#FF0000"))
+        if subdomain_index and len(subdomain_index) > 1:
+            counts = subdomain_index.source_counts()
+            add_text(
+                f"Unique names: {len(subdomain_index)} "
+                f"(wildcards: {len(subdomain_index.wildcards())})"
+            )
+            add_text(
+                "Found by: "
+                + ", ".join(
+                    f"{source} {found} ({only} only there)"
+                    for source, (found, only) in counts.items()
+                ),
+                color=HexColor("#555555"),
+            )
+            # Agrupados por zona; las tablas se parten para no salirse de la página
+            max_show = 500
+            chunk = 25
+            rows = [
+                [
+                    ("*." if row["wildcard"] else "") + row["name"],
+                    ", ".join(row["sources"]),
+                    ", ".join(row["ips"][:2])
+                    + (f" +{len(row['ips']) - 2}" if len(row["ips"]) > 2 else ""),
+                ]
+                for row in subdomain_index.rows()[:max_show]
+            ]
+            for i in range(0, len(rows), chunk):
+                add_table(
+                    rows[i : i + chunk],
+                    ["Subdomain", "Sources", "IP addresses"],
+                    [230, 120, 120],
+                )
+            if len(subdomain_index) > max_show:
                 add_text(
-                    f"...and {len(sublist3r_results)-max_show} more.",
+                    f"...and {len(subdomain_index)-max_show} more "
+                    "(see the JSON output for the full list).",
                     color=HexColor("#888888"),
                 )
         else:
             add_text("No subdomains found.", color=HexColor("#FF0000"))
     except Exception:
-        add_text("Error retrieving Sublist3r data.", color=HexColor("#FF0000"))
+        add_text("Error building the subdomain list.", color=HexColor("#FF0000"))
     y -= line_height * 2
 
-    # crt.sh
-    add_section_title("crt.sh Subdomains")
+    # Hosts resueltos a partir de los subdominios
+    add_section_title("Resolved Hosts")
     try:
-        if isinstance(crtsh_results, dict) and crtsh_results.get("error"):
-            add_text(f"Error: {crtsh_results['error']}", color=HexColor("#FF0000"))
-        elif crtsh_results:
+        if isinstance(hosts_results, dict) and hosts_results.get("error"):
+            add_text(f"Error: {hosts_results['error']}", color=HexColor("#FF0000"))
+        elif hosts_results:
             max_show = 20
-            crtsh = crtsh_results[:max_show]
-            crtsh_table = [[s] for s in crtsh]
-            add_table(crtsh_table, ["Subdomain"], [470])
-            if len(crtsh_results) > max_show:
+            add_text(f"Hostnames resolved: {len(hosts_results)}")
+            hosts_table = [
+                [host, ", ".join(ips)]
+                for host, ips in list(hosts_results.items())[:max_show]
+            ]
+            add_table(hosts_table, ["Host", "IP addresses"], [220, 250])
+            if len(hosts_results) > max_show:
                 add_text(
-                    f"...and {len(crtsh_results)-max_show} more.",
+                    f"...and {len(hosts_results)-max_show} more.",
                     color=HexColor("#888888"),
                 )
         else:
-            add_text("No subdomains found.", color=HexColor("#FF0000"))
+            add_text("No hostnames resolved.", color=HexColor("#FF0000"))
     except Exception:
-        add_text("Error retrieving crt.sh data.", color=HexColor("#FF0000"))
+        add_text("Error retrieving resolved hosts.", color=HexColor("#FF0000"))
     y -= line_height * 2
 
     # Hunter.io (tabulado y sin solapamiento)
@@ -1121,24 +1318,13 @@ def generate_osint_pdf_domain(
                 add_text("  None")
             y -= 2
 
-            # Hosts
-            hosts = theharvester_results.get("hosts", [])
-            add_text("Hosts:", color=HexColor("#2874A6"))
-            if hosts:
-                for host in hosts:
-                    add_text(f"  {host}", color=HexColor("#2980B9"))
-            else:
-                add_text("  None")
-            y -= 2
-
-            # Subdomains
-            subdomains = theharvester_results.get("subdomains", [])
-            add_text("Subdomains:", color=HexColor("#2874A6"))
-            if subdomains:
-                for sub in subdomains:
-                    add_text(f"  {sub}", color=HexColor("#2980B9"))
-            else:
-                add_text("  None")
+            # Hosts y subdominios aparecen en la tabla de subdominios
+            add_text(
+                f"Hosts: {len(theharvester_results.get('hosts') or [])}, "
+                f"subdomains: {len(theharvester_results.get('subdomains') or [])} "
+                "(listed under Subdomains)",
+                color=HexColor("#2874A6"),
+            )
             y -= 2
 
             # IPs
@@ -1171,12 +1357,29 @@ def generate_osint_pdf_domain(
     try:
         if isinstance(wayback_results, dict) and wayback_results.get("error"):
             add_text(f"Error: {wayback_results['error']}", color=HexColor("#FF0000"))
-        elif wayback_results:
-            add_text(f"Snapshots found: {len(wayback_results)}")
-            for snap in wayback_results[:5]:
-                add_text(f"- {snap}")
-            if len(wayback_results) > 5:
-                add_text(f"...and {len(wayback_results)-5} more.")
+        elif wayback_results and wayback_results.get("total"):
+            total = wayback_results["total"]
+            add_text(
+                f"Snapshots found: {total}"
+                + (" (truncated)" if wayback_results.get("truncated") else "")
+            )
+            per_year = wayback_results.get("per_year", {})
+            if per_year:
+                add_text(f"Years: {min(per_year)} - {max(per_year)}")
+            per_status = wayback_results.get("per_status", {})
+            if per_status:
+                add_text(
+                    "Status codes: "
+                    + ", ".join(f"{k}: {v}" for k, v in sorted(per_status.items()))
+                )
+            sample = wayback_results.get("sample", [])
+            for snap in sample[:5]:
+                add_text(
+                    f"- {snap.get('timestamp', '')} {snap.get('original', '')} "
+                    f"({snap.get('statuscode', '-')})"
+                )
+            if total > 5:
+                add_text(f"...and {total - min(len(sample), 5)} more.")
         else:
             add_text("No snapshots found.", color=HexColor("#FF0000"))
     except Exception:
@@ -1188,31 +1391,51 @@ def generate_osint_pdf_domain(
     try:
         if shodan_results.get("error"):
             add_text(f"Error: {shodan_results['error']}", color=HexColor("#FF0000"))
-        elif shodan_results:
+        elif shodan_results.get("ips"):
 
             def field(label, value, color=HexColor("#2874A6")):
                 add_text(f"{label}: ", color=color)
                 add_text(f"  {value}")
 
-            field("IP", shodan_results.get("ip_str", "N/A"))
-            field("Organization", shodan_results.get("org", "N/A"))
-            field("Country", shodan_results.get("country_name", "N/A"))
-            ports = ", ".join(str(p) for p in shodan_results.get("ports", []))
-            field("Ports", ports if ports else "None")
-            hostnames = ", ".join(shodan_results.get("hostnames", []))
-            if hostnames:
-                field("Hostnames", hostnames)
-            data = shodan_results.get("data", [])
-            if data:
-                add_text("Open Services:", color=HexColor("#2874A6"))
-                for entry in data:
-                    port = entry.get("port", "")
-                    banner = (
-                        entry.get("http", {}).get("title") or entry.get("data", "")[:60]
-                    )
-                    add_text(f"  Port {port}: {banner}")
-            else:
-                add_text("Open Services: None")
+            ips = shodan_results["ips"]
+            max_ips = 20
+            add_text(f"IPs scanned: {len(ips)}")
+            if shodan_results.get("skipped"):
+                add_text(
+                    f"{shodan_results['skipped']} more IPs were not looked up.",
+                    color=HexColor("#888888"),
+                )
+            for ip, host in list(ips.items())[:max_ips]:
+                check_page_space(4)
+                field("IP", host.get("ip_str", ip))
+                field("Organization", host.get("org") or "N/A")
+                field("Country", host.get("country_name") or "N/A")
+                ports = ", ".join(str(p) for p in host.get("ports", []))
+                field("Ports", ports if ports else "None")
+                hostnames = ", ".join(
+                    host.get("resolved_from") or host.get("hostnames", [])
+                )
+                if hostnames:
+                    field("Hostnames", hostnames)
+                data = host.get("data", [])
+                if data:
+                    add_text("Open Services:", color=HexColor("#2874A6"))
+                    for entry in data[:10]:
+                        port = entry.get("port", "")
+                        banner = (entry.get("http") or {}).get("title") or (
+                            entry.get("data") or ""
+                        )[:60]
+                        add_text(f"  Port {port}: {banner}")
+                    if len(data) > 10:
+                        add_text(f"  ...and {len(data) - 10} more.")
+                else:
+                    add_text("Open Services: None")
+                y -= 4
+            if len(ips) > max_ips:
+                add_text(
+                    f"...and {len(ips) - max_ips} more IPs.",
+                    color=HexColor("#888888"),
+                )
         else:
             add_text("No Shodan data.", color=HexColor("#FF0000"))
     except Exception as e:
@@ -1293,23 +1516,119 @@ def generate_osint_pdf_domain(
     return pdf_filename
 
 
-def show_results_domain(results, domain):
+def show_results_domain(results, domain, render_pdf=True):
     """
-    Print results to console and generate a PDF report for the given domain.
+    Print results to console and, unless render_pdf is False, generate a PDF
+    report for the given domain.
     """
     print(f"\n🔎 Results for domain: '{domain}':\n")
     # ... (puedes mostrar por consola como en ejemplos previos) ...
     # Generate PDF report
-    pdf_file = generate_osint_pdf_domain(
-        domain,
-        results.get("whois", {}),
-        results.get("dns", {}),
-        results.get("subdomains_sublist3r", []),
-        results.get("subdomains_crtsh", []),
-        results.get("hunter", {}),
-        results.get("theharvester", {}),
-        results.get("wayback", []),
-        results.get("shodan", {}),
-        results.get("virustotal", {}),
-    )
-    print(f"\n📄 PDF report generated: {pdf_file}")
+    if render_pdf:
+        pdf_file = render_report("domain", domain, results)
+        print(f"\n📄 PDF report generated: {pdf_file}")
+
+
+# ---------- Render stage (independiente del análisis) ----------
+def render_report(kind, target, results, output_dir="reports"):
+    """
+    Renders the PDF report for a stored analysis result and returns its path.
+    kind is "username", "email" or "domain"; results is the dict returned by
+    the matching analyzer (or loaded back from its JSON output).
+    """
+    if kind == "username":
+        return generate_osint_pdf_username(
+            target,
+            results.get("sherlock_profiles", []),
+            results.get("maigret_profiles", []),
+            output_dir=output_dir,
+        )
+    if kind == "email":
+        return generate_osint_pdf_email(
+            target,
+            results.get("hibp", {}),
+            results.get("breachdirectory", {}),
+            results.get("holehe", {}),
+            results.get("intelx", {}),
+            output_dir=output_dir,
+        )
+    if kind == "domain":
+        from osint.subdomains import SubdomainIndex
+
+        return generate_osint_pdf_domain(
+            target,
+            results.get("whois", {}),
+            results.get("dns", {}),
+            results.get("subdomains_sublist3r", []),
+            results.get("subdomains_crtsh", []),
+            results.get("hunter", {}),
+            results.get("theharvester", {}),
+            results.get("wayback", []),
+            results.get("shodan", {}),
+            results.get("virustotal", {}),
+            output_dir=output_dir,
+            hosts_results=results.get("hosts", {}),
+            subdomain_index=SubdomainIndex.from_results(target, results),
+        )
+    raise ValueError(f"Unknown analysis type '{kind}'")
+
+
+def load_results(path):
+    """
+    Loads stored analysis results from a JSON document (--format json), a batch
+    JSONL file, or per-source JSONL records (--format jsonl/ndjson-stream).
+    Returns a list of (kind, target, results) tuples.
+    """
+    with open(path, encoding="utf-8") as f:
+        content = f.read()
+    try:
+        records = [json.loads(content)]
+    except json.JSONDecodeError:
+        records = [json.loads(line) for line in content.splitlines() if line.strip()]
+
+    items = {}
+    for record in records:
+        kind, target = record.get("type"), record.get("target")
+        if not kind or not target:
+            continue
+        if isinstance(record.get("results"), dict):
+            items[(kind, target)] = dict(record["results"])
+        elif "source" in record and "result" in record:
+            items.setdefault((kind, target), {})[record["source"]] = record["result"]
+    return [(kind, target, results) for (kind, target), results in items.items()]
+
+
+# Los procesos de render se crean con spawn: el proceso principal tiene hilos
+# (bucle asyncio, colectores) y hacer fork con hilos vivos no es seguro
+_spawn = multiprocessing.get_context("spawn")
+
+
+def render_reports(items, output_dir="reports", workers=None):
+    """
+    Renders several stored results. A single report is rendered inline; more
+    than one are rendered in parallel in a process pool.
+    Returns a list of (target, pdf_path or None, error or None).
+    """
+    rendered = []
+    if len(items) <= 1:
+        for kind, target, results in items:
+            try:
+                rendered.append(
+                    (target, render_report(kind, target, results, output_dir), None)
+                )
+            except Exception as e:
+                rendered.append((target, None, str(e)))
+        return rendered
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=_spawn) as pool:
+        futures = {
+            pool.submit(render_report, kind, target, results, output_dir): target
+            for kind, target, results in items
+        }
+        for future in as_completed(futures):
+            target = futures[future]
+            try:
+                rendered.append((target, future.result(), None))
+            except Exception as e:
+                rendered.append((target, None, str(e)))
+    return rendered
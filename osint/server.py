@@ -0,0 +1,212 @@
+import hmac
+import json
+import threading
+import time
+
+from flask import Flask, Response, jsonify, request, stream_with_context
+
+from osint import config, jobs
+
+# ANSI color codes for colored output
+RESET = "\033[0m"
+CYAN = "\033[36m"
+YELLOW = "\033[33m"
+MAGENTA = "\033[35m"
+BOLD = "\033[1m"
+
+# Cada cuánto (segundos) el stream SSE mira si el trabajo ha avanzado
+EVENTS_POLL_INTERVAL = 0.5
+# Comentario periódico para que proxies y clientes no cierren el stream
+EVENTS_KEEPALIVE = 15
+
+
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def _job_links(job_id):
+    return {"self": f"/jobs/{job_id}", "events": f"/jobs/{job_id}/events"}
+
+
+def job_events(job_id):
+    """
+    Yields the server-sent events of a job: "status" when it changes,
+    "source" for every finished source with its result, and "end" with the
+    final status once the job is no longer queued or running.
+    """
+    sent = set()
+    status = None
+    last_event = time.monotonic()
+    while True:
+        job = jobs.get(job_id)
+        if job is None:
+            yield _sse("error", {"id": job_id, "error": "Job not found"})
+            return
+        if job["status"] != status:
+            status = job["status"]
+            yield _sse("status", {"id": job_id, "status": status})
+            last_event = time.monotonic()
+        for source, meta in job["sources"].items():
+            if source not in sent:
+                sent.add(source)
+                yield _sse(
+                    "source",
+                    {"source": source, **meta, "result": job["results"].get(source)},
+                )
+                last_event = time.monotonic()
+        if status not in jobs.ACTIVE:
+            yield _sse(
+                "end",
+                {
+                    "id": job_id,
+                    "status": status,
+                    "error": job["error"],
+                    "finished_at": job["finished_at"],
+                },
+            )
+            return
+        if time.monotonic() - last_event > EVENTS_KEEPALIVE:
+            yield ": keep-alive\n\n"
+            last_event = time.monotonic()
+        time.sleep(EVENTS_POLL_INTERVAL)
+
+
+def create_app():
+    """
+    Builds the Flask application exposing the analyses as asynchronous jobs:
+
+    - POST /analyze/<domain|email|username>  {"target": ...} -> 202 + job id
+    - GET /jobs, GET /jobs/<id> (partial per-source results while running)
+    - GET /jobs/<id>/events  server-sent events as each source finishes
+    - DELETE /jobs/<id>  cancels a job that has not started
+    - GET /health
+    """
+    app = Flask("infohunter")
+
+    @app.before_request
+    def check_token():
+        token = config.api_token()
+        if not token or request.path == "/health":
+            return None
+        given = request.headers.get("Authorization", "").removeprefix("Bearer ")
+        if not hmac.compare_digest(given.encode(), token.encode()):
+            return jsonify({"error": "Invalid or missing API token"}), 401
+        return None
+
+    @app.post("/analyze/<kind>")
+    def analyze(kind):
+        body = request.get_json(silent=True) or {}
+        target = body.get("target") or request.args.get("target") or ""
+        try:
+            job_id = jobs.submit(kind, target)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        job = jobs.get(job_id)
+        return (
+            jsonify(
+                {
+                    "id": job_id,
+                    "type": kind,
+                    "target": job["target"],
+                    "status": job["status"],
+                    "links": _job_links(job_id),
+                }
+            ),
+            202,
+            {"Location": f"/jobs/{job_id}"},
+        )
+
+    @app.get("/jobs")
+    def list_jobs():
+        limit = request.args.get("limit", 50, type=int)
+        return jsonify(
+            {"jobs": jobs.list_jobs(limit=limit, status=request.args.get("status"))}
+        )
+
+    @app.get("/jobs/<job_id>")
+    def get_job(job_id):
+        job = jobs.get(job_id)
+        if job is None:
+            return jsonify({"error": "Job not found"}), 404
+        return jsonify({**job, "links": _job_links(job_id)})
+
+    @app.delete("/jobs/<job_id>")
+    def cancel_job(job_id):
+        if jobs.get(job_id) is None:
+            return jsonify({"error": "Job not found"}), 404
+        if not jobs.cancel(job_id):
+            return jsonify({"error": "Only queued jobs can be cancelled"}), 409
+        return jsonify({"id": job_id, "status": jobs.CANCELLED})
+
+    @app.get("/jobs/<job_id>/events")
+    def events(job_id):
+        return Response(
+            stream_with_context(job_events(job_id)),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    @app.get("/health")
+    def health():
+        return jsonify({"status": "ok", "workers": jobs.active_workers()})
+
+    return app
+
+
+def start_workers(count, stop):
+    """
+    Starts count worker threads in this process. They share its pooled HTTP
+    client, event loop and cache connections across every job they run.
+    """
+    threads = []
+    for i in range(count):
+        thread = threading.Thread(
+            target=jobs.work,
+            args=(stop,),
+            name=f"api-worker-{i}",
+            daemon=True,
+        )
+        thread.start()
+        threads.append(thread)
+    return threads
+
+
+def serve(host="127.0.0.1", port=8000, workers=None):
+    """
+    Runs the API with in-process worker threads (workers=0 leaves the jobs to
+    separate 'main.py worker' processes) until interrupted. Requests are
+    served by waitress; without it, Flask's development server is used with
+    a warning.
+    """
+    workers = config.job_workers() if workers is None else workers
+    stop = threading.Event()
+    start_workers(workers, stop)
+    print(
+        f"{MAGENTA}{BOLD}=== InfoHunter API on http://{host}:{port} "
+        f"({workers} worker threads) ==={RESET}"
+    )
+    if not config.api_token():
+        print(
+            f"{CYAN}[INFO] INFOHUNTER_API_TOKEN is not set: no authentication.{RESET}"
+        )
+    app = create_app()
+    try:
+        try:
+            import waitress
+        except ImportError:
+            print(
+                f"{YELLOW}[WARN] waitress is not installed: using Flask's "
+                f"development server, which is not meant for production "
+                f"(pip install waitress).{RESET}"
+            )
+            app.run(host=host, port=port, threaded=True)
+        else:
+            waitress.serve(
+                app,
+                host=host,
+                port=port,
+                threads=config.api_threads(),
+                ident="InfoHunter",
+            )
+    finally:
+        stop.set()
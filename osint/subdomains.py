@@ -0,0 +1,212 @@
+from sortedcontainers import SortedDict, SortedList
+
+# Fuentes de enumeración en el orden en que se fusionan
+SOURCES = ("sublist3r", "crtsh", "theharvester")
+
+
+def normalize(name):
+    """
+    Normalizes a hostname as reported by an enumeration source. Returns
+    (fqdn, wildcard) with the name lower-cased, without trailing dots nor a
+    leading '*.' (wildcard is True if it had one), or None if it is not a
+    valid hostname.
+    """
+    if not isinstance(name, str):
+        return None
+    name = name.strip().lower().rstrip(".")
+    wildcard = False
+    while name.startswith("*."):
+        name = name[2:]
+        wildcard = True
+    if not name or any(c in name for c in " /:@*\t") or ".." in name:
+        return None
+    return name, wildcard
+
+
+def reverse_key(name):
+    """
+    Returns the index key of a normalized name: its labels in reverse order
+    ('www.example.com' -> 'com.example.www.'), so a zone and everything under
+    it are contiguous in sorted order.
+    """
+    return ".".join(reversed(name.split("."))) + "."
+
+
+class SubdomainIndex:
+    """
+    Merged view of the subdomains of one domain reported by every
+    enumeration source. Each name is kept once, normalized, with the sources
+    that found it, whether it was seen as a wildcard and its known IPs.
+    Names outside the domain are discarded (counted in out_of_scope).
+
+    Names are added to a plain dict; the sorted indexes used by the queries
+    are built once, on the first query after a change.
+    """
+
+    def __init__(self, domain):
+        self.domain = normalize(domain)[0]
+        self.out_of_scope = 0
+        self._entries = {}
+        self._by_zone = None
+        self._by_name = None
+        self._suffix = "." + self.domain
+
+    def add(self, name, source, ips=()):
+        """
+        Records that source found name. Returns the normalized name, or None
+        if it was invalid or outside the domain.
+        """
+        normalized = normalize(name)
+        if normalized is None:
+            return None
+        name, wildcard = normalized
+        if name != self.domain and not name.endswith(self._suffix):
+            self.out_of_scope += 1
+            return None
+        entry = self._entries.get(name)
+        if entry is None:
+            entry = self._entries[name] = {
+                "sources": set(),
+                "wildcard": False,
+                "ips": set(),
+            }
+            self._by_zone = self._by_name = None
+        if source:
+            entry["sources"].add(source)
+        entry["wildcard"] = entry["wildcard"] or wildcard
+        entry["ips"].update(ips)
+        return name
+
+    def update(self, source, names):
+        """
+        Adds every name of a source's list.
+        """
+        for name in names or ():
+            self.add(name, source)
+
+    def add_ips(self, name, ips):
+        """
+        Attaches resolved IPs to a name already in the index.
+        """
+        normalized = normalize(name)
+        if normalized and normalized[0] in self._entries:
+            self._entries[normalized[0]]["ips"].update(ips)
+
+    @classmethod
+    def from_results(cls, domain, results):
+        """
+        Builds the index from a domain analysis result in one pass over the
+        Sublist3r and crt.sh lists, theHarvester's subdomains and 'host:ip'
+        hosts, and the resolved hosts. The domain itself is always included.
+        """
+        index = cls(domain)
+        index.add(domain, None)
+        for key, source in (
+            ("subdomains_sublist3r", "sublist3r"),
+            ("subdomains_crtsh", "crtsh"),
+        ):
+            if isinstance(results.get(key), list):
+                index.update(source, results[key])
+        theharvester = results.get("theharvester")
+        if isinstance(theharvester, dict) and "error" not in theharvester:
+            index.update("theharvester", theharvester.get("subdomains"))
+            for host in theharvester.get("hosts") or []:
+                if isinstance(host, str):
+                    name, _, ip = host.partition(":")
+                    index.add(name, "theharvester", [ip] if ip else ())
+        hosts = results.get("hosts")
+        if isinstance(hosts, dict) and "error" not in hosts:
+            for name, ips in hosts.items():
+                index.add_ips(name, ips)
+        return index
+
+    def _indexes(self):
+        if self._by_zone is None:
+            self._by_zone = SortedDict(
+                (reverse_key(name), name) for name in self._entries
+            )
+            self._by_name = SortedList(self._entries)
+        return self._by_zone, self._by_name
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, name):
+        normalized = normalize(name)
+        return normalized is not None and normalized[0] in self._entries
+
+    def __iter__(self):
+        return iter(self.names())
+
+    def get(self, name):
+        """
+        Returns {name, sources, wildcard, ips} for a name, or None.
+        """
+        normalized = normalize(name)
+        if normalized is None or normalized[0] not in self._entries:
+            return None
+        return self._row(normalized[0])
+
+    def _row(self, name):
+        entry = self._entries[name]
+        return {
+            "name": name,
+            "sources": sorted(entry["sources"]),
+            "wildcard": entry["wildcard"],
+            "ips": sorted(entry["ips"]),
+        }
+
+    def names(self):
+        """
+        Returns every name, grouped by zone (reverse-label order).
+        """
+        return list(self._indexes()[0].values())
+
+    def under(self, zone):
+        """
+        Suffix query: returns the names equal to or below zone
+        (e.g. 'dev.example.com' -> 'dev.example.com', 'api.dev.example.com').
+        """
+        normalized = normalize(zone)
+        if normalized is None:
+            return []
+        by_zone = self._indexes()[0]
+        prefix = reverse_key(normalized[0])
+        return [
+            by_zone[key]
+            for key in by_zone.irange(minimum=prefix, maximum=prefix + "\uffff")
+        ]
+
+    def startswith(self, prefix):
+        """
+        Prefix query: returns the names whose leftmost labels start with
+        prefix (e.g. 'api' -> 'api.example.com', 'api-v2.example.com').
+        """
+        prefix = prefix.strip().lower()
+        by_name = self._indexes()[1]
+        return list(by_name.irange(minimum=prefix, maximum=prefix + "\uffff"))
+
+    def rows(self):
+        """
+        Returns one {name, sources, wildcard, ips} dict per name, grouped by
+        zone.
+        """
+        return [self._row(name) for name in self.names()]
+
+    def source_counts(self):
+        """
+        Returns {source: (names found, names found only by that source)}.
+        """
+        counts = {source: [0, 0] for source in SOURCES}
+        for entry in self._entries.values():
+            for source in entry["sources"]:
+                counts.setdefault(source, [0, 0])[0] += 1
+                if len(entry["sources"]) == 1:
+                    counts[source][1] += 1
+        return {source: tuple(count) for source, count in counts.items()}
+
+    def wildcards(self):
+        """
+        Returns the names seen as wildcards ('*.name') by some source.
+        """
+        return [name for name in self.names() if self._entries[name]["wildcard"]]
@@ -1,72 +1,159 @@
 import subprocess
 import sys
 import os
+import threading
+from osint import config, instrumentation
+from osint.utils import kill_process_tree, run_collectors
 
 
-def analyze_with_sherlock(username):
+def _parse_hit(line):
     """
-    Run Sherlock (installed via pip) to search for username profiles.
-    Returns a list of found URLs.
+    Extracts the profile URL from a '[+] Site: URL' line, or None for other lines.
+    """
+    if not line.startswith("[+]"):
+        return None
+    url = line.split(":", 1)[-1].strip()
+    return url or None
+
+
+def _stream_profiles(tool, cmd, timeout):
+    """
+    Runs a username search CLI and parses '[+]' hits from stdout as they arrive.
+    Returns the list of profile URLs, or {"error": message} if the tool could
+    not run or exited with an error without finding anything. The process is killed when the timeout expires; profiles already
+    parsed are kept, so a timeout yields partial results instead of none.
     """
-    print(f"🔎 [Sherlock] Starting search for '{username}'...")
     found_urls = []
+    # Sin buffer para que las líneas lleguen en cuanto la herramienta las imprime
+    env = dict(os.environ, PYTHONUNBUFFERED="1")
     try:
-        process = subprocess.run(
-            [sys.executable, "-m", "sherlock_project", username, "--print-found"],
-            capture_output=True,
+        process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
             text=True,
-            timeout=120,
+            bufsize=1,
+            env=env,
+            # Grupo de procesos propio para poder matar también a sus hijos
+            start_new_session=os.name == "posix",
         )
-        output = process.stdout
-        for line in output.splitlines():
-            if line.startswith("[+]"):
-                url = line.split(":", 1)[-1].strip()
+    except Exception as e:
+        error_msg = f"Error running {tool}: {e}"
+        print(f"❌ [{tool}] {error_msg}")
+        return {"error": error_msg}
+
+    timed_out = threading.Event()
+
+    def stop():
+        timed_out.set()
+        kill_process_tree(process)
+
+    timer = threading.Timer(timeout, stop)
+    timer.start()
+    try:
+        for line in process.stdout:
+            url = _parse_hit(line)
+            if url:
                 found_urls.append(url)
-        print(f"✅ [Sherlock] Search completed. {len(found_urls)} profiles found.")
+        process.wait()
     except Exception as e:
-        error_msg = f"Error running Sherlock: {e}"
-        print(f"❌ [Sherlock] {error_msg}")
-        found_urls.append(error_msg)
+        kill_process_tree(process)
+        error_msg = f"Error running {tool}: {e}"
+        print(f"❌ [{tool}] {error_msg}")
+        return {"error": error_msg}
+    finally:
+        timer.cancel()
+
+    if timed_out.is_set():
+        print(
+            f"⚠️  [{tool}] Timed out after {timeout}s. "
+            f"{len(found_urls)} profiles found before it was stopped."
+        )
+    elif process.returncode and not found_urls:
+        # La herramienta terminó con error sin encontrar nada: no es un "0 perfiles"
+        error_msg = f"Error running {tool}: exit code {process.returncode}"
+        print(f"❌ [{tool}] {error_msg}")
+        return {"error": error_msg}
+    else:
+        print(f"✅ [{tool}] Search completed. {len(found_urls)} profiles found.")
     return found_urls
 
 
+def analyze_with_sherlock(username):
+    """
+    Run Sherlock (installed via pip) to search for username profiles.
+    Returns a list of found URLs, or {"error": message}.
+    """
+    print(f"🔎 [Sherlock] Starting search for '{username}'...")
+    return _stream_profiles(
+        "Sherlock",
+        [sys.executable, "-m", "sherlock_project", username, "--print-found"],
+        timeout=config.source_timeout("sherlock"),
+    )
+
+
 def analyze_with_maigret(username):
     """
     Run Maigret (installed via pip) to search for username profiles.
-    Returns a list of found URLs.
+    Returns a list of found URLs, or {"error": message}.
     """
     print(f"🔎 [Maigret] Starting search for '{username}'...")
-    found_urls = []
-    try:
-        cmd = ["maigret", "-a", username]
-        process = subprocess.run(cmd, capture_output=True, text=True, timeout=600)
-        output = process.stdout
-        print("[DEBUG] Maigret raw output:\n", output)  # Para depuración
-        for line in output.splitlines():
-            if line.startswith("[+]"):
-                url = line.split(":", 1)[-1].strip()
-                found_urls.append(url)
-        print(f"✅ [Maigret] Search completed. {len(found_urls)} profiles found.")
-    except Exception as e:
-        error_msg = f"Error running Maigret: {e}"
-        print(f"❌ [Maigret] {error_msg}")
-        found_urls.append(error_msg)
-    return found_urls
+    return _stream_profiles(
+        "Maigret",
+        ["maigret", "-a", username],
+        timeout=config.source_timeout("maigret"),
+    )
+
+
+def merge_profiles(*profile_lists):
+    """
+    Merges several lists of profile URLs, skipping failed tools ({"error": ...}),
+    non-URL entries and duplicates (case and trailing slash insensitive) while
+    keeping the first-seen order.
+    """
+    seen = set()
+    merged = []
+    for profiles in profile_lists:
+        if not isinstance(profiles, list):
+            continue
+        for url in profiles:
+            if not url.startswith("http"):
+                continue
+            key = url.rstrip("/").lower()
+            if key not in seen:
+                seen.add(key)
+                merged.append(url)
+    return merged
 
 
-def analyze(username):
+def analyze(username, on_result=None):
     """
-    Combines Sherlock and Maigret results for the given username.
-    Returns a dictionary with all found URLs.
+    Runs Sherlock and Maigret at the same time for the given username.
+    Returns a dictionary with the URLs found by each tool, the merged list and
+    the per-tool timings under "_meta".
+    on_result, if given, is called as on_result(key, result, meta) as soon as
+    each tool finishes.
     """
     print(f"\n🚀 Starting OSINT username analysis for: {username}")
-    sherlock_results = analyze_with_sherlock(username)
-    maigret_results = analyze_with_maigret(username)
+    recorder = instrumentation.Recorder(on_result)
+    found = run_collectors(
+        {
+            "sherlock_profiles": lambda: analyze_with_sherlock(username),
+            "maigret_profiles": lambda: analyze_with_maigret(username),
+        },
+        on_result=recorder.on_result,
+    )
+    meta = recorder.meta()
+    instrumentation.print_summary(meta)
     print(f"🏁 Analysis finished for: {username}\n")
     results = {
         "username": username,
-        "sherlock_profiles": sherlock_results,
-        "maigret_profiles": maigret_results,
+        "sherlock_profiles": found["sherlock_profiles"],
+        "maigret_profiles": found["maigret_profiles"],
+        "profiles": merge_profiles(
+            found["sherlock_profiles"], found["maigret_profiles"]
+        ),
+        "_meta": meta,
     }
     return results
 
@@ -76,15 +163,16 @@ def print_username_results(results):
     Nicely prints the results of the username analysis.
     """
     print(f"\n🔎 Results for '{results['username']}':\n")
-    print("Sherlock found:")
-    if results["sherlock_profiles"]:
-        for url in results["sherlock_profiles"]:
-            print("  -", url)
-    else:
-        print("  No profiles found.")
-    print("Maigret found:")
-    if results["maigret_profiles"]:
-        for url in results["maigret_profiles"]:
-            print("  -", url)
-    else:
-        print("  No profiles found.")
+    for tool, key in (
+        ("Sherlock", "sherlock_profiles"),
+        ("Maigret", "maigret_profiles"),
+    ):
+        profiles = results[key]
+        print(f"{tool} found:")
+        if isinstance(profiles, dict):
+            print(f"  {profiles.get('error')}")
+        elif profiles:
+            for url in profiles:
+                print("  -", url)
+        else:
+            print("  No profiles found.")
@@ -0,0 +1,259 @@
+import asyncio
+import concurrent.futures
+import json
+import os
+import queue
+import signal
+import threading
+import time
+from datetime import datetime, timezone
+
+
+def timeout_error(source, seconds):
+    """
+    Builds the structured error stored in a result slot when a source times out.
+    """
+    return {
+        "error": f"{source} timed out after {seconds:g}s",
+        "timeout": True,
+        "source": source,
+    }
+
+
+def kill_process_tree(process):
+    """
+    Kills a subprocess together with any child processes it started. The
+    process must have been started with start_new_session=True on POSIX.
+    """
+    try:
+        if os.name == "posix":
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except OSError:
+        pass
+
+
+def utc_now():
+    """
+    Returns the current UTC time as an ISO 8601 string.
+    """
+    return datetime.now(timezone.utc).isoformat()
+
+
+def result_status(result):
+    """
+    Classifies a collector result as "ok", "error" or "timeout".
+    """
+    if isinstance(result, dict) and "error" in result:
+        return "timeout" if result.get("timeout") else "error"
+    return "ok"
+
+
+# Plazas para hilos de colectores, compartidas por todos los análisis del proceso
+_slots = None
+_slots_pid = None
+_slots_lock = threading.Lock()
+
+
+def _collector_slots():
+    """
+    Returns the process-wide semaphore that bounds running collector threads.
+    """
+    global _slots, _slots_pid
+    with _slots_lock:
+        if _slots is None or _slots_pid != os.getpid():
+            from osint import config
+
+            _slots = threading.BoundedSemaphore(config.collector_threads())
+            _slots_pid = os.getpid()
+    return _slots
+
+
+def run_collectors(collectors, timeouts=None, deadline=None, on_result=None):
+    """
+    Runs independent collectors concurrently and returns their results.
+
+    collectors is a dict {source: zero-argument callable}. Each collector runs in
+    its own daemon thread; a collector that exceeds its timeout (timeouts[source])
+    or is still running when the overall deadline expires gets a structured
+    timeout error in its slot instead of blocking the whole analysis.
+    Threads cannot be killed, so an abandoned collector keeps running until it
+    returns; at most config.collector_threads() collectors run at once in the
+    process, and a collector still waiting for a slot when its time is up is
+    cancelled without running.
+    If on_result is given, it is called from the calling thread as
+    on_result(source, result, meta) the moment each source finishes, where meta
+    holds started_at, finished_at, duration (seconds), status and the
+    source's instrumentation counters (requests, bytes, http_status, retries,
+    cache_hits, cache_misses).
+    Results are returned in the same key order as collectors.
+    """
+    # Importación local: instrumentation depende a su vez de este módulo
+    from osint import instrumentation
+
+    timeouts = timeouts or {}
+    done = queue.Queue()
+    stats = {source: instrumentation.SourceStats(source) for source in collectors}
+
+    slots = _collector_slots()
+    cancelled = {source: threading.Event() for source in collectors}
+
+    def worker(source, func):
+        limit = expires[source]
+        wait = None if limit is None else max(0.0, limit[0] - time.monotonic())
+        if not slots.acquire(timeout=wait):
+            return
+        try:
+            # Caducó mientras esperaba plaza: ya tiene su error de timeout
+            if cancelled[source].is_set():
+                return
+            started = time.monotonic()
+            with instrumentation.activate(stats[source]):
+                try:
+                    result = func()
+                except Exception as e:
+                    result = {"error": str(e), "source": source}
+            done.put((source, result, time.monotonic() - started))
+        finally:
+            slots.release()
+
+    start = time.monotonic()
+    started_at = utc_now()
+    expires = {}
+    for source, func in collectors.items():
+        timeout = timeouts.get(source)
+        if deadline is not None:
+            timeout = deadline if timeout is None else min(timeout, deadline)
+        expires[source] = (start + timeout, timeout) if timeout is not None else None
+        threading.Thread(
+            target=worker,
+            args=(source, func),
+            name=f"collector-{source}",
+            daemon=True,
+        ).start()
+
+    results = {}
+    pending = set(collectors)
+
+    def finish(source, result, duration):
+        results[source] = result
+        pending.discard(source)
+        if on_result:
+            meta = {
+                "started_at": started_at,
+                "finished_at": utc_now(),
+                "duration": round(duration, 3),
+                "status": result_status(result),
+                **stats[source].snapshot(),
+            }
+            on_result(source, result, meta)
+
+    while pending:
+        now = time.monotonic()
+        # Marca como timeout las fuentes cuyo plazo ya ha vencido
+        for source in list(pending):
+            if expires[source] and expires[source][0] <= now:
+                cancelled[source].set()
+                finish(source, timeout_error(source, expires[source][1]), now - start)
+        if not pending:
+            break
+        limits = [expires[s][0] for s in pending if expires[s]]
+        wait = max(0, min(limits) - now) if limits else None
+        try:
+            source, result, duration = done.get(timeout=wait)
+        except queue.Empty:
+            continue
+        if source in pending:
+            finish(source, result, duration)
+
+    return {source: results[source] for source in collectors}
+
+
+# Bucle asyncio compartido para las capas asíncronas (HTTP, DNS...)
+_loop = None
+_loop_pid = None
+_loop_lock = threading.Lock()
+
+
+def get_event_loop():
+    """
+    Returns the shared background event loop, starting it on first use.
+    The loop runs in a daemon thread and is recreated after a fork.
+    """
+    global _loop, _loop_pid
+    with _loop_lock:
+        if _loop is None or _loop_pid != os.getpid():
+            _loop = asyncio.new_event_loop()
+            _loop_pid = os.getpid()
+            threading.Thread(
+                target=_loop.run_forever, name="infohunter-loop", daemon=True
+            ).start()
+    return _loop
+
+
+def run_async(coro, timeout=None):
+    """
+    Runs a coroutine on the shared event loop from synchronous code and returns
+    its result. Must not be called from the loop thread itself. If timeout
+    expires, the coroutine is cancelled (releasing its pooled connections)
+    and TimeoutError is raised.
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, get_event_loop())
+    try:
+        return future.result(timeout)
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        raise TimeoutError(f"Timed out after {timeout:g}s") from None
+
+
+_json_decoder = json.JSONDecoder()
+
+
+def iter_json_array(chunks):
+    """
+    Incrementally parses a top-level JSON array from an iterable of text
+    chunks and yields its items one by one. Only the unparsed tail of the
+    input is kept in memory, never the whole document.
+    """
+    buffer = ""
+    pos = 0
+    started = False
+    chunks = iter(chunks)
+    eof = False
+    while True:
+        # Saltar espacios y separadores entre elementos
+        while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+            pos += 1
+        if started and pos < len(buffer) and buffer[pos] == "]":
+            return
+        if not started and pos < len(buffer):
+            if buffer[pos] != "[":
+                raise ValueError("Expected a JSON array")
+            started = True
+            pos += 1
+            continue
+        if pos < len(buffer):
+            try:
+                item, end = _json_decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            else:
+                # Un número cortado entre trozos ("3" de "3.5") también se
+                # decodifica: solo es completo si le sigue un separador
+                if eof or (end < len(buffer) and buffer[end] in " \t\r\n,]"):
+                    yield item
+                    pos = end
+                    continue
+        if eof:
+            if started:
+                raise ValueError("Unterminated JSON array")
+            return
+        try:
+            chunk = next(chunks)
+        except StopIteration:
+            eof = True
+            continue
+        buffer = buffer[pos:] + chunk
+        pos = 0